@@ -1,11 +1,14 @@
 # scripts/create_combined_view.py
 # 功能：算法工作流可视化启动器。可通过命令行参数选择不同的划分算法，
 # 运行后生成并展示包含“原始图->初始划分->最终划分”的3x3组合对比图。
+# 无界面模式 (--headless) 下使用 Agg 后端，先在进程池中按网表并行计算布局，再为多种算法并行导出 PNG/SVG。
 
 import os
 import sys
 import argparse
+import matplotlib
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 import random
 import networkx as nx
 
@@ -16,11 +19,29 @@ sys.path.insert(0, project_root)
 
 # --- 导入所有需要的模块 ---
 from src.utils.netlist_parser import parse_netlist_to_graph
-from src.utils.graph_visualizer import visualize_partitioned_graph
-# 导入三种不同的划分算法
+from src.utils.graph_visualizer import (
+    visualize_partitioned_graph, compute_layout, load_layout_cache, save_layout_cache
+)
+# 导入三种不同的划分算法，以及按图特征自动选择其中之一的 auto
 from src.core.base_partitioning import simple_greedy_partition
 from src.core.kl_classic import kernighan_lin_partition
-from src.core.kl_improvements import kernighan_lin_bfs_init
+from src.core.kl_improvements import kernighan_lin_bfs_init, create_initial_partition, INITIAL_PARTITION_STRATEGIES
+from src.core.auto_select import auto_partition
+
+# 算法名 -> (划分函数, 图标题中的名称, 是否需要外部初始划分)
+ALGORITHM_CHOICES = {
+    'greedy': (simple_greedy_partition, "Simple Greedy", True),
+    'kl_random': (kernighan_lin_partition, "Classic KL (Random Init)", True),
+    'kl_bfs': (kernighan_lin_bfs_init, "KL with BFS Init", False),
+    'auto': (auto_partition, "Auto Select", False),
+}
+
+# 3x3对比图的三行：不同规模的网表
+NETLIST_CONFIGS = [
+    {"path": "data/generated_netlists/netlist_small_10n_20e.txt", "title": "Small Scale"},
+    {"path": "data/generated_netlists/netlist_medium_20n_40e.txt", "title": "Medium Scale"},
+    {"path": "data/generated_netlists/netlist_large_50n_100e.txt", "title": "Large Scale"}
+]
 
 def main():
     """
@@ -35,49 +56,149 @@ def main():
         '-a', '--algorithm',
         type=str,
         default='kl_random',
-        choices=['greedy', 'kl_random', 'kl_bfs'],
+        choices=list(ALGORITHM_CHOICES) + ['all'],
         help="""选择要运行的划分算法:
   'greedy'    - 单步最优贪心算法
   'kl_random' - 经典KL算法 (随机初始划分)
   'kl_bfs'    - 改进版KL算法 (BFS初始划分)
+  'auto'      - 根据图特征与基准测试代价模型自动选择以上算法之一
+  'all'       - 依次(或在 --headless 下并行)生成以上全部算法的对比图
 """
     )
+    parser.add_argument(
+        '-i', '--init',
+        type=str,
+        default='random',
+        choices=list(INITIAL_PARTITION_STRATEGIES),
+        help="""需要初始划分的算法 (greedy, kl_random) 所使用的初始划分策略:
+  'random'    - 随机对半划分 (默认)
+  'bfs'       - BFS遍历顺序对半划分
+  'spectral'  - 谱方法 (Fiedler向量中位数切分)
+  'gggp'      - 贪心图生长 (伪外围种子 + 最大增益边界节点)
+  'streaming' - 单遍流式划分 (线性确定性贪心 LDG 得分 + 平衡约束)
+"""
+    )
+    parser.add_argument(
+        '--layout-cache',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help="布局缓存文件路径 (如 results/layout_cache.json)。指定后跨次运行复用已计算的节点布局。"
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help="无界面模式：使用 Agg 后端，只将图像写入 results/images，不弹出窗口。"
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        default=['png'],
+        choices=['png', 'svg'],
+        help="输出图像格式，可同时指定多个 (默认: png)。"
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help="--headless 下并行渲染的进程数 (默认: CPU核数)。"
+    )
     args = parser.parse_args()
     
     # --- 步骤2: 根据参数选择算法和配置 ---
-    if args.algorithm == 'greedy':
-        partition_func = simple_greedy_partition
-        algo_name = "Simple Greedy"
-        requires_initial_partition = True
-    elif args.algorithm == 'kl_bfs':
-        partition_func = kernighan_lin_bfs_init
-        algo_name = "KL with BFS Init"
-        requires_initial_partition = False
-    else: # 默认 'kl_random'
-        partition_func = kernighan_lin_partition
-        algo_name = "Classic KL (Random Init)"
-        requires_initial_partition = True
-
-    print(f"--- 已选择算法: {algo_name} ---")
-    
+    algo_keys = list(ALGORITHM_CHOICES) if args.algorithm == 'all' else [args.algorithm]
+    print(f"--- 已选择算法: {', '.join(ALGORITHM_CHOICES[key][1] for key in algo_keys)} ---")
+
     # --- 步骤3: 运行并生成3x3可视化结果 ---
-    run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition)
+    # 所有算法的对比图共享同一个布局缓存：每个网表的 spring 布局在本次会话中只计算一次
+    layout_cache = load_layout_cache(args.layout_cache) if args.layout_cache else {}
+    if args.headless:
+        export_figures_headless(algo_keys, args.init, layout_cache, args.formats, args.jobs)
+    else:
+        for key in algo_keys:
+            partition_func, algo_name, requires_initial_partition = ALGORITHM_CHOICES[key]
+            run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition, args.init,
+                                  layout_cache, formats=args.formats)
+    if args.layout_cache:
+        save_layout_cache(layout_cache, args.layout_cache)
+
+def _init_headless_worker():
+    """进程池工作进程初始化：切换到无界面的 Agg 后端。"""
+    matplotlib.use('Agg')
 
-def run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition):
+def _compute_netlist_layout(netlist_path, layout_cache):
+    """在工作进程中计算单个网表原始图的 spring 布局，返回新增的缓存条目。"""
+    graph = parse_netlist_to_graph(netlist_path)
+    new_entries = {}
+    if graph:
+        local_cache = dict(layout_cache)
+        compute_layout(graph, 'spring', local_cache)
+        new_entries = {key: value for key, value in local_cache.items() if key not in layout_cache}
+    return new_entries
+
+def _render_algorithm_figure(algo_key, init_strategy, layout_cache, formats):
+    """在工作进程中为单个算法生成并导出3x3对比图，返回 (图像路径, 新增的缓存条目)。"""
+    partition_func, algo_name, requires_initial_partition = ALGORITHM_CHOICES[algo_key]
+    local_cache = dict(layout_cache)
+    output_paths = run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition, init_strategy,
+                                         local_cache, formats=formats, show=False)
+    new_entries = {key: value for key, value in local_cache.items() if key not in layout_cache}
+    return output_paths, new_entries
+
+def export_figures_headless(algo_keys, init_strategy='random', layout_cache=None, formats=('png',), jobs=None):
+    """
+    无界面批量导出，分两个阶段在进程池中运行，直接写入 results/images：
+    1. 每个网表一个任务，并行计算原始图的 spring 布局（布局是主要开销，同一网表只计算一次）；
+    2. 每个算法一个任务，并行运行划分并渲染3x3对比图（其中的三行在该进程内依次处理）。
+    工作进程只读取父进程传入的 layout_cache 副本并返回新增条目，由父进程合并进 layout_cache；
+    是否写回磁盘由调用方决定。
+
+    Returns:
+        List[str]: 所有已写出的图像路径。
+    """
+    plt.switch_backend('Agg')
+    if layout_cache is None:
+        layout_cache = {}
+    netlist_paths = [os.path.join(project_root, config['path']) for config in NETLIST_CONFIGS]
+    jobs = max(1, min(jobs or 1, max(len(algo_keys), len(netlist_paths))))
+    if jobs == 1:
+        for netlist_path in netlist_paths:
+            layout_cache.update(_compute_netlist_layout(netlist_path, layout_cache))
+        results = [_render_algorithm_figure(key, init_strategy, layout_cache, formats) for key in algo_keys]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_headless_worker) as executor:
+            futures = [executor.submit(_compute_netlist_layout, netlist_path, layout_cache)
+                       for netlist_path in netlist_paths]
+            for future in futures:
+                layout_cache.update(future.result())
+            futures = [executor.submit(_render_algorithm_figure, key, init_strategy, layout_cache, formats)
+                       for key in algo_keys]
+            results = [future.result() for future in futures]
+    for _, new_entries in results:
+        layout_cache.update(new_entries)
+    output_paths = [path for paths, _ in results for path in paths]
+    print(f"\n[成功] 无界面模式共导出 {len(output_paths)} 个图像文件。")
+    return output_paths
+
+def run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition, init_strategy='random',
+                          layout_cache=None, formats=('png',), show=True):
     """
     对所有规模的网表运行指定的划分算法，并生成3x3的组合图像。
+    layout_cache (dict) 由调用方创建并在多个算法的对比图之间共享，新计算的布局会写入其中；
+    原始图的 spring 布局只取决于网表拓扑，同一网表在各算法之间只计算一次。
+    图像按 formats 中的每种格式保存；show=False 时不调用 plt.show() 并在保存后关闭图像。
+
+    Returns:
+        List[str]: 已写出的图像路径。
     """
-    netlist_configs = [
-        {"path": "data/generated_netlists/netlist_small_10n_20e.txt", "title": "Small Scale"},
-        {"path": "data/generated_netlists/netlist_medium_20n_40e.txt", "title": "Medium Scale"},
-        {"path": "data/generated_netlists/netlist_large_50n_100e.txt", "title": "Large Scale"}
-    ]
+    if layout_cache is None:
+        layout_cache = {}
 
     # --- 关键改动：创建3行3列的子图 ---
     fig, axes = plt.subplots(nrows=3, ncols=3, figsize=(24, 21))
     fig.suptitle(f'{algo_name} Full Process: Original -> Initial -> Final', fontsize=22)
 
-    for i, config in enumerate(netlist_configs):
+    for i, config in enumerate(NETLIST_CONFIGS):
         netlist_path = os.path.join(project_root, config['path'])
         print(f"\n--- 处理: {config['title']} ---")
 
@@ -89,16 +210,14 @@ def run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition)
             visualize_partitioned_graph(
                 original_graph, ax=ax_original,
                 title=f"{config['title']}\nOriginal Graph",
-                layout_style='spring'
+                layout_style='spring',
+                layout_cache=layout_cache
             )
 
             # --- 步骤B: 运行所选的划分算法 ---
             if requires_initial_partition:
-                nodes = list(original_graph.nodes())
                 random.seed(42)
-                random.shuffle(nodes)
-                initial_A = set(nodes[:len(nodes)//2])
-                initial_B = set(nodes[len(nodes)//2:])
+                initial_A, initial_B = create_initial_partition(original_graph, init_strategy)
                 _, _, final_cut_size, history, _, initial_graph, final_graph = partition_func(
                     original_graph, (initial_A, initial_B), verbose=False
                 )
@@ -115,7 +234,8 @@ def run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition)
             visualize_partitioned_graph(
                 initial_graph, ax=ax_initial,
                 title=f"{config['title']}\nInitial Partition (Cut: {initial_cut_size})",
-                layout_style='bipartite'
+                layout_style='bipartite',
+                layout_cache=layout_cache
             )
             
             # --- 步骤D: 在第3列绘制最终划分图 ---
@@ -123,7 +243,8 @@ def run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition)
             visualize_partitioned_graph(
                 final_graph, ax=ax_final,
                 title=f"{config['title']}\nFinal Partition (Cut: {final_cut_size})",
-                layout_style='bipartite'
+                layout_style='bipartite',
+                layout_cache=layout_cache
             )
         else:
             for j in range(3):
@@ -135,12 +256,19 @@ def run_and_visualize_3x3(partition_func, algo_name, requires_initial_partition)
     output_image_dir = os.path.join(project_root, 'results', 'images')
     os.makedirs(output_image_dir, exist_ok=True)
     
-    output_filename = f'full_results_{algo_name.lower().replace(" ", "_")}.png'
-    output_image_path = os.path.join(output_image_dir, output_filename)
-    
-    plt.savefig(output_image_path)
-    print(f"\n[成功] {algo_name} 的3x3完整对比图像已保存到: {output_image_path}")
-    plt.show()
+    output_paths = []
+    for fmt in formats:
+        output_filename = f'full_results_{algo_name.lower().replace(" ", "_")}.{fmt}'
+        output_image_path = os.path.join(output_image_dir, output_filename)
+        fig.savefig(output_image_path)
+        output_paths.append(output_image_path)
+        print(f"\n[成功] {algo_name} 的3x3完整对比图像已保存到: {output_image_path}")
+
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return output_paths
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
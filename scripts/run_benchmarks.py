@@ -0,0 +1,292 @@
+# scripts/run_benchmarks.py - 启动开销基准测试
+# 功能：在全新的 Python 进程中测量各模块的导入耗时，以及“解析小网表并运行一次KL”这类短任务的冷启动延迟，
+# 对比 NetworkX 路径与无需 NetworkX 的 ArrayGraph 路径，结果打印为表格并保存为CSV。
+# 另外在 10⁵ 规模的合成图上测量节点重排 (RCM / BFS) 对邻接数组扫描类计算的加速效果，
+# 以及 NetworkX 图到 ArrayGraph 的转换与谱方法初始划分的耗时。
+import os
+import sys
+import csv
+import time
+import argparse
+import subprocess
+
+# --- 设置路径，确保可以导入src目录下的模块 ---
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+
+# --- 基准测试配置 ---
+REPEATS = 5  # 每项测量重复次数，取最小值以排除系统抖动
+COLD_START_TARGET_MS = 100  # 小任务冷启动延迟目标
+SMALL_NETLIST = 'data/generated_netlists/netlist_small_10n_20e.txt'
+OUTPUT_CSV = 'results/generate_data/startup_benchmark.csv'
+REORDER_CSV = 'results/generate_data/reorder_benchmark.csv'
+REORDER_GRID_SIDE = 320     # 重排基准的网格边长，节点数为其平方 (102400)
+REORDER_CANDIDATES = 64     # 批量评估的候选划分数
+SPECTRAL_CSV = 'results/generate_data/spectral_benchmark.csv'
+SPECTRAL_ISOLATED = 0.02    # 谱方法基准中追加的孤立节点（悬空单元）比例
+
+# 导入耗时测量对象：第三方依赖作为参照，其余为项目模块
+IMPORT_TARGETS = [
+    'numpy', 'networkx', 'pandas', 'matplotlib.pyplot',
+    'src.core.array_graph', 'src.core.kl_classic', 'src.core.base_partitioning',
+    'src.core.kl_improvements', 'src.core.kl_batched', 'src.utils.netlist_parser',
+]
+
+# 冷启动短任务：解析网表 -> 随机初始划分 -> 经典KL，{parser} 为所用的解析函数
+_COLD_START_JOB = """
+import sys, random
+sys.path.insert(0, {root!r})
+from src.utils.netlist_parser import {parser}
+from src.core.kl_classic import kernighan_lin_partition
+from src.core.kl_improvements import create_initial_partition
+graph = {parser}({netlist!r})
+random.seed(0)
+kernighan_lin_partition(graph, create_initial_partition(graph, 'random'), verbose=False)
+print('HEAVY:' + ','.join(m for m in ('networkx', 'pandas', 'matplotlib') if m in sys.modules))
+"""
+
+
+def _time_subprocess(code, repeats):
+    """在全新解释器中执行 code，返回 (最短墙钟时间(秒), 最后一次的标准输出)。"""
+    best, output = float('inf'), ''
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=project_root)
+        best = min(best, time.perf_counter() - start)
+        output = result.stdout
+    return best, output
+
+
+def measure_import_times(repeats=REPEATS):
+    """
+    测量每个模块在全新进程中的导入耗时（已扣除空解释器的启动时间）。
+
+    Returns:
+        Tuple[float, List[Tuple[str, float]]]: (空解释器启动时间, [(模块名, 导入耗时)])，单位为秒。
+    """
+    baseline, _ = _time_subprocess('pass', repeats)
+    rows = []
+    for module in IMPORT_TARGETS:
+        code = f"import sys; sys.path.insert(0, {project_root!r}); import {module}"
+        elapsed, _ = _time_subprocess(code, repeats)
+        rows.append((module, max(0.0, elapsed - baseline)))
+    return baseline, rows
+
+
+def measure_cold_start(netlist_path, repeats=REPEATS):
+    """
+    测量小任务从启动解释器到完成划分的总墙钟时间，分别使用 NetworkX 路径与 ArrayGraph 路径。
+
+    Returns:
+        List[Tuple[str, float, str]]: [(路径名, 冷启动耗时(秒), 运行中导入的重型模块)]
+    """
+    rows = []
+    for label, parser in (('networkx', 'parse_netlist_to_graph'), ('array_graph', 'parse_netlist_to_arrays')):
+        code = _COLD_START_JOB.format(root=project_root, parser=parser, netlist=netlist_path)
+        elapsed, output = _time_subprocess(code, repeats)
+        heavy = [line[len('HEAVY:'):] for line in output.splitlines() if line.startswith('HEAVY:')]
+        rows.append((label, elapsed, heavy[-1] if heavy else ''))
+    return rows
+
+
+def _scattered_grid_adjacency(side, seed=0):
+    """
+    合成网格状的网表：每个节点与右侧、下方的邻居相连，10% 的节点另有一条随机长边。
+    节点名与出现顺序都被随机打乱，模拟按网表文件顺序编号时相邻单元在内存中分散的情况。
+    """
+    import random
+
+    rng = random.Random(seed)
+    n = side * side
+    names = [f"N{i}" for i in range(n)]
+    rng.shuffle(names)
+    cells = list(range(n))
+    rng.shuffle(cells)
+    adjacency = {}
+    for i in cells:
+        row, col = divmod(i, side)
+        neighbors = ([i + 1] if col + 1 < side else []) + ([i + side] if row + 1 < side else [])
+        if rng.random() < 0.1:
+            neighbors.append(rng.randrange(n))
+        u = names[i]
+        adjacency.setdefault(u, {})
+        for j in neighbors:
+            if j != i:
+                weight = rng.randint(1, 3)
+                adjacency[u][names[j]] = weight
+                adjacency.setdefault(names[j], {})[u] = weight
+    return adjacency
+
+
+def measure_reordering(grid_side=REORDER_GRID_SIDE, repeats=REPEATS):
+    """
+    在合成网格图上比较不重排、RCM 与 BFS 三种编号顺序下的代表性计算耗时：
+    批量评估 REORDER_CANDIDATES 个候选划分（稀疏矩阵乘稠密矩阵）、稀疏矩阵向量乘与 GGGP 初始划分（逐节点扫描邻接数组）。
+
+    Returns:
+        List[Tuple[str, str, float, float]]: [(计算, 编号顺序, 耗时(秒), 相对不重排的加速比)]；
+            编号顺序为 'rcm' / 'bfs' 的 'reorder' 行是重排本身的耗时，加速比一栏为空 (nan)。
+    """
+    import random
+    import numpy as np
+    from src.core.array_graph import arrays_from_adjacency, reorder_arrays, sparse_adjacency
+    from src.core.cut_evaluation import evaluate_partitions
+    from src.core.kl_improvements import create_initial_partition
+
+    base = arrays_from_adjacency(_scattered_grid_adjacency(grid_side))
+    n = base.number_of_nodes()
+    sides = np.random.default_rng(0).random((REORDER_CANDIDATES, n)) < 0.5
+    x = np.random.default_rng(1).random(n)
+
+    def best_time(job):
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            job()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def gggp(graph):
+        random.seed(0)
+        create_initial_partition(graph, 'gggp')
+
+    rows, baseline = [], {}
+    for method in (None, 'rcm', 'bfs'):
+        label = method or 'none'
+        if method:
+            start = time.perf_counter()
+            graph = reorder_arrays(base, method)
+            rows.append(('reorder', label, time.perf_counter() - start, float('nan')))
+        else:
+            graph = base
+        W = sparse_adjacency(graph)
+        jobs = {
+            'evaluate_partitions': lambda: evaluate_partitions(graph, sides, per_node=False),
+            'sparse matvec x100': lambda: [W @ x for _ in range(100)],
+            'gggp initial partition': lambda: gggp(graph),
+        }
+        for name, job in jobs.items():
+            elapsed = best_time(job)
+            baseline.setdefault(name, elapsed)
+            rows.append((name, label, elapsed, baseline[name] / elapsed))
+    return rows
+
+
+def measure_spectral(grid_side=REORDER_GRID_SIDE, repeats=REPEATS):
+    """
+    在合成网格图（另加 SPECTRAL_ISOLATED 比例的孤立节点）上测量 NetworkX 图到 ArrayGraph 的转换
+    与谱方法初始划分的耗时，并与随机初始划分的割边数对照。
+
+    Returns:
+        List[Tuple[str, float, float]]: [(步骤, 耗时(秒), 所得划分的割边数；转换一行为 nan)]
+    """
+    import random
+    import networkx as nx
+    from src.core.array_graph import graph_to_arrays
+    from src.core.kl_classic import _calculate_cut_size
+    from src.core.kl_improvements import create_initial_partition
+
+    G = nx.Graph()
+    for u, neighbors in _scattered_grid_adjacency(grid_side).items():
+        G.add_node(u)
+        G.add_edges_from((u, v, {'weight': weight}) for v, weight in neighbors.items())
+    G.add_nodes_from(f"ISO{i}" for i in range(int(SPECTRAL_ISOLATED * grid_side * grid_side)))
+
+    def best_time(job):
+        best, result = float('inf'), None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = job()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    convert_time, ag = best_time(lambda: graph_to_arrays(G))
+    spectral_time, spectral = best_time(lambda: create_initial_partition(ag, 'spectral'))
+    random.seed(0)
+    random_time, random_partition = best_time(lambda: create_initial_partition(ag, 'random'))
+    return [
+        ('graph_to_arrays', convert_time, float('nan')),
+        ('spectral initial partition', spectral_time, _calculate_cut_size(ag, *spectral)),
+        ('random initial partition', random_time, _calculate_cut_size(ag, *random_partition)),
+    ]
+
+
+def run_benchmarks(netlist=SMALL_NETLIST, repeats=REPEATS, reorder_grid_side=REORDER_GRID_SIDE,
+                   spectral_grid_side=REORDER_GRID_SIDE):
+    """
+    运行全部启动开销测量，打印结果并写入 OUTPUT_CSV；reorder_grid_side > 0 时另外运行节点重排基准并写入 REORDER_CSV，
+    spectral_grid_side > 0 时运行转换与谱方法初始划分基准并写入 SPECTRAL_CSV。
+    """
+    netlist_path = os.path.join(project_root, netlist)
+    if not os.path.exists(netlist_path):
+        print(f"错误：找不到网表文件 {netlist_path}，请先运行 'python scripts/generate_netlists.py'。")
+        return
+
+    print("--- 导入耗时 (全新进程, 已扣除解释器启动时间) ---")
+    baseline, import_rows = measure_import_times(repeats)
+    print(f"  {'(空解释器启动)':<32}{baseline * 1000:>9.1f} ms")
+    for module, elapsed in import_rows:
+        print(f"  {module:<32}{elapsed * 1000:>9.1f} ms")
+
+    print(f"\n--- 小任务冷启动延迟: {netlist} (目标 < {COLD_START_TARGET_MS} ms) ---")
+    cold_rows = measure_cold_start(netlist_path, repeats)
+    for label, elapsed, heavy in cold_rows:
+        status = "达标" if elapsed * 1000 < COLD_START_TARGET_MS else "未达标"
+        print(f"  {label:<14}{elapsed * 1000:>9.1f} ms  [{status}]  已导入的重型模块: {heavy or '无'}")
+
+    csv_filepath = os.path.join(project_root, OUTPUT_CSV)
+    os.makedirs(os.path.dirname(csv_filepath), exist_ok=True)
+    with open(csv_filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Benchmark', 'Name', 'Time (ms)', 'Heavy Modules Loaded'])
+        writer.writerow(['interpreter startup', 'python', f"{baseline * 1000:.1f}", ''])
+        for module, elapsed in import_rows:
+            writer.writerow(['import', module, f"{elapsed * 1000:.1f}", ''])
+        for label, elapsed, heavy in cold_rows:
+            writer.writerow(['cold start', label, f"{elapsed * 1000:.1f}", heavy])
+    print(f"\n[成功] 启动开销基准结果已保存到: {csv_filepath}")
+
+    sys.path.insert(0, project_root)
+    if spectral_grid_side > 0:
+        num_isolated = int(SPECTRAL_ISOLATED * spectral_grid_side ** 2)
+        print(f"\n--- 图转换与谱方法初始划分: {spectral_grid_side}×{spectral_grid_side} 网格图 + {num_isolated} 个孤立节点 ---")
+        spectral_rows = measure_spectral(spectral_grid_side, repeats)
+        for name, elapsed, cut in spectral_rows:
+            cut_text = '' if cut != cut else f"割边数 {cut:.0f}"
+            print(f"  {name:<28}{elapsed * 1000:>10.1f} ms  {cut_text}")
+        spectral_filepath = os.path.join(project_root, SPECTRAL_CSV)
+        with open(spectral_filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Benchmark', 'Time (ms)', 'Cut Size'])
+            for name, elapsed, cut in spectral_rows:
+                writer.writerow([name, f"{elapsed * 1000:.1f}", '' if cut != cut else f"{cut:.0f}"])
+        print(f"\n[成功] 谱方法基准结果已保存到: {spectral_filepath}")
+
+    if reorder_grid_side <= 0:
+        return
+    print(f"\n--- 节点重排的局部性收益: {reorder_grid_side}×{reorder_grid_side} 网格图 "
+          f"({reorder_grid_side ** 2} 个节点, 节点名顺序随机) ---")
+    reorder_rows = measure_reordering(reorder_grid_side, repeats)
+    for name, label, elapsed, speedup in reorder_rows:
+        speedup_text = '' if speedup != speedup else f"{speedup:>6.2f}x"
+        print(f"  {name:<24}{label:<6}{elapsed * 1000:>10.1f} ms  {speedup_text}")
+
+    reorder_filepath = os.path.join(project_root, REORDER_CSV)
+    with open(reorder_filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Benchmark', 'Ordering', 'Time (ms)', 'Speedup'])
+        for name, label, elapsed, speedup in reorder_rows:
+            writer.writerow([name, label, f"{elapsed * 1000:.1f}", '' if speedup != speedup else f"{speedup:.2f}"])
+    print(f"\n[成功] 节点重排基准结果已保存到: {reorder_filepath}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="测量模块导入耗时与小任务冷启动延迟。")
+    parser.add_argument('--netlist', default=SMALL_NETLIST, help=f"冷启动任务使用的网表 (默认: {SMALL_NETLIST})。")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help=f"每项测量的重复次数，取最小值 (默认: {REPEATS})。")
+    parser.add_argument('--reorder-grid-side', type=int, default=REORDER_GRID_SIDE,
+                        help=f"节点重排基准的网格边长，0 表示跳过 (默认: {REORDER_GRID_SIDE}，即 {REORDER_GRID_SIDE ** 2} 个节点)。")
+    parser.add_argument('--spectral-grid-side', type=int, default=REORDER_GRID_SIDE,
+                        help=f"图转换与谱方法初始划分基准的网格边长，0 表示跳过 (默认: {REORDER_GRID_SIDE})。")
+    args = parser.parse_args()
+    run_benchmarks(args.netlist, args.repeats, args.reorder_grid_side, args.spectral_grid_side)
@@ -2,12 +2,14 @@
 # 功能：按照要求对三种算法进行多次实验，计算最大/平均割边减少率、运行时间和稳定性，并生成CSV报告与对比图。
 import os
 import sys
-import pandas as pd
+import argparse
+import glob
+import hashlib
+import inspect
+from functools import lru_cache
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
 import random
-import networkx as nx
+# pandas 与 matplotlib 导入耗时较长，只在生成报告或图表的函数内部按需导入
 
 # --- 设置路径，确保可以导入src目录下的模块 ---
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,12 +20,56 @@ sys.path.insert(0, project_root)
 from src.utils.netlist_parser import parse_netlist_to_graph
 from src.core.base_partitioning import simple_greedy_partition
 from src.core.kl_classic import kernighan_lin_partition
-from src.core.kl_improvements import kernighan_lin_bfs_init
+from src.core.kl_improvements import kernighan_lin_bfs_init, create_initial_partition
+from src.core.kl_batched import kernighan_lin_batched
+from src.core.kl_fast import kernighan_lin_fast
+from src.core.kl_numpy import kernighan_lin_numpy
+from src.core.graph_reduction import kernighan_lin_reduced
+from src.core.consensus_coarsening import kernighan_lin_consensus
+from src.core.auto_select import auto_partition
+from src.utils.experiment_store import ExperimentStore, netlist_hash
+from src.utils.anytime_analysis import median_anytime_curve, time_to_target, time_to_target_cdf
+from src.utils.profiling import RunProfiler, PROFILE_MODES, DEFAULT_PROFILE_DIR
 
 # --- 实验参数配置 ---
 NUM_RUNS = 20  # 每种情况运行20次
+INITIAL_PARTITION_STRATEGY = 'random'  # 需要初始划分的算法所用策略: 'random', 'bfs', 'spectral', 'gggp' 或 'streaming'
+EXPERIMENT_STORE_PATH = 'results/experiments.sqlite'  # 逐次运行记录的 SQLite 实验库（可续跑）
+RUNNER_CONTROLLED_ARGS = {'G', 'initial_partition', 'initial_sides', 'num_runs', 'start_node', 'seed', 'verbose', 'fixed'}  # 由实验脚本逐次运行设置的引擎参数，不属于算法配置
+BATCH_SIZE = 5  # 批量引擎每次调用运行的种子数；种子按对齐的块 [k·BATCH_SIZE, (k+1)·BATCH_SIZE) 成批运行，均摊后的运行时间才可跨会话比较
+
+# --- 自适应运行次数配置 (--adaptive) ---
+ADAPTIVE_MIN_RUNS = 5      # 至少运行的次数
+ADAPTIVE_MAX_RUNS = 100    # 最多运行的次数
+ADAPTIVE_STEP = 5          # 未收敛时每次追加的种子数
+CI_LEVEL = 0.95            # 置信水平
+CI_TARGET_RATE = 0.03      # 平均割边减少率的置信区间半宽目标（绝对值，即 ±3 个百分点）
+CI_TARGET_RUNTIME = 0.10   # 平均运行时间的置信区间半宽目标（相对均值的比例）
+
+# --- anytime 基准测试配置 (--anytime) ---
+ANYTIME_ALGORITHMS = ['greedy', 'kl_random', 'kl_bfs']  # 记录逐轮耗时的算法
+ANYTIME_CSV_PATH = 'results/generate_data/time_to_target.csv'
+
+# --- 性能剖析配置 (--profile) ---
+PROFILE_RUNS = 5  # 剖析模式下每个 (算法, 网表) 组合的运行次数，结果累积到同一份剖析数据中
+
+# --- 报告指标及其在CSV中的格式 ---
+METRIC_ROWS = [
+    'Max Cut-edge Reduction Rate', 'Average Cut-edge Reduction Rate',
+    'Average Algorithm Runtime (s)', 'Result Stability (Std Dev)'
+]
+REPORT_FORMATS = {
+    'Max Cut-edge Reduction Rate': '.2%',
+    'Average Cut-edge Reduction Rate': '.2%',
+    'Average Algorithm Runtime (s)': '.6f',
+    'Result Stability (Std Dev)': '.4f',
+    'Runs': '.0f',
+    'Reduction Rate CI (±)': '.2%',
+    'Runtime CI (s, ±)': '.6f'
+}
 
 # --- 算法配置 ---
+# 可选的 'kwargs' 覆盖引擎参数的默认值；实际调用参数与引擎代码摘要一起记录到实验库中
 ALGORITHMS = {
     'greedy': {
         'func': simple_greedy_partition, 
@@ -42,6 +88,45 @@ ALGORITHMS = {
         'csv_path': 'results/generate_data/kl_improvements_performance.csv', 
         'name': 'KL with BFS Init',
         'requires_initial_partition': False
+    },
+    'kl_batched': {
+        'func': kernighan_lin_batched,
+        'csv_path': 'results/generate_data/kl_batched_performance.csv',
+        'name': 'Batched KL (Random Init)',
+        'requires_initial_partition': True,
+        'batched': True,  # 每次调用完成 BATCH_SIZE 次运行，初始划分与 kl_random 的同一种子相同
+        'max_nodes': 3000  # 稠密 n×n 邻接矩阵，只用于小图上的多起点吞吐量对比，不是 kl_random 的通用替代
+    },
+    'kl_fast': {
+        'func': kernighan_lin_fast,  # 只在排序靠前的候选中选择交换对、定期全量刷新D值的近似KL
+        'csv_path': 'results/generate_data/kl_fast_performance.csv',
+        'name': 'Fast KL (Approx., Random Init)',
+        'requires_initial_partition': True
+    },
+    'kl_numpy': {
+        'func': kernighan_lin_numpy,  # 向量化的精确KL，结果与 kl_classic 完全相同
+        'csv_path': 'results/generate_data/kl_numpy_performance.csv',
+        'name': 'NumPy KL (Exact, Random Init)',
+        'requires_initial_partition': True
+    },
+    'kl_reduced': {
+        'func': kernighan_lin_reduced,  # 先约简叶节点与度为2链，在约简图上运行经典KL后展开
+        'csv_path': 'results/generate_data/kl_reduced_performance.csv',
+        'name': 'KL on Reduced Graph',
+        'requires_initial_partition': True
+    },
+    'kl_consensus': {
+        'func': kernighan_lin_consensus,  # 多个短程起点的共识组收缩后运行完整KL
+        'csv_path': 'results/generate_data/kl_consensus_performance.csv',
+        'name': 'Consensus-Coarsened KL',
+        'requires_initial_partition': True
+    },
+    'auto': {
+        'func': auto_partition,  # 按图特征与由上面各报告拟合的代价模型选择引擎，需排在被拟合的算法之后
+        'csv_path': 'results/generate_data/auto_performance.csv',
+        'name': 'Auto Select',
+        'requires_initial_partition': False,
+        'run_params': {'init': 'auto'}
     }
 }
 
@@ -52,86 +137,333 @@ NETLIST_CONFIGS = {
     'Large (50n, 100e)': {"path": "data/generated_netlists/netlist_large_50n_100e.txt"}
 }
 
-def run_all_experiments():
+def run_all_experiments(headless=False, formats=('png',), store_path=EXPERIMENT_STORE_PATH, adaptive=False):
     """
     主函数，执行所有实验，并生成报告和图表。
+    headless=True 时使用 Agg 后端，只写出图像文件而不弹出窗口；formats 为要保存的图像格式。
+    各次实验仍按顺序执行，以免并行进程相互干扰导致运行时间失真。
+    每次运行完成后立即写入 store_path 处的 SQLite 实验库；重新运行时跳过已完成的
+    (算法, 网表, 参数, 种子) 组合，报告与对比图均由实验库中的数值记录汇总得到。
+    adaptive=True 时不再固定运行 NUM_RUNS 次，而是在 [ADAPTIVE_MIN_RUNS, ADAPTIVE_MAX_RUNS] 范围内
+    不断追加种子，直到平均减少率与平均运行时间的置信区间都窄于目标（批量引擎只看平均减少率，见 _ci_converged）；
+    报告中记录实际运行次数与区间半宽。
     """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    if headless:
+        plt.switch_backend('Agg')
     # 确保输出目录存在
     os.makedirs(os.path.join(project_root, 'results', 'generate_data'), exist_ok=True)
     os.makedirs(os.path.join(project_root, 'results', 'images'), exist_ok=True)
 
     all_results = {}
 
-    for algo_key, algo_info in ALGORITHMS.items():
-        print(f"\n{'='*20} 开始测试算法: {algo_info['name']} {'='*20}")
-        
-        # 准备DataFrame，使用英文作为列和索引
-        scale_columns = list(NETLIST_CONFIGS.keys())
-        metric_rows = [
-            'Max Cut-edge Reduction Rate', 'Average Cut-edge Reduction Rate', 
-            'Average Algorithm Runtime (s)', 'Result Stability (Std Dev)'
-        ]
-        results_df = pd.DataFrame(index=metric_rows, columns=scale_columns)
-
-        for i, (scale_name, scale_config) in enumerate(NETLIST_CONFIGS.items()):
-            print(f"\n--- 处理规模: {scale_name} ---")
-            netlist_path = os.path.join(project_root, scale_config['path'])
-            graph = parse_netlist_to_graph(netlist_path)
+    with ExperimentStore(os.path.join(project_root, store_path)) as store:
+        for algo_key, algo_info in ALGORITHMS.items():
+            print(f"\n{'='*20} 开始测试算法: {algo_info['name']} {'='*20}")
+            params = _run_params(algo_info)
+
+            # 准备DataFrame，使用英文作为列和索引
+            scale_columns = list(NETLIST_CONFIGS.keys())
+            results_df = pd.DataFrame(index=list(REPORT_FORMATS), columns=scale_columns, dtype=float)
+
+            for scale_name, scale_config in NETLIST_CONFIGS.items():
+                print(f"\n--- 处理规模: {scale_name} ---")
+                netlist_path = os.path.join(project_root, scale_config['path'])
+                graph = parse_netlist_to_graph(netlist_path)
+
+                if not graph:
+                    print(f"错误：找不到网表文件 {netlist_path}，跳过此规模。")
+                    continue
+                if graph.number_of_nodes() > algo_info.get('max_nodes', float('inf')):
+                    print(f"节点数 {graph.number_of_nodes()} 超过该算法的适用上限 {algo_info['max_nodes']}，跳过此规模。")
+                    continue
+
+                digest = netlist_hash(netlist_path)
+                seeds = list(range(ADAPTIVE_MIN_RUNS if adaptive else NUM_RUNS))
+                _run_seeds(store, graph, algo_key, algo_info, digest, params, seeds, scale_name)
+                stats = store.aggregate(algo_key, digest, params, seeds, level=CI_LEVEL)
+
+                check_runtime = not algo_info.get('batched')
+                while adaptive and not _ci_converged(stats, check_runtime) and len(seeds) < ADAPTIVE_MAX_RUNS:
+                    seeds = list(range(min(len(seeds) + ADAPTIVE_STEP, ADAPTIVE_MAX_RUNS)))
+                    _run_seeds(store, graph, algo_key, algo_info, digest, params, seeds, scale_name)
+                    stats = store.aggregate(algo_key, digest, params, seeds, level=CI_LEVEL)
+
+                if adaptive:
+                    status = "已收敛" if _ci_converged(stats, check_runtime) else "达到运行次数上限"
+                    print(f"  自适应运行{status}: {len(seeds)} 次, 平均减少率 ±{stats['Reduction Rate CI (±)']:.2%}, "
+                          f"平均运行时间 ±{stats['Runtime CI (s, ±)']:.6f}s ({CI_LEVEL:.0%} 置信区间)")
+
+                # 由实验库中的数值记录计算统计指标
+                for metric in REPORT_FORMATS:
+                    results_df.loc[metric, scale_name] = stats[metric]
+
+            csv_filepath = os.path.join(project_root, algo_info['csv_path'])
+            _format_report(results_df).to_csv(csv_filepath, encoding='utf-8-sig')
+            print(f"\n[成功] {algo_info['name']} 的性能报告已保存到: {csv_filepath}")
+
+            all_results[algo_info['name']] = results_df
+
+    create_comparison_plot(all_results, show=not headless, formats=formats)
+
+def _run_seeds(store, graph, algo_key, algo_info, digest, params, seeds, scale_name):
+    """运行 seeds 中尚未记录在实验库中的种子，每次运行完成后立即写入实验库。"""
+    done = store.completed_seeds(algo_key, digest, params)
+    pending = [seed for seed in seeds if seed not in done]
+    if len(pending) < len(seeds):
+        print(f"  实验库中已有 {len(seeds) - len(pending)} 次运行记录，跳过这些种子。")
+
+    if algo_info.get('batched'):
+        run_outcomes = _run_batched(graph, algo_info, pending)
+    else:
+        run_outcomes = ((seed,) + _run_single(graph, algo_info, seed) for seed in pending)
+
+    for seed, initial_cut_size, final_cut, exec_time, passes in run_outcomes:
+        if seed in done:  # 批量引擎按整块运行，块内已记录的种子不再覆盖
+            continue
+        store.record_run(algo_key, digest, seed, initial_cut_size, final_cut, exec_time,
+                         passes=passes, params=params, netlist=scale_name)
+        reduction_rate = (initial_cut_size - final_cut) / initial_cut_size if initial_cut_size > 0 else 0
+        print(f"  Run {seed+1}/{len(seeds)}: Initial Cut = {initial_cut_size}, Final Cut = {final_cut}, Reduction Rate = {reduction_rate:.2%}")
+
+def _ci_converged(stats, check_runtime=True):
+    """
+    平均减少率与平均运行时间的置信区间半宽是否都已达到目标。
+    批量引擎同一块内的种子记录的是相同的均摊运行时间，其区间会低估真实波动，
+    因此以 check_runtime=False 只检查平均减少率的区间。
+    """
+    if stats['Reduction Rate CI (±)'] > CI_TARGET_RATE:
+        return False
+    runtime_target = CI_TARGET_RUNTIME * stats['Average Algorithm Runtime (s)']
+    return not check_runtime or stats['Runtime CI (s, ±)'] <= runtime_target
+
+def _engine_kwargs(algo_info):
+    """
+    调用引擎时传入的算法参数：引擎签名中的默认值（如 max_passes、pass_cutoff），
+    由 algo_info['kwargs'] 覆盖；RUNNER_CONTROLLED_ARGS 中逐次运行设置的参数除外。
+    """
+    kwargs = {
+        name: param.default
+        for name, param in inspect.signature(algo_info['func']).parameters.items()
+        if name not in RUNNER_CONTROLLED_ARGS and param.default is not inspect.Parameter.empty
+    }
+    kwargs.update(algo_info.get('kwargs', {}))
+    return kwargs
+
+@lru_cache(maxsize=None)
+def _core_code_digest():
+    """
+    src/core 包全部源码的摘要。引擎会跨模块调用（如 kl_bfs 使用 kl_classic 的轮次实现，auto 调用其他引擎），
+    因此以整个包而不是引擎所在的单个模块为准，任一算法模块改变都会使旧的运行记录失效。
+    """
+    core_dir = os.path.join(project_root, 'src', 'core')
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(core_dir, '**', '*.py'), recursive=True)):
+        digest.update(os.path.relpath(path, core_dir).replace(os.sep, '/').encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            digest.update(f.read().replace(b'\r\n', b'\n') + b'\0')
+    return digest.hexdigest()[:12]
+
+def _run_params(algo_info):
+    """
+    记录到实验库中的运行参数：初始划分策略、实际调用参数以及 src/core 源码的摘要；
+    参数或算法代码不同的运行互不复用。
+    """
+    params = dict(algo_info.get('run_params', {}))
+    if 'init' not in params:
+        params['init'] = INITIAL_PARTITION_STRATEGY if algo_info['requires_initial_partition'] else 'bfs'
+    if algo_info.get('batched'):
+        params['batch_size'] = BATCH_SIZE
+    params.update(_engine_kwargs(algo_info))
+    params['code'] = _core_code_digest()
+    return params
+
+def _format_report(results_df):
+    """将数值汇总表格式化为报告CSV的字符串形式（减少率为百分比）。"""
+    import pandas as pd
+
+    report_df = pd.DataFrame(index=results_df.index, columns=results_df.columns)
+    for metric, fmt in REPORT_FORMATS.items():
+        report_df.loc[metric] = [format(v, fmt) if pd.notna(v) else '' for v in results_df.loc[metric]]
+    return report_df
+
+def _run_batched(graph, algo_info, seeds):
+    """
+    用批量引擎运行 seeds 所在的全部种子块：每块为对齐的 BATCH_SIZE 个连续种子，一次调用完成，
+    运行时间按 BATCH_SIZE 均摊。块内种子即使已有记录也会一并运行，使每次调用的运行数都相同。
+    每个种子的初始划分与 _execute_run 相同（random.seed(种子) 后按 INITIAL_PARTITION_STRATEGY 生成），
+    因此与 kl_random 等单次运行的算法逐种子可比。
+
+    Returns:
+        List[Tuple[int, int, int, float, int]]: 每个种子的 (种子, 初始割边数, 最终割边数, 运行时间, 轮数)
+    """
+    nodes = list(graph.nodes())
+    outcomes = []
+    for block in sorted({seed // BATCH_SIZE for seed in seeds}):
+        block_seeds = list(range(block * BATCH_SIZE, (block + 1) * BATCH_SIZE))
+        initial_sides = np.zeros((BATCH_SIZE, len(nodes)), dtype=bool)
+        for row, seed in enumerate(block_seeds):
+            random.seed(seed)
+            initial_A, _ = create_initial_partition(graph, INITIAL_PARTITION_STRATEGY)
+            initial_sides[row] = [u in initial_A for u in nodes]
+        _, _, batch_final_cuts, batch_histories, batch_time = algo_info['func'](
+            graph, initial_sides=initial_sides, verbose=False, **_engine_kwargs(algo_info)
+        )
+        outcomes.extend(
+            (seed, history[0]['cut_size'], final_cut, batch_time / BATCH_SIZE, len(history) - 1)
+            for seed, final_cut, history in zip(block_seeds, batch_final_cuts, batch_histories)
+        )
+    return outcomes
+
+def _run_single(graph, algo_info, run_idx):
+    """
+    以 run_idx 为随机种子运行一次非批量算法。
+
+    Returns:
+        Tuple[int, int, float, int]: (初始割边数, 最终割边数, 运行时间, 轮数)
+    """
+    initial_cut_size, final_cut, exec_time, history = _execute_run(graph, algo_info, run_idx)
+    return initial_cut_size, final_cut, exec_time, len(history) - 1
 
+def _execute_run(graph, algo_info, run_idx):
+    """
+    以 run_idx 为随机种子运行一次非批量算法，并保留完整的 history。
+
+    Returns:
+        Tuple[int, int, float, List[Dict]]: (初始割边数, 最终割边数, 运行时间, history)
+    """
+    random.seed(run_idx)  # 保证每次实验的20次随机种子都一样
+
+    if algo_info['requires_initial_partition']:
+        initial_A, initial_B = create_initial_partition(graph, INITIAL_PARTITION_STRATEGY)
+        initial_cut_size = _calculate_cut_size(graph, initial_A, initial_B)
+        _, _, final_cut, history, exec_time, _, _ = algo_info['func'](
+            graph, (initial_A, initial_B), verbose=False, **_engine_kwargs(algo_info)
+        )
+    else:
+        _, _, final_cut, history, exec_time, _, _ = algo_info['func'](
+            graph, start_node=random.choice(list(graph.nodes())), verbose=False, **_engine_kwargs(algo_info)
+        )
+        initial_cut_size = history[0]['cut_size']
+    return initial_cut_size, final_cut, exec_time, history
+
+def run_profiling(mode='cprofile', output_dir=DEFAULT_PROFILE_DIR, num_runs=PROFILE_RUNS, algorithms=None):
+    """
+    剖析模式：对每个 (算法, 网表) 组合运行 num_runs 次（种子与常规实验相同），
+    用 cProfile 或采样剖析器记录算法调用，在 output_dir 下写出 .pstats / .collapsed 文件与 summary.txt，
+    并打印各组合中自身耗时最高的函数。剖析会拖慢运行，因此结果不写入实验库，也不生成报告与图表。
+    """
+    profiler = RunProfiler(mode, os.path.join(project_root, output_dir))
+    for algo_key in algorithms or list(ALGORITHMS):
+        algo_info = ALGORITHMS[algo_key]
+        for scale_name, scale_config in NETLIST_CONFIGS.items():
+            graph = parse_netlist_to_graph(os.path.join(project_root, scale_config['path']))
             if not graph:
-                print(f"错误：找不到网表文件 {netlist_path}，跳过此规模。")
                 continue
-
-            run_final_cuts, run_times, run_reduction_rates = [], [], []
-
-            for run_idx in range(NUM_RUNS):
-                random.seed(run_idx)  # 保证每次实验的20次随机种子都一样
-                
-                initial_cut_size = -1
-                if algo_info['requires_initial_partition']:
-                    nodes = list(graph.nodes())
-                    random.shuffle(nodes)
-                    initial_A = set(nodes[:graph.number_of_nodes()//2])
-                    initial_B = set(nodes[graph.number_of_nodes()//2:])
-                    initial_cut_size = _calculate_cut_size(graph, initial_A, initial_B)
-                    _, _, final_cut, _, exec_time, _, _ = algo_info['func'](graph, (initial_A, initial_B), verbose=False)
+            label = f"{algo_key}_{scale_name}"
+            print(f"--- 剖析 {algo_info['name']} / {scale_name} ({num_runs} 次) ---")
+            seeds = list(range(num_runs))
+            with profiler.record(label):
+                if algo_info.get('batched'):
+                    _run_batched(graph, algo_info, seeds)
                 else:
-                    _, _, final_cut, history, exec_time, _, _ = algo_info['func'](graph, start_node=random.choice(list(graph.nodes())), verbose=False)
-                    initial_cut_size = history[0]['cut_size']
-
-                reduction_rate = (initial_cut_size - final_cut) / initial_cut_size if initial_cut_size > 0 else 0
-                
-                run_final_cuts.append(final_cut)
-                run_times.append(exec_time)
-                run_reduction_rates.append(reduction_rate)
-                
-                print(f"  Run {run_idx+1}/{NUM_RUNS}: Initial Cut = {initial_cut_size}, Final Cut = {final_cut}, Reduction Rate = {reduction_rate:.2%}")
-
-            # 计算统计指标
-            max_reduction_rate = np.max(run_reduction_rates)
-            avg_reduction_rate = np.mean(run_reduction_rates)
-            avg_exec_time = np.mean(run_times)
-            std_dev_cut = np.std(run_final_cuts)
-
-            # 填充DataFrame
-            df_col_name = scale_columns[i]
-            results_df.loc['Max Cut-edge Reduction Rate', df_col_name] = f"{max_reduction_rate:.2%}"
-            results_df.loc['Average Cut-edge Reduction Rate', df_col_name] = f"{avg_reduction_rate:.2%}"
-            results_df.loc['Average Algorithm Runtime (s)', df_col_name] = f"{avg_exec_time:.6f}"
-            results_df.loc['Result Stability (Std Dev)', df_col_name] = f"{std_dev_cut:.4f}"
-
-        csv_filepath = os.path.join(project_root, algo_info['csv_path'])
-        results_df.to_csv(csv_filepath, encoding='utf-8-sig')
-        print(f"\n[成功] {algo_info['name']} 的性能报告已保存到: {csv_filepath}")
-        
-        all_results[algo_info['name']] = results_df
+                    for seed in seeds:
+                        _execute_run(graph, algo_info, seed)
 
-    create_comparison_plot(all_results)
+    print("\n" + profiler.write())
+    print(f"\n[成功] 剖析结果已保存到: {profiler.output_dir}")
 
-def create_comparison_plot(all_results):
+def run_anytime_benchmark(headless=False, formats=('png',)):
     """
-    根据所有算法的实验结果，生成一个4合1的对比折线图。
+    anytime 基准测试：对 ANYTIME_ALGORITHMS 中的算法在每种规模上各运行 NUM_RUNS 次，
+    记录每次运行中 (耗时, 截至此时的最小割边数) 的采样点，生成：
+    1. 每种规模下各算法的中位数 anytime 曲线；
+    2. 达到目标割边数（该规模下所有运行找到的最小割边数）所需时间的经验分布；
+    3. time-to-target 汇总CSV（达标率与中位达标时间）。
     """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+
+    if headless:
+        plt.switch_backend('Agg')
+    os.makedirs(os.path.join(project_root, 'results', 'generate_data'), exist_ok=True)
+    os.makedirs(os.path.join(project_root, 'results', 'images'), exist_ok=True)
+
+    fig, axes = plt.subplots(2, len(NETLIST_CONFIGS), figsize=(7 * len(NETLIST_CONFIGS), 12), squeeze=False)
+    fig.suptitle('Anytime Behaviour of Partitioning Algorithms', fontsize=22)
+    colors = {'Simple Greedy': 'green', 'Classic KL (Random Init)': 'blue', 'KL with BFS Init': 'orange'}
+    summary_rows = []
+
+    for col, (scale_name, scale_config) in enumerate(NETLIST_CONFIGS.items()):
+        print(f"\n--- anytime 基准测试: {scale_name} ---")
+        graph = parse_netlist_to_graph(os.path.join(project_root, scale_config['path']))
+        if not graph:
+            continue
+
+        histories = {
+            ALGORITHMS[key]['name']: [_execute_run(graph, ALGORITHMS[key], run_idx)[3] for run_idx in range(NUM_RUNS)]
+            for key in ANYTIME_ALGORITHMS
+        }
+        all_histories = [h for runs in histories.values() for h in runs]
+        target = min(entry['cut_size'] for h in all_histories for entry in h)
+        elapsed = [entry['elapsed'] for h in all_histories for entry in h]
+        time_grid = np.geomspace(max(min(elapsed), 1e-7), max(elapsed), 200)
+
+        curve_ax, cdf_ax = axes[0, col], axes[1, col]
+        for algo_name, runs in histories.items():
+            curve_ax.step(time_grid, median_anytime_curve(runs, time_grid), where='post',
+                          label=algo_name, color=colors[algo_name], linewidth=2.5)
+
+            ttt = [time_to_target(h, target) for h in runs]
+            ttt_times, ttt_fractions = time_to_target_cdf(ttt)
+            cdf_ax.step(np.concatenate([[time_grid[0]], ttt_times, [time_grid[-1]]]),
+                        np.concatenate([[0], ttt_fractions, [ttt_fractions[-1] if len(ttt_fractions) else 0]]),
+                        where='post', label=algo_name, color=colors[algo_name], linewidth=2.5)
+
+            success = ttt_fractions[-1] if len(ttt_fractions) else 0.0
+            median_ttt = float(np.median(ttt))  # 达标运行不足一半时为 inf
+            median_text = f"{median_ttt:.6f}" if np.isfinite(median_ttt) else 'inf'
+            summary_rows.append({
+                'Scale': scale_name, 'Algorithm': algo_name, 'Target Cut': target,
+                'Success Rate': f"{success:.2%}", 'Median Time-to-Target (s)': median_text
+            })
+            print(f"  {algo_name}: 达到目标割边数 {target} 的比例 {success:.2%}, 中位达标时间 {median_text}s")
+
+        curve_ax.set_title(f'Median Anytime Curve - {scale_name}', fontsize=14)
+        curve_ax.set_ylabel('Best Cut Size So Far', fontsize=12)
+        cdf_ax.set_title(f'Time-to-Target (cut <= {target}) - {scale_name}', fontsize=14)
+        cdf_ax.set_ylabel('Fraction of Runs Reaching Target', fontsize=12)
+        cdf_ax.yaxis.set_major_formatter(mticker.PercentFormatter(xmax=1.0))
+        for ax in (curve_ax, cdf_ax):
+            ax.set_xscale('log')
+            ax.set_xlabel('Elapsed Time (s)', fontsize=12)
+            ax.grid(True, linestyle='--', alpha=0.7)
+            ax.legend(fontsize=10)
+
+    csv_filepath = os.path.join(project_root, ANYTIME_CSV_PATH)
+    pd.DataFrame(summary_rows).to_csv(csv_filepath, index=False, encoding='utf-8-sig')
+    print(f"\n[成功] time-to-target 汇总已保存到: {csv_filepath}")
+
+    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    for fmt in formats:
+        output_path = os.path.join(project_root, 'results', 'images', f'anytime_curves.{fmt}')
+        fig.savefig(output_path)
+        print(f"[成功] anytime 曲线图已保存到: {output_path}")
+    if headless:
+        plt.close(fig)
+    else:
+        plt.show()
+
+def create_comparison_plot(all_results, show=True, formats=('png',)):
+    """
+    根据所有算法的数值汇总结果，生成一个4合1的对比折线图，并按 formats 中的每种格式保存。
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+
     print("\n--- 开始生成四合一性能对比图 ---")
     
     # 准备绘图数据
@@ -142,7 +474,10 @@ def create_comparison_plot(all_results):
         'Average Algorithm Runtime (s)': 'Average Algorithm Runtime (s) Across Scales',
         'Result Stability (Std Dev)': 'Result Stability (Std Dev) Across Scales'
     }
-    colors = {'Simple Greedy': 'green', 'Classic KL (Random Init)': 'blue', 'KL with BFS Init': 'orange'}
+    colors = {'Simple Greedy': 'green', 'Classic KL (Random Init)': 'blue', 'KL with BFS Init': 'orange',
+              'Batched KL (Random Init)': 'purple', 'Fast KL (Approx., Random Init)': 'olive',
+              'NumPy KL (Exact, Random Init)': 'navy', 'KL on Reduced Graph': 'brown',
+              'Consensus-Coarsened KL': 'teal', 'Auto Select': 'red'}
     
     fig, axes = plt.subplots(2, 2, figsize=(18, 14))
     axes = axes.flatten()
@@ -151,14 +486,7 @@ def create_comparison_plot(all_results):
     for i, (metric_row_name, metric_title) in enumerate(metrics_to_plot.items()):
         ax = axes[i]
         for algo_name, results_df in all_results.items():
-            # 提取数据时，要去除百分号并转换为数值
-            values_str = results_df.loc[metric_row_name, :].str.replace('%', '').to_numpy(dtype=float)
-            # 如果是百分比，除以100变回小数
-            if '%' in results_df.loc[metric_row_name].iloc[0]:
-                values = values_str / 100
-            else:
-                values = values_str
-                
+            values = results_df.loc[metric_row_name, :].to_numpy(dtype=float)
             ax.plot(labels, values, marker='o', linestyle='-', label=algo_name, color=colors[algo_name], linewidth=2.5, markersize=8)
         
         ax.set_title(metric_title, fontsize=16)
@@ -173,10 +501,14 @@ def create_comparison_plot(all_results):
 
     plt.tight_layout(rect=[0, 0, 1, 0.95])
     
-    output_path = os.path.join(project_root, 'results', 'images', 'experiments_results.png')
-    plt.savefig(output_path)
-    print(f"[成功] 性能对比图已保存到: {output_path}")
-    plt.show()
+    for fmt in formats:
+        output_path = os.path.join(project_root, 'results', 'images', f'experiments_results.{fmt}')
+        fig.savefig(output_path)
+        print(f"[成功] 性能对比图已保存到: {output_path}")
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
 
 def _calculate_cut_size(G, p_A, p_B):
     """辅助函数，用于计算初始割边数。"""
@@ -187,8 +519,35 @@ def _calculate_cut_size(G, p_A, p_B):
     return cut_size
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="运行全部算法的统计实验，生成CSV报告与性能对比图。")
+    parser.add_argument('--headless', action='store_true',
+                        help="无界面模式：使用 Agg 后端，只将对比图写入 results/images，不弹出窗口。")
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg'],
+                        help="对比图的输出格式，可同时指定多个 (默认: png)。")
+    parser.add_argument('--store', default=EXPERIMENT_STORE_PATH,
+                        help=f"逐次运行记录的 SQLite 实验库路径，已完成的运行会被跳过 (默认: {EXPERIMENT_STORE_PATH})。")
+    parser.add_argument('--adaptive', action='store_true',
+                        help=f"自适应运行次数：在 {ADAPTIVE_MIN_RUNS}~{ADAPTIVE_MAX_RUNS} 次之间追加种子，"
+                             f"直到平均减少率与运行时间的 {CI_LEVEL:.0%} 置信区间窄于目标。")
+    parser.add_argument('--anytime', action='store_true',
+                        help="运行 anytime 基准测试：生成中位数 anytime 曲线与 time-to-target 分布，而非常规统计报告。")
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=None,
+                        help="剖析模式：用 cProfile (默认) 或低开销的采样剖析器记录每个算法/网表组合的运行，"
+                             "在 --profile-dir 下写出 pstats、折叠栈(火焰图)文件与热点函数摘要；不写入实验库与报告。")
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                        help=f"剖析结果的输出目录 (默认: {DEFAULT_PROFILE_DIR})。")
+    parser.add_argument('--profile-runs', type=int, default=PROFILE_RUNS,
+                        help=f"剖析模式下每个算法/网表组合的运行次数 (默认: {PROFILE_RUNS})。")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=None,
+                        help="剖析模式下只剖析这些算法 (默认: 全部)。")
+    args = parser.parse_args()
+
     if not all(os.path.exists(os.path.join(project_root, v['path'])) for v in NETLIST_CONFIGS.values()):
         print("\n!!! 警告: 部分或全部网表文件不存在。")
         print("请先运行 'python scripts/generate_netlists.py' 来生成测试数据。")
+    elif args.profile:
+        run_profiling(args.profile, args.profile_dir, args.profile_runs, args.algorithms)
+    elif args.anytime:
+        run_anytime_benchmark(headless=args.headless, formats=args.formats)
     else:
-        run_all_experiments()
\ No newline at end of file
+        run_all_experiments(headless=args.headless, formats=args.formats, store_path=args.store, adaptive=args.adaptive)
\ No newline at end of file
@@ -0,0 +1,183 @@
+# scripts/run_sweep.py - 分布式参数扫描启动器
+# 功能：把 算法 × 网表 × 随机种子 × max_passes 的扫描分发到多台机器上的工作进程执行。
+#   coordinator  在本机启动协调者，等待工作进程连接，结果写入实验库与CSV
+#   worker       连接协调者并执行任务（网表路径相对于项目根目录，各机器需有相同的网表文件）
+#   local        在本机启动协调者和若干工作进程，用于测试与吞吐量对比
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import multiprocessing
+
+# --- 设置路径，确保可以导入src目录下的模块 ---
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from src.utils.distributed_sweep import SweepCoordinator, expand_sweep, run_worker, DEFAULT_AUTHKEY
+from src.utils.experiment_store import ExperimentStore, netlist_hash
+from src.utils.profiling import RunProfiler, PROFILE_MODES, DEFAULT_PROFILE_DIR
+
+# --- 默认扫描配置 ---
+DEFAULT_SWEEP = {
+    'algorithms': ['greedy', 'kl_random', 'kl_bfs'],
+    'netlists': [
+        'data/generated_netlists/netlist_small_10n_20e.txt',
+        'data/generated_netlists/netlist_medium_20n_40e.txt',
+        'data/generated_netlists/netlist_large_50n_100e.txt',
+    ],
+    'seeds': 20,
+    'max_passes': [10],
+}
+DEFAULT_PORT = 50000
+HEARTBEAT_TIMEOUT = 10.0  # 秒，超过该时间没有心跳的工作进程的任务会被重新分配
+EXPERIMENT_STORE_PATH = 'results/experiments.sqlite'
+OUTPUT_CSV = 'results/generate_data/sweep_results.csv'
+CSV_FIELDS = ['algorithm', 'netlist', 'seed', 'max_passes', 'initial_cut', 'final_cut', 'exec_time', 'passes', 'worker']
+
+
+def _run_params(task, profile=None):
+    """实验库中区分扫描记录的参数：初始划分方式与轮数上限；剖析下的运行另以剖析模式区分。"""
+    params = {'init': 'bfs' if task['algorithm'] == 'kl_bfs' else 'random', 'max_passes': task['max_passes']}
+    if profile:
+        params['profile'] = profile
+    return params
+
+
+def load_sweep(sweep_path=None):
+    """读取 JSON 扫描定义（字段同 DEFAULT_SWEEP）；未给出时使用默认扫描。"""
+    if sweep_path is None:
+        return dict(DEFAULT_SWEEP)
+    with open(sweep_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_coordinator(sweep, address, authkey, heartbeat_timeout=HEARTBEAT_TIMEOUT,
+                    store_path=EXPERIMENT_STORE_PATH, output_csv=OUTPUT_CSV, on_ready=None, workers_alive=None):
+    """
+    启动协调者并阻塞到扫描完成。实验库中已有记录的任务不再分发，新结果到达后立即写入实验库。
+
+    参数:
+        on_ready (Optional[Callable[[Tuple[str, int]], None]]): 服务开始监听后以实际地址调用（local 模式用它启动工作进程）。
+        workers_alive (Optional[Callable[[], bool]]): 见 SweepCoordinator.run。
+
+    Returns:
+        List[Dict]: 本次执行的任务结果。
+    """
+    missing = [path for path in sweep['netlists'] if not os.path.exists(os.path.join(project_root, path))]
+    if missing:
+        print(f"错误：找不到网表文件 {missing}，请先运行 'python scripts/generate_netlists.py'。")
+        return []
+    digests = {path: netlist_hash(os.path.join(project_root, path)) for path in sweep['netlists']}
+    with ExperimentStore(os.path.join(project_root, store_path)) as store:
+        tasks = []
+        for task in expand_sweep(sweep):
+            done = store.completed_seeds(task['algorithm'], digests[task['netlist']], _run_params(task))
+            if task['seed'] not in done:
+                tasks.append(dict(task, task_id=len(tasks)))
+        print(f"扫描共 {len(expand_sweep(sweep))} 个任务，其中 {len(tasks)} 个尚未完成。")
+        if not tasks:
+            return []
+
+        def record(task, result):
+            store.record_run(task['algorithm'], digests[task['netlist']], task['seed'],
+                             result['initial_cut'], result['final_cut'], result['exec_time'],
+                             passes=result['passes'], params=_run_params(task, result.get('profile')),
+                             netlist=task['netlist'])
+
+        with SweepCoordinator(tasks, address, authkey, heartbeat_timeout) as coordinator:
+            print(f"协调者正在监听 {coordinator.address[0]}:{coordinator.address[1]} ...")
+            if on_ready is not None:
+                on_ready(coordinator.address)
+            results = coordinator.run(on_result=record, workers_alive=workers_alive)
+
+    csv_filepath = os.path.join(project_root, output_csv)
+    os.makedirs(os.path.dirname(csv_filepath), exist_ok=True)
+    with open(csv_filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"[成功] 本次扫描结果已保存到: {csv_filepath}")
+    return results
+
+
+def _worker_main(address, authkey, profile=None, profile_dir=DEFAULT_PROFILE_DIR):
+    """
+    工作进程入口：网表路径相对于项目根目录解析。
+    profile 为 'cprofile' 或 'sampling' 时剖析每个任务，剖析结果写入 profile_dir/worker-<进程号>。
+    """
+    os.chdir(project_root)
+    profiler = RunProfiler(profile, os.path.join(profile_dir, f"worker-{os.getpid()}")) if profile else None
+    completed = run_worker(address, authkey, profiler=profiler)
+    print(f"工作进程 {os.getpid()} 完成 {completed} 个任务。")
+    if profiler is not None and profiler.labels():
+        print(profiler.write())
+        print(f"[成功] 剖析结果已保存到: {profiler.output_dir}")
+
+
+def run_local(sweep, num_workers, heartbeat_timeout=HEARTBEAT_TIMEOUT, store_path=EXPERIMENT_STORE_PATH,
+              output_csv=OUTPUT_CSV, authkey=DEFAULT_AUTHKEY, profile=None, profile_dir=DEFAULT_PROFILE_DIR):
+    """在本机启动协调者与 num_workers 个工作进程，并报告任务吞吐量；profile 见 _worker_main。"""
+    workers = []
+
+    def start_workers(address):
+        for _ in range(num_workers):
+            process = multiprocessing.Process(target=_worker_main, args=(address, authkey, profile, profile_dir))
+            process.start()
+            workers.append(process)
+
+    start_time = time.perf_counter()
+    results = run_coordinator(sweep, ('127.0.0.1', 0), authkey, heartbeat_timeout,
+                              store_path, output_csv, on_ready=start_workers,
+                              workers_alive=lambda: any(process.is_alive() for process in workers))
+    elapsed = time.perf_counter() - start_time
+    for process in workers:
+        process.join()
+    if results:
+        print(f"{num_workers} 个工作进程, 吞吐量: {len(results) / elapsed:.1f} 任务/秒")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="分布式参数扫描：协调者 + TCP 工作进程。")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    for mode, help_text in (('coordinator', "启动协调者并等待工作进程连接。"),
+                            ('local', "在本机启动协调者与多个工作进程。")):
+        sub = subparsers.add_parser(mode, help=help_text)
+        sub.add_argument('--sweep', default=None, help="JSON 扫描定义文件 (默认: 脚本内的 DEFAULT_SWEEP)。")
+        sub.add_argument('--heartbeat-timeout', type=float, default=HEARTBEAT_TIMEOUT,
+                         help=f"判定工作进程失联的心跳超时秒数 (默认: {HEARTBEAT_TIMEOUT})。")
+        sub.add_argument('--store', default=EXPERIMENT_STORE_PATH,
+                         help=f"SQLite 实验库路径，已完成的任务会被跳过 (默认: {EXPERIMENT_STORE_PATH})。")
+        sub.add_argument('--output', default=OUTPUT_CSV, help=f"本次扫描结果CSV (默认: {OUTPUT_CSV})。")
+        sub.add_argument('--authkey', default=DEFAULT_AUTHKEY.decode(), help="连接认证密钥。")
+    subparsers.choices['coordinator'].add_argument('--host', default='0.0.0.0', help="监听地址 (默认: 0.0.0.0)。")
+    subparsers.choices['coordinator'].add_argument('--port', type=int, default=DEFAULT_PORT,
+                                                   help=f"监听端口 (默认: {DEFAULT_PORT})。")
+    subparsers.choices['local'].add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                                             help="本机工作进程数 (默认: CPU核数)。")
+
+    worker_parser = subparsers.add_parser('worker', help="连接协调者并执行任务。")
+    worker_parser.add_argument('--host', required=True, help="协调者地址。")
+    worker_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"协调者端口 (默认: {DEFAULT_PORT})。")
+    worker_parser.add_argument('--authkey', default=DEFAULT_AUTHKEY.decode(), help="连接认证密钥。")
+    for sub in (subparsers.choices['local'], worker_parser):
+        sub.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=None,
+                         help="剖析工作进程执行的每个任务 (cProfile 或采样剖析器)，按 算法/网表 写出 pstats、"
+                              "折叠栈文件与热点函数摘要；这些运行在实验库中与正常运行分开记录。")
+        sub.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                         help=f"剖析结果目录，每个工作进程写入其下的 worker-<进程号> (默认: {DEFAULT_PROFILE_DIR})。")
+
+    args = parser.parse_args()
+    authkey = args.authkey.encode()
+    if args.mode == 'worker':
+        _worker_main((args.host, args.port), authkey, args.profile, args.profile_dir)
+    elif args.mode == 'coordinator':
+        run_coordinator(load_sweep(args.sweep), (args.host, args.port), authkey,
+                        args.heartbeat_timeout, args.store, args.output)
+    else:
+        run_local(load_sweep(args.sweep), args.workers, args.heartbeat_timeout, args.store, args.output, authkey,
+                  args.profile, args.profile_dir)
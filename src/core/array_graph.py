@@ -0,0 +1,248 @@
+# EDA_Circuit_Partitioning_KL/src/core/array_graph.py
+
+"""
+array_graph.py - 图的紧凑数组表示
+该模块将 NetworkX 图转换为 CSR (压缩稀疏行) 形式的邻接数组，
+供需要向量化或逐数组访问邻接关系的划分引擎使用。
+节点编号 i 与 nodes[i] 一一对应，结果可通过 nodes 映射回原始节点名。
+默认按图中（即网表文件中）节点出现的顺序编号；可选的重排 (reorder='rcm' 或 'bfs') 把相邻节点
+排到相近的编号上，使引擎内循环对邻接数组的扫描大多是顺序访问，重排前后编号的对应关系保存在 order 中。
+各划分引擎既接受 nx.Graph 也接受 ArrayGraph；后者无需导入 NetworkX，
+因此本模块不在顶层导入 NetworkX，NumPy 也只在实际构建数组时才导入。
+"""
+
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set, Union
+
+if TYPE_CHECKING:
+    import networkx as nx
+    import numpy as np
+    import scipy.sparse
+
+
+class ArrayGraph(NamedTuple):
+    """
+    CSR 形式的无向图。
+
+    属性:
+        nodes (List[str]): 编号 -> 节点名。
+        index (Dict[str, int]): 节点名 -> 编号。
+        indptr (np.ndarray): 长度 n+1，节点 i 的邻居位于 indices[indptr[i]:indptr[i+1]]。
+        indices (np.ndarray): 邻居编号。
+        weights (np.ndarray): 与 indices 对应的边权重。
+        order (Optional[np.ndarray]): 重排后的编号 -> 重排前的编号；未重排时为 None。
+    """
+    nodes: List[str]
+    index: Dict[str, int]
+    indptr: 'np.ndarray'
+    indices: 'np.ndarray'
+    weights: 'np.ndarray'
+    order: Optional['np.ndarray'] = None
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        import numpy as np
+
+        # 每条非自环边在 CSR 中出现两次，自环只出现一次
+        self_loops = int(np.count_nonzero(self.indices == np.repeat(
+            np.arange(len(self.nodes)), np.diff(self.indptr))))
+        return (len(self.indices) - self_loops) // 2 + self_loops
+
+
+# 各划分引擎接受的图类型：nx.Graph 或无需导入 NetworkX 的 ArrayGraph
+GraphLike = Union['nx.Graph', ArrayGraph]
+
+REORDER_METHODS = ('rcm', 'bfs')
+
+
+def graph_to_arrays(G, reorder: Optional[str] = None) -> ArrayGraph:
+    """
+    将 NetworkX 图转换为 ArrayGraph。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图，边权重取自 'weight' 属性（缺省为1）。
+            已经是 ArrayGraph 且不要求重排时原样返回。
+        reorder (Optional[str]): 节点重排方式，'rcm' 或 'bfs'（见 reorder_arrays）；为None时不重排。
+
+    Returns:
+        ArrayGraph: 按 G.nodes() 顺序（或重排后的顺序）编号的 CSR 邻接数组。
+    """
+    if isinstance(G, ArrayGraph):
+        return reorder_arrays(G, reorder) if reorder else G
+    import numpy as np
+
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    adj = G.adj
+
+    degrees = np.fromiter((len(adj[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    indices = np.fromiter(
+        (index[neighbor] for node in nodes for neighbor in adj[node]),
+        dtype=np.int64, count=int(indptr[-1])
+    )
+    weights = np.asarray(
+        [data.get('weight', 1) for node in nodes for data in adj[node].values()]
+    )
+    if weights.dtype.kind not in 'iuf':
+        weights = weights.astype(np.float64)
+    ag = ArrayGraph(nodes, index, indptr, indices, weights)
+    return reorder_arrays(ag, reorder) if reorder else ag
+
+
+def arrays_from_adjacency(adjacency: Dict[str, Dict[str, float]], reorder: Optional[str] = None) -> ArrayGraph:
+    """
+    由 {节点名: {邻居名: 边权重}} 形式的邻接字典构建 ArrayGraph，
+    节点与邻居的编号顺序与字典的插入顺序一致（与由相同边序列构建的 nx.Graph 转换结果相同）；
+    给出 reorder 时再按 reorder_arrays 重排。
+    """
+    import numpy as np
+
+    nodes = list(adjacency)
+    index = {node: i for i, node in enumerate(nodes)}
+    degrees = np.fromiter((len(adjacency[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    indices = np.fromiter(
+        (index[neighbor] for node in nodes for neighbor in adjacency[node]),
+        dtype=np.int64, count=int(indptr[-1])
+    )
+    weights = np.asarray([weight for node in nodes for weight in adjacency[node].values()])
+    if weights.dtype.kind not in 'iuf':
+        weights = weights.astype(np.float64)
+    ag = ArrayGraph(nodes, index, indptr, indices, weights)
+    return reorder_arrays(ag, reorder) if reorder else ag
+
+
+def locality_order(ag: ArrayGraph, method: str = 'rcm') -> 'np.ndarray':
+    """
+    计算改善访存局部性的节点排列（新编号 -> 当前编号）。
+
+    参数:
+        ag (ArrayGraph): 输入图。
+        method (str): 'rcm' 为逆 Cuthill–McKee 排序（使邻接矩阵的带宽尽量小）；
+            'bfs' 为从每个连通分量中度最小的节点出发的广度优先顺序。
+    """
+    import numpy as np
+    from scipy.sparse.csgraph import breadth_first_order, reverse_cuthill_mckee
+
+    if method not in REORDER_METHODS:
+        raise ValueError(f"未知的节点重排方式 '{method}'，可选: {list(REORDER_METHODS)}")
+    W = sparse_adjacency(ag)
+    if method == 'rcm':
+        return np.asarray(reverse_cuthill_mckee(W, symmetric_mode=True), dtype=np.int64)
+
+    degrees = np.diff(ag.indptr)
+    visited = np.zeros(len(ag.nodes), dtype=bool)
+    parts = []
+    for source in np.argsort(degrees, kind='stable'):
+        if not visited[source]:
+            component = breadth_first_order(W, int(source), directed=False, return_predecessors=False)
+            visited[component] = True
+            parts.append(component)
+    return np.concatenate(parts).astype(np.int64) if parts else np.zeros(0, dtype=np.int64)
+
+
+def reorder_arrays(ag: ArrayGraph, method: str = 'rcm') -> ArrayGraph:
+    """
+    按 locality_order 重新编号节点，每个节点的邻居按新编号升序排列。
+    节点名随编号一起移动，因此划分结果（节点名集合）无需转换；
+    以编号为下标的数组（如 cut_evaluation 的候选矩阵）可用 to_original_order 还原为重排前的列顺序。
+
+    Returns:
+        ArrayGraph: 重排后的图，order 为新编号 -> 最初（未重排时）编号的排列。
+    """
+    import numpy as np
+
+    perm = locality_order(ag, method)
+    n = len(perm)
+    inverse = np.empty(n, dtype=np.int64)
+    inverse[perm] = np.arange(n)
+
+    degrees = np.diff(ag.indptr)[perm]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    # 新的第 i 行取自旧的第 perm[i] 行
+    source = np.repeat(ag.indptr[:-1][perm] - indptr[:-1], degrees) + np.arange(indptr[-1])
+    indices = inverse[ag.indices[source]]
+    rows = np.repeat(np.arange(n), degrees)
+    by_neighbor = np.lexsort((indices, rows))
+
+    nodes = [ag.nodes[i] for i in perm.tolist()]
+    order = perm if ag.order is None else ag.order[perm]
+    return ArrayGraph(nodes, {node: i for i, node in enumerate(nodes)}, indptr,
+                      indices[by_neighbor], ag.weights[source][by_neighbor], order)
+
+
+def to_original_order(ag: ArrayGraph, values: 'np.ndarray') -> 'np.ndarray':
+    """把最后一维按 ag 的编号排列的数组还原为重排前（最初）的编号顺序；ag 未重排时原样返回。"""
+    import numpy as np
+
+    if ag.order is None:
+        return values
+    restored = np.empty_like(values)
+    restored[..., ag.order] = values
+    return restored
+
+
+def adjacency_dict(G) -> Dict[str, Dict[str, float]]:
+    """
+    返回 {节点名: {邻居名: 边权重}} 形式的邻接字典，供逐节点访问邻接关系的引擎使用。
+
+    参数:
+        G (nx.Graph | ArrayGraph | dict): 输入图；已是邻接字典时原样返回。
+            nx.Graph 的边权重取自 'weight' 属性（缺省为1）。
+    """
+    if isinstance(G, dict):
+        return G
+    if isinstance(G, ArrayGraph):
+        nodes = G.nodes
+        indptr, indices, weights = G.indptr.tolist(), G.indices.tolist(), G.weights.tolist()
+        return {
+            nodes[i]: {nodes[indices[k]]: weights[k] for k in range(indptr[i], indptr[i + 1])}
+            for i in range(len(nodes))
+        }
+    return {u: {v: data.get('weight', 1) for v, data in nbrs.items()} for u, nbrs in G.adj.items()}
+
+
+def partitioned_copy(G, partition_A: Set[str], partition_B: Set[str]) -> Optional['nx.Graph']:
+    """
+    复制图并为每个节点写入 'partition' 属性 ('A' 或 'B')，用于可视化。
+    输入为 ArrayGraph 时不构建 NetworkX 图，返回 None。
+    """
+    if isinstance(G, ArrayGraph):
+        return None
+    graph = G.copy()
+    for node in partition_A:
+        graph.nodes[node]['partition'] = 'A'
+    for node in partition_B:
+        graph.nodes[node]['partition'] = 'B'
+    return graph
+
+
+def dense_adjacency(ag: ArrayGraph) -> 'np.ndarray':
+    """
+    构建 n×n 的稠密邻接权重矩阵（整数权重保持整数类型）。
+    """
+    import numpy as np
+
+    n = len(ag.nodes)
+    dtype = np.int64 if ag.weights.dtype.kind in 'iu' else np.float64
+    W = np.zeros((n, n), dtype=dtype)
+    rows = np.repeat(np.arange(n), np.diff(ag.indptr))
+    W[rows, ag.indices] = ag.weights
+    return W
+
+
+def sparse_adjacency(ag: ArrayGraph) -> 'scipy.sparse.csr_matrix':
+    """
+    构建 n×n 的 SciPy CSR 邻接权重矩阵，直接复用 ArrayGraph 的 CSR 数组（整数权重保持整数类型）。
+    """
+    import numpy as np
+    from scipy import sparse
+
+    n = len(ag.nodes)
+    dtype = np.int64 if ag.weights.dtype.kind in 'iu' else np.float64
+    return sparse.csr_matrix((ag.weights.astype(dtype), ag.indices, ag.indptr), shape=(n, n))
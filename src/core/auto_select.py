@@ -0,0 +1,277 @@
+# EDA_Circuit_Partitioning_KL/src/core/auto_select.py
+
+"""
+auto_select.py - 基于图特征的自动算法与参数选择
+该模块实现 'auto' 算法：先计算输入图的低成本特征（节点数、边数、总边权、连通分量数），
+再用由仓库中基准测试报告 (results/generate_data/*_performance.csv) 拟合的
+代价模型预测各引擎的最终割边数与运行时间，在给定时间预算内选出预测割边数最小的引擎，
+必要时按预算收紧其轮数上限，最后调用该引擎完成划分。
+选择规则：BFS初始划分只覆盖起始节点所在的连通分量，因此图有多个连通分量时不考虑 kl_bfs。
+代价模型：
+1. 运行时间：对每个引擎按 log(时间) = a + b·log(边数) 做最小二乘拟合（幂律）。
+2. 割边质量：平均割边减少率在 log(节点数) 上分段线性插值（超出范围时取端点值）；
+   随机初始划分的期望割边数可由总边权精确算出，BFS初始划分的割边数直接在输入图上计算，
+   二者乘以 (1 - 减少率) 即为预测的最终割边数。
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import csv
+import math
+import time
+import random
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .array_graph import GraphLike, adjacency_dict
+from .base_partitioning import simple_greedy_partition
+from .kl_classic import kernighan_lin_partition
+from .kl_improvements import kernighan_lin_bfs_init, create_initial_partition, _create_bfs_initial_partition, _calculate_cut_size
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 候选引擎: 名称 -> (划分函数, 初始划分方式, 轮数上限参数名, 默认轮数上限, 基准测试报告)
+AUTO_CANDIDATES = {
+    'greedy': (simple_greedy_partition, 'random', 'max_iterations', 100, 'results/generate_data/baseline_performance.csv'),
+    'kl_random': (kernighan_lin_partition, 'random', 'max_passes', 10, 'results/generate_data/kl_classic_performance.csv'),
+    'kl_bfs': (kernighan_lin_bfs_init, 'bfs', 'max_passes', 10, 'results/generate_data/kl_improvements_performance.csv'),
+}
+
+_SCALE_PATTERN = re.compile(r'(\d+)n,\s*(\d+)e')
+
+
+def graph_features(G: GraphLike) -> Dict[str, float]:
+    """
+    计算代价模型与选择规则所用的图特征，代价为 O(n + m)。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+
+    Returns:
+        Dict[str, float]: n、m、total_weight、avg_degree、components。
+    """
+    adjacency = adjacency_dict(G)
+    nodes = list(adjacency)
+    n = len(nodes)
+    m = sum(len(neighbors) for neighbors in adjacency.values()) // 2
+    total_weight = sum(sum(neighbors.values()) for neighbors in adjacency.values()) / 2
+    avg_degree = 2 * m / n if n else 0.0
+
+    # 连通分量数 (BFS)
+    seen: Set[str] = set()
+    components = 0
+    for source in nodes:
+        if source in seen:
+            continue
+        components += 1
+        seen.add(source)
+        queue = deque([source])
+        while queue:
+            for v in adjacency[queue.popleft()]:
+                if v not in seen:
+                    seen.add(v)
+                    queue.append(v)
+
+    return {'n': n, 'm': m, 'total_weight': total_weight, 'avg_degree': avg_degree, 'components': components}
+
+
+def _read_benchmark_csv(path: str) -> List[Tuple[int, int, float, float]]:
+    """读取性能报告CSV，返回 [(节点数, 边数, 平均割边减少率, 平均运行时间)]，规模由列名 'Small (10n, 20e)' 解析。"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    metrics = {row[0]: row[1:] for row in rows[1:]}
+    points = []
+    for i, header in enumerate(rows[0][1:]):
+        scale = _SCALE_PATTERN.search(header)
+        rate = metrics['Average Cut-edge Reduction Rate'][i].strip()
+        runtime = metrics['Average Algorithm Runtime (s)'][i].strip()
+        if scale and rate and runtime:
+            points.append((int(scale.group(1)), int(scale.group(2)), float(rate.rstrip('%')) / 100, float(runtime)))
+    return points
+
+
+def _interpolate(x: float, xs: List[float], ys: List[float]) -> float:
+    """分段线性插值，xs 升序，超出范围时取端点值。"""
+    if x <= xs[0]:
+        return ys[0]
+    for i in range(1, len(xs)):
+        if x <= xs[i]:
+            t = (x - xs[i - 1]) / (xs[i] - xs[i - 1]) if xs[i] > xs[i - 1] else 1.0
+            return ys[i - 1] + t * (ys[i] - ys[i - 1])
+    return ys[-1]
+
+
+class CostModel:
+    """
+    由基准测试报告拟合的代价模型，预测各候选引擎在给定图上的最终割边数与运行时间。
+
+    参数:
+        benchmarks (Dict[str, List[Tuple[int, int, float, float]]]): 引擎名 -> [(节点数, 边数, 平均减少率, 平均运行时间)]。
+    """
+
+    def __init__(self, benchmarks: Dict[str, List[Tuple[int, int, float, float]]]):
+        self._runtime_fit: Dict[str, Tuple[float, float]] = {}
+        self._rate_curve: Dict[str, Tuple[List[float], List[float]]] = {}
+        for algo_key, points in benchmarks.items():
+            points = sorted(points)
+            if not points:
+                continue
+            xs = [math.log(max(m, 1)) for _, m, _, _ in points]
+            ys = [math.log(max(t, 1e-9)) for _, _, _, t in points]
+            x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+            sxx = sum((x - x_mean) ** 2 for x in xs)
+            slope = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sxx if sxx > 0 else 0.0
+            self._runtime_fit[algo_key] = (y_mean - slope * x_mean, slope)
+            self._rate_curve[algo_key] = ([math.log(max(n, 1)) for n, _, _, _ in points], [r for _, _, r, _ in points])
+
+    @classmethod
+    def from_reports(cls, csv_paths: Optional[Dict[str, str]] = None) -> 'CostModel':
+        """从性能报告CSV拟合模型；csv_paths 默认为 AUTO_CANDIDATES 中各引擎的报告，相对路径以项目根目录为基准。"""
+        if csv_paths is None:
+            csv_paths = {key: info[4] for key, info in AUTO_CANDIDATES.items()}
+        benchmarks = {}
+        for algo_key, path in csv_paths.items():
+            full_path = path if os.path.isabs(path) else os.path.join(_PROJECT_ROOT, path)
+            if os.path.exists(full_path):
+                benchmarks[algo_key] = _read_benchmark_csv(full_path)
+        if not any(benchmarks.values()):
+            raise ValueError(f"找不到可用于拟合代价模型的基准测试报告: {list(csv_paths.values())}，请先运行 run_experiments.py。")
+        return cls(benchmarks)
+
+    @property
+    def algorithms(self) -> List[str]:
+        return list(self._runtime_fit)
+
+    def predict_runtime(self, algo_key: str, features: Dict[str, float]) -> float:
+        intercept, slope = self._runtime_fit[algo_key]
+        return math.exp(intercept + slope * math.log(max(features['m'], 1)))
+
+    def predict_reduction_rate(self, algo_key: str, features: Dict[str, float]) -> float:
+        xs, ys = self._rate_curve[algo_key]
+        return _interpolate(math.log(max(features['n'], 1)), xs, ys)
+
+
+_DEFAULT_MODEL: Optional[CostModel] = None
+
+
+def _default_model() -> CostModel:
+    """进程内缓存的默认代价模型。"""
+    global _DEFAULT_MODEL
+    if _DEFAULT_MODEL is None:
+        _DEFAULT_MODEL = CostModel.from_reports()
+    return _DEFAULT_MODEL
+
+
+def _expected_random_cut(features: Dict[str, float]) -> float:
+    """随机对半划分的期望割边数：每条边两端分属两侧的概率为 2·|A|·|B| / (n·(n-1))。"""
+    n = features['n']
+    if n < 2:
+        return 0.0
+    size_A = n // 2
+    return features['total_weight'] * 2 * size_A * (n - size_A) / (n * (n - 1))
+
+
+def select_algorithm(
+    G: GraphLike,
+    time_budget: Optional[float] = None,
+    start_node: Optional[str] = None,
+    model: Optional[CostModel] = None,
+    features: Optional[Dict[str, float]] = None
+) -> Dict:
+    """
+    为图 G 选择引擎及其轮数上限。图有多个连通分量时跳过BFS初始划分的引擎：
+    BFS只遍历起始节点所在的连通分量，其初始划分会遗漏其余分量的节点。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        time_budget (Optional[float]): 时间预算（秒）；为 None 时不限时间，只比较预测割边数。
+        start_node (Optional[str]): kl_bfs 的BFS起始节点，用于计算其初始割边数。
+        model (Optional[CostModel]): 代价模型，默认由仓库中的基准测试报告拟合。
+        features (Optional[Dict[str, float]]): 已计算好的图特征，默认调用 graph_features。
+
+    Returns:
+        Dict: algorithm、limit_name、limit（轮数上限）、predicted_cut、predicted_runtime、features、candidates。
+    """
+    model = model or _default_model()
+    features = features or graph_features(G)
+    random_cut = _expected_random_cut(features)
+
+    candidates = []
+    for algo_key in model.algorithms:
+        if algo_key not in AUTO_CANDIDATES:
+            continue
+        _, init, limit_name, default_limit, _ = AUTO_CANDIDATES[algo_key]
+        if init == 'bfs' and features['components'] > 1:
+            continue
+        if init == 'bfs':
+            initial_cut = _calculate_cut_size(G, *_create_bfs_initial_partition(G, start_node))
+        else:
+            initial_cut = random_cut
+        candidates.append({
+            'algorithm': algo_key, 'limit_name': limit_name, 'limit': default_limit,
+            'predicted_cut': initial_cut * (1 - model.predict_reduction_rate(algo_key, features)),
+            'predicted_runtime': model.predict_runtime(algo_key, features),
+        })
+
+    if not candidates:
+        raise ValueError(f"代价模型中没有适用于该图的候选引擎 (连通分量数 {features['components']})。")
+
+    within_budget = [c for c in candidates if time_budget is None or c['predicted_runtime'] <= time_budget]
+    if within_budget:
+        best = min(within_budget, key=lambda c: (c['predicted_cut'], c['predicted_runtime']))
+    else:
+        # 没有引擎能在预算内按默认轮数完成：选预测割边数最小的引擎，并按预算等比例收紧轮数上限
+        # （各引擎达到局部最优后会提前结束，运行时间至多与轮数成正比，因此这是保守估计）
+        best = dict(min(candidates, key=lambda c: (c['predicted_cut'], c['predicted_runtime'])))
+        scale = time_budget / best['predicted_runtime']
+        best['limit'] = max(1, int(best['limit'] * scale))
+        best['predicted_runtime'] *= best['limit'] / AUTO_CANDIDATES[best['algorithm']][3]
+    return dict(best, features=features, candidates=candidates)
+
+
+def auto_partition(
+    G: GraphLike,
+    start_node: Optional[str] = None,
+    time_budget: Optional[float] = None,
+    verbose: bool = True
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    根据图特征与代价模型自动选择引擎并完成划分。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        start_node (Optional[str]): 选中 kl_bfs 时的BFS起始节点，为 None 时随机选择。
+        time_budget (Optional[float]): 时间预算（秒），为 None 时只追求最小的预测割边数。
+        verbose (bool): 是否打印选择结果与所选引擎的执行过程。
+
+    Returns:
+        (与kl_classic.py的返回接口完全一致；运行时间包含特征计算与选择的开销，
+         history 的第一项额外记录所选的 'algorithm')
+    """
+    start_time = time.perf_counter()
+    if start_node is None and G.number_of_nodes() > 0:
+        start_node = random.choice(list(G.nodes))
+    selection = select_algorithm(G, time_budget, start_node)
+    algo_key = selection['algorithm']
+    func, init, limit_name, _, _ = AUTO_CANDIDATES[algo_key]
+
+    if verbose:
+        features = selection['features']
+        print(f"--- 自动选择 (n={features['n']}, m={features['m']}, 平均度={features['avg_degree']:.2f}, "
+              f"连通分量={features['components']}) ---")
+        print(f"选择 {algo_key} ({limit_name}={selection['limit']})，预测割边数 {selection['predicted_cut']:.1f}，"
+              f"预测运行时间 {selection['predicted_runtime']:.6f} 秒")
+
+    if init == 'bfs':
+        result = func(G, start_node=start_node, verbose=verbose, **{limit_name: selection['limit']})
+    else:
+        result = func(G, create_initial_partition(G, init), verbose=verbose, **{limit_name: selection['limit']})
+
+    partition_A, partition_B, cut_size, history, _, initial_graph, final_graph = result
+    history[0]['algorithm'] = algo_key
+    return partition_A, partition_B, cut_size, history, time.perf_counter() - start_time, initial_graph, final_graph
@@ -4,132 +4,257 @@
 base_partitioning.py - 基线划分算法：单步最优贪心策略
 该模块实现了一个简单的贪心划分算法，作为KL算法的对照组。
 它的策略是：在每一步都寻找并执行能带来最大即时收益的单次节点对交换。
+实现上采用增量方式：两侧节点的D值保存在带懒删除的最大堆中，
+每次交换后只更新被交换节点及其邻居的D值，割边数由增益递推，
+单步代价约为 O(deg · log n)，而非逐步重算全部D值与割边数的 O(n² + m)。
+生成器形式 simple_greedy_iterations 按迭代产出状态快照，支持断点续跑。
 """
 
-import networkx as nx
+from __future__ import annotations
+
 import time
-from typing import Set, Tuple, List, Dict
+import heapq
+from typing import TYPE_CHECKING, Iterator, Set, Tuple, List, Dict, Optional
+
+from .array_graph import GraphLike, graph_to_arrays, adjacency_dict, partitioned_copy
+from .checkpoint import PartitionState, check_resume_state, last_state
 
-def _calculate_cut_size(G: nx.Graph, partition_A: Set[str], partition_B: Set[str]) -> int:
-    """计算两个分区之间的割边数量（考虑权重）。"""
+if TYPE_CHECKING:
+    import networkx as nx
+
+def _calculate_cut_size(G: GraphLike, partition_A: Set[str], partition_B: Set[str]) -> int:
+    """计算两个分区之间的割边数量（考虑权重）。G 可以是 nx.Graph、ArrayGraph 或邻接字典。"""
     cut_size = 0
-    for u, v, data in G.edges(data=True):
-        weight = data.get('weight', 1)
-        if (u in partition_A and v in partition_B) or \
-           (u in partition_B and v in partition_A):
-            cut_size += weight
+    for u, neighbors in adjacency_dict(G).items():
+        if u in partition_A:
+            for v, weight in neighbors.items():
+                if v in partition_B:
+                    cut_size += weight
     return cut_size
 
-def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str]) -> Dict[str, int]:
-    """为图中所有节点计算D值 (E(v) - I(v))。"""
-    D_values = {}
-    nodes = list(partition_A) + list(partition_B)
-    
-    for node in nodes:
-        E_v, I_v = 0, 0
-        current_partition = partition_A if node in partition_A else partition_B
-        other_partition = partition_B if node in partition_A else partition_A
-
-        for neighbor in G.neighbors(node):
-            weight = G.get_edge_data(node, neighbor).get('weight', 1)
-            if neighbor in other_partition:
-                E_v += weight
-            elif neighbor in current_partition:
-                I_v += weight
-        D_values[node] = E_v - I_v
-    return D_values
+def _node_D_value(adjacency: List[Dict[int, int]], in_A: List[bool], u: int) -> int:
+    """按节点编号计算单个节点的D值 (E(u) - I(u))。"""
+    D_u = 0
+    for v, weight in adjacency[u].items():
+        D_u += weight if in_A[v] != in_A[u] else -weight
+    return D_u
 
-def simple_greedy_partition(
-    G: nx.Graph, 
-    initial_partition: Tuple[Set[str], Set[str]],
+def _pop_valid(heap: List[Tuple[int, int, int]], version: List[int], popped: List[Tuple[int, int, int]]) -> bool:
+    """
+    从懒删除堆中弹出下一个有效条目（版本号与节点当前版本一致）追加到 popped。
+    堆为空时返回 False。
+    """
+    while heap:
+        entry = heapq.heappop(heap)
+        if entry[2] == version[entry[1]]:
+            popped.append(entry)
+            return True
+    return False
+
+def _find_best_swap(
+    heap_A: List[Tuple[int, int, int]],
+    heap_B: List[Tuple[int, int, int]],
+    version: List[int],
+    adjacency: List[Dict[int, int]]
+) -> Tuple[int, Optional[Tuple[int, int]]]:
+    """
+    寻找增益 D[a] + D[b] - 2·c_ab 最大且为正的交换对。
+
+    两侧候选按D值从大到小惰性地从堆中取出。对固定的 a，
+    一旦遇到与 a 不相邻的 b，其后的 b 增益只会更小，可立即停止；
+    当 D[a] + max D[B] 已不超过当前最优增益时，其后的 a 也无需再看。
+    因此每步只需检查少量候选及其邻居（边权重需非负）。
+    """
+    best_gain, best_pair = 0, None  # 只考虑正增益
+    popped_A, popped_B = [], []
+    i = 0
+    while (i < len(popped_A) or _pop_valid(heap_A, version, popped_A)) and \
+          (popped_B or _pop_valid(heap_B, version, popped_B)):
+        D_a, a = -popped_A[i][0], popped_A[i][1]
+        if D_a - popped_B[0][0] <= best_gain:
+            break
+        j = 0
+        while j < len(popped_B) or _pop_valid(heap_B, version, popped_B):
+            D_b, b = -popped_B[j][0], popped_B[j][1]
+            if D_a + D_b <= best_gain:
+                break
+            c_ab = adjacency[a].get(b, 0)
+            if D_a + D_b - 2 * c_ab > best_gain:
+                best_gain, best_pair = D_a + D_b - 2 * c_ab, (a, b)
+            if c_ab == 0:
+                break
+            j += 1
+        i += 1
+
+    # 将取出的有效条目放回堆中
+    for entry in popped_A:
+        heapq.heappush(heap_A, entry)
+    for entry in popped_B:
+        heapq.heappush(heap_B, entry)
+    return best_gain, best_pair
+
+def simple_greedy_iterations(
+    G: GraphLike,
+    initial_partition: Optional[Tuple[Set[str], Set[str]]] = None,
     max_iterations: int = 100,
-    verbose: bool = True
-) -> Tuple[Set[str], Set[str], int, List[Dict], float, nx.Graph, nx.Graph]:
+    verbose: bool = False,
+    resume_from: Optional[PartitionState] = None,
+    yield_every: int = 1
+) -> Iterator[PartitionState]:
     """
-    使用单步最优贪心策略对图进行两路划分。
+    单步最优贪心算法的生成器形式：先产出起始状态，之后每完成 yield_every 次迭代产出一个 PartitionState 快照，
+    收敛或达到 max_iterations 时再产出最终状态。贪心算法的割边数单调下降，快照中的当前划分即迄今最优划分。
 
     参数:
-        G (nx.Graph): 待划分的图。
-        initial_partition (Tuple[Set[str], Set[str]]): 初始分区 A 和 B。
-        max_iterations (int): 最大迭代轮数上限，作为安全终止条件。
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Optional[Tuple[Set[str], Set[str]]]): 初始分区 A 和 B；续跑时可省略。
+        max_iterations (int): 最大迭代次数上限（续跑时已完成的迭代也计算在内）。
         verbose (bool): 是否打印详细的执行过程信息。
+        resume_from (Optional[PartitionState]): 从该检查点继续；给出时忽略 initial_partition。
+        yield_every (int): 每隔多少次迭代产出一次快照（单次迭代只需 O(deg·log n)，而快照需要 O(n)）。
 
-    Returns:
-        Tuple[...]: (与kl_classic.py的返回接口完全一致)
-            - final_partition_A, final_partition_B: 优化后的分区。
-            - final_cut_size: 优化后的最小割边数。
-            - history: 记录每轮迭代信息的列表。
-            - execution_time: 算法总运行时间（秒）。
-            - initial_graph: 带有初始分区信息的图对象。
-            - final_graph: 带有最终分区信息的图对象。
+    Yields:
+        PartitionState: 起始状态（或续跑的检查点）、中间状态与最终状态。
     """
+    if yield_every < 1:
+        raise ValueError(f"yield_every 必须为正整数，实际为 {yield_every}。")
     start_time = time.perf_counter()
 
-    partition_A, partition_B = initial_partition[0].copy(), initial_partition[1].copy()
-    
-    initial_graph = G.copy()
-    for node in partition_A:
-        initial_graph.nodes[node]['partition'] = 'A'
-    for node in partition_B:
-        initial_graph.nodes[node]['partition'] = 'B'
-    
-    initial_cut_size = _calculate_cut_size(G, partition_A, partition_B)
-    history = [{'iteration': 0, 'cut_size': initial_cut_size, 'details': 'Initial state'}]
-    
-    if verbose:
-        print(f"--- 简单贪心算法开始 ---")
-        print(f"初始割边数: {initial_cut_size}")
+    # 构建按编号索引的邻接表
+    ag = graph_to_arrays(G)
+    nodes = ag.nodes
+    indptr, indices, weights = ag.indptr.tolist(), ag.indices.tolist(), ag.weights.tolist()
+    adjacency = [dict(zip(indices[indptr[u]:indptr[u + 1]], weights[indptr[u]:indptr[u + 1]]))
+                 for u in range(len(nodes))]
 
-    for iter_num in range(1, max_iterations + 1):
+    if resume_from is not None:
+        check_resume_state(resume_from, 'greedy', nodes)
+        partition_A, partition_B = resume_from.partition_A.copy(), resume_from.partition_B.copy()
+        in_A = [node in partition_A for node in nodes]
+        D = [resume_from.D_values[node] for node in nodes]
+        current_cut_size = resume_from.cut_size
+        history = list(resume_from.history)
+        start_time -= resume_from.elapsed
+        start_iteration = resume_from.pass_num + 1
+        yield resume_from
+        if resume_from.converged:
+            return
+    elif initial_partition is None:
+        raise ValueError("需要提供 initial_partition 或 resume_from。")
+    else:
+        partition_A, partition_B = initial_partition[0].copy(), initial_partition[1].copy()
+        current_cut_size = _calculate_cut_size(G, partition_A, partition_B)
+        history = [{'iteration': 0, 'cut_size': current_cut_size, 'details': 'Initial state', 'elapsed': time.perf_counter() - start_time}]
+        if verbose:
+            print(f"--- 简单贪心算法开始 ---")
+            print(f"初始割边数: {current_cut_size}")
+        in_A = [node in partition_A for node in nodes]
+        D = [_node_D_value(adjacency, in_A, u) for u in range(len(nodes))]
+        start_iteration = 1
+
+    def snapshot(iteration: int, converged: bool) -> PartitionState:
+        snapshot_A, snapshot_B = partition_A.copy(), partition_B.copy()
+        return PartitionState(
+            'greedy', iteration, snapshot_A, snapshot_B, {nodes[u]: D[u] for u in range(len(nodes))},
+            current_cut_size, snapshot_A, snapshot_B, current_cut_size, list(history),
+            time.perf_counter() - start_time, converged
+        )
+
+    if resume_from is None:
+        yield snapshot(0, False)
+
+    # 两侧D值的最大堆（带版本号的懒删除）
+    version = [0] * len(nodes)
+    heap_A = [(-D[u], u, 0) for u in range(len(nodes)) if in_A[u]]
+    heap_B = [(-D[u], u, 0) for u in range(len(nodes)) if not in_A[u]]
+    heapq.heapify(heap_A)
+    heapq.heapify(heap_B)
+
+    for iter_num in range(start_iteration, max_iterations + 1):
         if verbose:
             print(f"\n--- Iteration {iter_num} ---")
         
-        # 1. 计算当前分区的D值
-        D = _calculate_D_values(G, partition_A, partition_B)
-        
-        # 2. 寻找能带来最大即时收益的单步交换
-        best_gain_this_iter = 0  # 只考虑正增益
-        best_pair_to_swap = None
+        # 1. 从两侧D值堆中寻找能带来最大即时收益的单步交换
+        best_gain_this_iter, best_pair_to_swap = _find_best_swap(heap_A, heap_B, version, adjacency)
         
-        for a in partition_A:
-            for b in partition_B:
-                c_ab = G.get_edge_data(a, b, default={'weight': 0})['weight']
-                gain = D[a] + D[b] - 2 * c_ab
-                if gain > best_gain_this_iter:
-                    best_gain_this_iter = gain
-                    best_pair_to_swap = (a, b)
-        
-        # 3. 决策与执行
+        # 2. 决策与执行
         if best_pair_to_swap:
-            a_swap, b_swap = best_pair_to_swap
+            a_idx, b_idx = best_pair_to_swap
+            a_swap, b_swap = nodes[a_idx], nodes[b_idx]
             
             # 永久执行交换
             partition_A.remove(a_swap); partition_A.add(b_swap)
             partition_B.remove(b_swap); partition_B.add(a_swap)
-            
-            current_cut_size = _calculate_cut_size(G, partition_A, partition_B)
+            in_A[a_idx], in_A[b_idx] = False, True
+            current_cut_size -= best_gain_this_iter
+
+            # 3. 增量更新：只有被交换节点及其邻居的D值会改变
+            changed = {a_idx, b_idx}
+            for moved in (a_idx, b_idx):
+                for u, weight in adjacency[moved].items():
+                    if u in (a_idx, b_idx):
+                        continue
+                    # moved 与 u 变为同侧则 D[u] 减少 2w，变为异侧则增加 2w
+                    D[u] += -2 * weight if in_A[u] == in_A[moved] else 2 * weight
+                    changed.add(u)
+            D[a_idx] = _node_D_value(adjacency, in_A, a_idx)
+            D[b_idx] = _node_D_value(adjacency, in_A, b_idx)
+            for u in changed:
+                version[u] += 1
+                heapq.heappush(heap_A if in_A[u] else heap_B, (-D[u], u, version[u]))
+
             history.append({
                 'iteration': iter_num, 
                 'cut_size': current_cut_size, 
-                'details': f"Swapped {a_swap} and {b_swap} with gain {best_gain_this_iter:.2f}"
+                'details': f"Swapped {a_swap} and {b_swap} with gain {best_gain_this_iter:.2f}",
+                'elapsed': time.perf_counter() - start_time
             })
             if verbose:
                 print(f"执行交换: {a_swap} <-> {b_swap} (Gain: {best_gain_this_iter:.2f})")
                 print(f"Iteration {iter_num} 结束。更新后割边数: {current_cut_size}")
+            if iter_num % yield_every == 0 or iter_num == max_iterations:
+                yield snapshot(iter_num, False)
         else:
             # 如果找不到任何正增益的交换，则算法收敛
             if verbose:
                 print("找不到任何可产生正增益的交换，算法收敛。")
-            break
-            
-    # 在循环结束后整理最终结果
-    final_cut_size = _calculate_cut_size(G, partition_A, partition_B)
-    
-    final_graph = G.copy()
-    for node in partition_A:
-        final_graph.nodes[node]['partition'] = 'A'
-    for node in partition_B:
-        final_graph.nodes[node]['partition'] = 'B'
+            yield snapshot(iter_num - 1, True)
+            return
+
+def simple_greedy_partition(
+    G: GraphLike, 
+    initial_partition: Tuple[Set[str], Set[str]],
+    max_iterations: int = 100,
+    verbose: bool = True
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    使用单步最优贪心策略对图进行两路划分（把 simple_greedy_iterations 运行到底）。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Tuple[Set[str], Set[str]]): 初始分区 A 和 B。
+        max_iterations (int): 最大迭代轮数上限，作为安全终止条件。
+        verbose (bool): 是否打印详细的执行过程信息。
+
+    Returns:
+        Tuple[...]: (与kl_classic.py的返回接口完全一致)
+            - final_partition_A, final_partition_B: 优化后的分区。
+            - final_cut_size: 优化后的最小割边数。
+            - history: 记录每轮迭代信息的列表，每项的 'elapsed' 为自开始起的耗时（秒）。
+            - execution_time: 算法总运行时间（秒）。
+            - initial_graph: 带有初始分区信息的图对象（G 为 ArrayGraph 时为 None）。
+            - final_graph: 带有最终分区信息的图对象（G 为 ArrayGraph 时为 None）。
+    """
+    start_time = time.perf_counter()
+
+    # 只在开始与结束时产出快照，避免逐次迭代复制整个划分
+    states = simple_greedy_iterations(G, initial_partition, max_iterations, verbose, yield_every=max(1, max_iterations))
+    initial_state = next(states)
+    initial_graph = partitioned_copy(G, initial_state.partition_A, initial_state.partition_B)
+
+    state = last_state(states, initial_state)
+    final_cut_size = state.cut_size
+    final_graph = partitioned_copy(G, state.partition_A, state.partition_B)
     
     end_time = time.perf_counter()
     execution_time = end_time - start_time
@@ -139,4 +264,4 @@ def simple_greedy_partition(
         print(f"最终最小割边数: {final_cut_size}")
         print(f"总运行时间: {execution_time:.6f} 秒")
         
-    return partition_A, partition_B, final_cut_size, history, execution_time, initial_graph, final_graph
\ No newline at end of file
+    return state.partition_A, state.partition_B, final_cut_size, state.history, execution_time, initial_graph, final_graph
@@ -0,0 +1,114 @@
+# EDA_Circuit_Partitioning_KL/src/core/checkpoint.py
+
+"""
+checkpoint.py - 逐轮状态快照与断点续跑
+各划分引擎的生成器形式（kl_classic.kernighan_lin_passes、kl_improvements.kernighan_lin_bfs_passes、
+base_partitioning.simple_greedy_iterations）先产出起始状态，之后每完成一轮产出一个 PartitionState，
+其中包含当前划分、供下一轮使用的D值、迄今最优划分与轮次计数。
+快照可以保存为 JSON 文件；进程被中断后，用 load_checkpoint 读回并作为生成器的 resume_from 参数，
+即可从最后一个检查点继续，而无需从头开始。原有的函数形式只是把生成器运行到底的薄封装。
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+CHECKPOINT_VERSION = 1
+
+
+class PartitionState(NamedTuple):
+    """
+    某一轮结束时的引擎状态快照。
+
+    属性:
+        algorithm (str): 产生该状态的引擎 ('kl_classic'、'kl_bfs' 或 'greedy')，续跑时用于校验。
+        pass_num (int): 已完成的轮数（贪心算法为已完成的迭代次数），起始状态为0。
+        partition_A (Set[str]): 当前分区A。
+        partition_B (Set[str]): 当前分区B。
+        D_values (Dict[str, float]): 当前划分下每个节点的D值 (E - I)，续跑时直接用于下一轮。
+        cut_size (float): 当前划分的割边数。
+        best_partition_A (Set[str]): 迄今最优划分的分区A。
+        best_partition_B (Set[str]): 迄今最优划分的分区B。
+        best_cut_size (float): 迄今最优割边数。
+        history (List[Dict]): 与函数形式返回值相同的逐轮记录。
+        elapsed (float): 截至该状态的累计运行时间（秒），续跑时在此基础上继续计时。
+        converged (bool): 是否已收敛（再运行也不会改变结果）。
+    """
+    algorithm: str
+    pass_num: int
+    partition_A: Set[str]
+    partition_B: Set[str]
+    D_values: Dict[str, float]
+    cut_size: float
+    best_partition_A: Set[str]
+    best_partition_B: Set[str]
+    best_cut_size: float
+    history: List[Dict]
+    elapsed: float
+    converged: bool = False
+
+
+def check_resume_state(state: PartitionState, algorithm: str, nodes: Iterable[str]) -> None:
+    """续跑前校验检查点：引擎必须一致，且检查点中的划分恰好覆盖当前图的全部节点。"""
+    if state.algorithm != algorithm:
+        raise ValueError(f"检查点来自引擎 '{state.algorithm}'，不能用于 '{algorithm}' 续跑。")
+    node_set = set(nodes)
+    if len(state.partition_A) + len(state.partition_B) != len(node_set) or \
+            state.partition_A | state.partition_B != node_set:
+        raise ValueError("检查点中的划分与输入图的节点不一致，请确认使用的是同一张图。")
+
+
+def last_state(states: Iterable[PartitionState], state: Optional[PartitionState] = None) -> PartitionState:
+    """运行生成器直到结束，返回最后一个状态；生成器已耗尽时返回传入的 state。"""
+    for state in states:
+        pass
+    if state is None:
+        raise ValueError("划分生成器没有产出任何状态。")
+    return state
+
+
+def save_checkpoint(state: PartitionState, path: str) -> None:
+    """
+    将状态写入 JSON 检查点。先写临时文件再原子替换，进程在写入途中被终止时旧检查点仍然完整。
+    """
+    data = state._asdict()
+    for field in ('partition_A', 'partition_B', 'best_partition_A', 'best_partition_B'):
+        data[field] = list(data[field])
+    data['version'] = CHECKPOINT_VERSION
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path: str) -> PartitionState:
+    """读取 save_checkpoint 写出的检查点。"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    version = data.pop('version', None)
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"不支持的检查点版本: {version}")
+    for field in ('partition_A', 'partition_B', 'best_partition_A', 'best_partition_B'):
+        data[field] = set(data[field])
+    return PartitionState(**data)
+
+
+def run_with_checkpoint(states: Iterable[PartitionState], path: str) -> PartitionState:
+    """
+    运行划分生成器，每产出一个状态就覆盖保存一次检查点，返回最后一个状态。
+
+    典型用法（进程被抢占后重新执行同一段代码即可从检查点继续）:
+        resume = load_checkpoint(path) if os.path.exists(path) else None
+        state = run_with_checkpoint(kernighan_lin_passes(G, initial, resume_from=resume), path)
+    """
+    state: Optional[PartitionState] = None
+    for state in states:
+        save_checkpoint(state, path)
+    if state is None:
+        raise ValueError("划分生成器没有产出任何状态。")
+    return state
@@ -0,0 +1,175 @@
+# EDA_Circuit_Partitioning_KL/src/core/consensus_coarsening.py
+
+"""
+consensus_coarsening.py - 多起点共识粗化
+独立的随机重启只保留最好的一次结果，其余运行的信息全部丢弃。该模块利用这些廉价运行：
+1. 对多个起点各运行短程的近似快速KL（kl_fast，默认只运行1轮）；它只使用邻接表，内存与图的规模成正比，
+   不像 kl_batched 那样需要稠密的 n×n 矩阵，因此共识阶段也适用于大图。
+2. 在所有运行中都被分到同一侧的节点构成共识组；每组再按连通性拆分后收缩为超节点。
+3. 在小得多的收缩图上，从最好的一次短程运行出发运行完整的经典KL。
+4. 展开回原始节点并恢复平衡，再在原始图上运行少量几轮KL细化（超节点的交换会打破节点数平衡，
+   恢复平衡的单节点移动可能抵消一部分收益）；若结果不如最好的短程运行，则返回该短程运行的划分。
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .array_graph import GraphLike, adjacency_dict, graph_to_arrays, partitioned_copy
+from .graph_reduction import ReducedGraph, contract_groups, expand_partition, project_partition, rebalance_partition
+from .kl_batched import _random_initial_sides
+from .kl_classic import _calculate_cut_size, kernighan_lin_partition
+from .kl_fast import kernighan_lin_fast
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+def consensus_groups(G: GraphLike, partitions_A: List[Set[str]]) -> List[List[str]]:
+    """
+    返回在每个划分中都位于同一侧、且在图中连通的节点组。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        partitions_A (List[Set[str]]): 各次运行的A区（分区标签可任意翻转，不影响分组）。
+    """
+    adjacency = adjacency_dict(G)
+    signature = {u: tuple(u in partition_A for partition_A in partitions_A) for u in adjacency}
+    groups, seen = [], set()
+    for root in adjacency:
+        if root in seen:
+            continue
+        seen.add(root)
+        group, frontier = [root], [root]
+        while frontier:
+            u = frontier.pop()
+            for v in adjacency[u]:
+                if v not in seen and signature[v] == signature[root]:
+                    seen.add(v)
+                    group.append(v)
+                    frontier.append(v)
+        groups.append(group)
+    return groups
+
+
+def _append_rounds(history: List[Dict], stage_history: List[Dict], stage_start: float):
+    """把某一阶段的逐轮记录（去掉其初始状态）接到 history 之后，轮数与耗时换算为自整个运行开始起。"""
+    offset = history[-1]['pass']
+    history.extend(dict(entry, **{'pass': entry['pass'] + offset, 'elapsed': entry['elapsed'] + stage_start})
+                   for entry in stage_history[1:])
+
+
+def consensus_coarsen(
+    G: GraphLike,
+    initial_partition: Tuple[Set[str], Set[str]],
+    num_starts: int = 8,
+    start_passes: int = 1,
+    seed: Optional[int] = None
+) -> Tuple[ReducedGraph, Tuple[Set[str], Set[str]], int]:
+    """
+    运行 num_starts 个短程快速KL（第一个从 initial_partition 出发，其余为随机平衡划分），按共识收缩图。
+
+    Returns:
+        Tuple[ReducedGraph, Tuple[Set[str], Set[str]], int]:
+            (收缩图, 最好的短程运行在原始图上的划分, 其割边数)
+    """
+    if num_starts < 1:
+        raise ValueError(f"num_starts 必须为正整数，实际为 {num_starts}。")
+    ag = graph_to_arrays(G)
+    first = np.fromiter((u in initial_partition[0] for u in ag.nodes), dtype=bool, count=len(ag.nodes))
+    if seed is None:
+        seed = random.getrandbits(32)  # 跟随全局随机种子，run_experiments.py 中每次运行可复现
+    sides = np.vstack([first[None, :], _random_initial_sides(len(ag.nodes), num_starts - 1, seed)])
+
+    starts_A, starts_B, start_cuts = [], [], []
+    for row in sides:
+        side_A = {u for u, in_A in zip(ag.nodes, row.tolist()) if in_A}
+        side_B = set(ag.nodes) - side_A
+        start_A, start_B, start_cut, _, _, _, _ = kernighan_lin_fast(
+            ag, (side_A, side_B), max_passes=start_passes, verbose=False)
+        starts_A.append(start_A)
+        starts_B.append(start_B)
+        start_cuts.append(start_cut)
+    best = int(np.argmin(start_cuts))
+    coarse = contract_groups(ag, consensus_groups(ag, starts_A))
+    return coarse, (starts_A[best], starts_B[best]), int(start_cuts[best])
+
+
+def kernighan_lin_consensus(
+    G: GraphLike,
+    initial_partition: Tuple[Set[str], Set[str]],
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    num_starts: int = 8,
+    start_passes: int = 1,
+    refine_passes: int = 2,
+    seed: Optional[int] = None,
+    verbose: bool = True
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    多起点共识粗化后的经典KL。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Tuple[Set[str], Set[str]]): 初始划分，作为第一个短程运行的起点。
+        max_passes (int): 收缩图上完整KL的最大轮数。
+        pass_cutoff (Optional[float]): 轮内提前结束阈值，含义与 kl_classic.kernighan_lin_partition 相同。
+        num_starts (int): 短程运行的起点数。
+        start_passes (int): 每个短程运行的轮数。
+        refine_passes (int): 展开后在原始图上细化的最大轮数，0 表示不细化。
+        seed (Optional[int]): 随机起点的种子；为None时由全局 random 生成。
+        verbose (bool): 是否打印详细的执行过程信息。
+
+    Returns:
+        (与kl_classic.py的返回接口完全一致。history 依次为初始划分、最好的短程运行、
+         收缩图上的各轮、恢复平衡（若有移动）以及原始图上的各细化轮。)
+    """
+    start_time = time.perf_counter()
+
+    ag = graph_to_arrays(G)
+    adjacency = adjacency_dict(ag)
+    initial_graph = partitioned_copy(G, initial_partition[0], initial_partition[1])
+    initial_cut_size = _calculate_cut_size(adjacency, initial_partition[0], initial_partition[1])
+    history = [{'pass': 0, 'cut_size': initial_cut_size, 'details': 'Initial state', 'elapsed': time.perf_counter() - start_time}]
+
+    coarse, (start_A, start_B), start_cut = consensus_coarsen(ag, initial_partition, num_starts, start_passes, seed)
+    history.append({'pass': start_passes, 'cut_size': start_cut, 'details': f'Best of {num_starts} quick starts',
+                    'elapsed': time.perf_counter() - start_time})
+    if verbose:
+        print(f"--- 共识粗化: {num_starts} 个短程运行的最好割边数 {start_cut}，"
+              f"{coarse.num_original_nodes} -> {coarse.graph.number_of_nodes()} 个节点 ---")
+
+    # 每个共识组在所有短程运行中都位于同一侧，因此最好的短程运行可以无损投影到收缩图上
+    coarse_start = time.perf_counter() - start_time
+    coarse_A, coarse_B, _, coarse_history, _, _, _ = kernighan_lin_partition(
+        coarse.graph, project_partition(coarse, (start_A, start_B)),
+        max_passes=max_passes, pass_cutoff=pass_cutoff, verbose=verbose)
+    _append_rounds(history, coarse_history, coarse_start)
+
+    partition_A, partition_B = expand_partition(coarse, coarse_A, coarse_B)
+    partition_A, partition_B, moved, cut_size = rebalance_partition(adjacency, partition_A, partition_B)
+    if moved:
+        history.append({'pass': history[-1]['pass'], 'cut_size': cut_size,
+                        'details': f'Expanded and rebalanced ({moved} moves)', 'elapsed': time.perf_counter() - start_time})
+    if refine_passes > 0:
+        refine_start = time.perf_counter() - start_time
+        partition_A, partition_B, cut_size, refine_history, _, _, _ = kernighan_lin_partition(
+            ag, (partition_A, partition_B), max_passes=refine_passes, pass_cutoff=pass_cutoff, verbose=False)
+        _append_rounds(history, refine_history, refine_start)
+    if cut_size > start_cut:
+        partition_A, partition_B, cut_size = set(start_A), set(start_B), start_cut
+        history.append({'pass': history[-1]['pass'], 'cut_size': cut_size,
+                        'details': 'Kept best quick start', 'elapsed': time.perf_counter() - start_time})
+
+    final_graph = partitioned_copy(G, partition_A, partition_B)
+    execution_time = time.perf_counter() - start_time
+
+    if verbose:
+        print(f"\n--- 共识粗化KL完成，最终割边数: {cut_size} ---")
+        print(f"总运行时间: {execution_time:.6f} 秒")
+
+    return partition_A, partition_B, cut_size, history, execution_time, initial_graph, final_graph
@@ -0,0 +1,137 @@
+# EDA_Circuit_Partitioning_KL/src/core/cut_evaluation.py
+
+"""
+cut_evaluation.py - 批量划分评估
+该模块一次性为同一张图的大量候选两路划分打分，供多起点、进化类方法及测试脚本使用：
+候选划分以 (k × n) 的布尔矩阵给出（True 表示A区），对每个候选计算割边数、A区大小与不平衡度、
+每个节点的外部代价 E / 内部代价 I，以及边界节点（E > 0）的数量。
+计算基于稀疏矩阵乘积：令 X 为候选矩阵、W 为邻接权重矩阵、deg 为加权度，
+则 Y = X·W 给出每个节点连向A区的权重，于是
+    A区节点: I = Y, E = deg - Y；  B区节点: E = Y, I = deg - Y；  cut = Σ_{i∈A} E_i。
+候选按块处理，每块的中间矩阵不超过 max_block_elements 个元素，内存占用与 k 无关。
+"""
+
+import numpy as np
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .array_graph import ArrayGraph, GraphLike, graph_to_arrays, sparse_adjacency
+
+DEFAULT_MAX_BLOCK_ELEMENTS = 1 << 23  # 每块 (候选数 × 节点数) 的元素上限，float64 约 64MB
+
+
+class PartitionScores(NamedTuple):
+    """
+    一批候选划分的评估结果，第一维与输入的候选顺序一致。
+
+    属性:
+        cut_sizes (np.ndarray): (k,) 割边数（整数权重时为整数）。
+        size_A (np.ndarray): (k,) A区节点数。
+        imbalance (np.ndarray): (k,) 两区节点数之差的绝对值 ||A| - |B||。
+        boundary_counts (np.ndarray): (k,) 至少有一条割边的节点数。
+        external (Optional[np.ndarray]): (k, n) 每个节点的外部代价 E；per_node=False 时为 None。
+        internal (Optional[np.ndarray]): (k, n) 每个节点的内部代价 I；per_node=False 时为 None。
+    """
+    cut_sizes: np.ndarray
+    size_A: np.ndarray
+    imbalance: np.ndarray
+    boundary_counts: np.ndarray
+    external: Optional[np.ndarray] = None
+    internal: Optional[np.ndarray] = None
+
+
+def sides_from_partitions(G: GraphLike, partitions: Iterable[Tuple[Set[str], Set[str]]]) -> np.ndarray:
+    """
+    将 (分区A, 分区B) 形式的候选划分转换为评估所需的 (k × n) 布尔矩阵，列顺序与 graph_to_arrays(G).nodes 一致。
+    """
+    ag = graph_to_arrays(G)
+    rows = []
+    for partition_A, _ in partitions:
+        row = np.zeros(len(ag.nodes), dtype=bool)
+        row[[ag.index[u] for u in partition_A]] = True
+        rows.append(row)
+    return np.vstack(rows) if rows else np.zeros((0, len(ag.nodes)), dtype=bool)
+
+
+def _block_size(num_nodes: int, max_block_elements: int) -> int:
+    return max(1, max_block_elements // max(1, num_nodes))
+
+
+def iter_partition_scores(
+    G: GraphLike,
+    sides: np.ndarray,
+    per_node: bool = False,
+    max_block_elements: int = DEFAULT_MAX_BLOCK_ELEMENTS
+) -> Iterator[Tuple[int, PartitionScores]]:
+    """
+    按块评估候选划分，逐块产出 (该块第一个候选的下标, 该块的 PartitionScores)。
+    适合候选数量很大、每个节点的 E/I 无法整体放入内存的情况。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        sides (np.ndarray): (k × n) 布尔矩阵，列顺序与 graph_to_arrays(G).nodes 一致，True 表示A区。
+        per_node (bool): 是否同时给出每个节点的 E/I 矩阵。
+        max_block_elements (int): 每块中间矩阵 (候选数 × 节点数) 的元素上限。
+    """
+    ag = graph_to_arrays(G)
+    n = len(ag.nodes)
+    sides = np.asarray(sides, dtype=bool)
+    if sides.ndim != 2 or sides.shape[1] != n:
+        raise ValueError(f"候选划分矩阵的形状应为 (k, {n})，实际为 {sides.shape}。")
+
+    W = sparse_adjacency(ag)
+    degrees = np.asarray(W.sum(axis=1)).ravel()
+    accumulate = np.int64 if W.dtype.kind in 'iu' else np.float64
+    # 整数权重且总权重不会溢出时用 int32 计算，稀疏乘积与逐元素运算的访存量减半
+    if W.dtype.kind in 'iu' and degrees.sum() < np.iinfo(np.int32).max:
+        W, degrees = W.astype(np.int32), degrees.astype(np.int32)
+    chunk = _block_size(n, max_block_elements)
+
+    for lo in range(0, sides.shape[0], chunk):
+        # 块内使用 (节点 × 候选) 的连续布局：Y = W·Xᵀ 为稀疏矩阵左乘稠密矩阵，代价 O(nnz · 块大小)
+        X = np.ascontiguousarray(sides[lo:lo + chunk].T).astype(W.dtype)
+        Y = W @ X
+        # A区节点的 E = deg - Y，B区节点的 E = Y；节点在边界上当且仅当 Y ≠ (A区 ? deg : 0)
+        on_A_degrees = X * degrees[:, None]
+        size_A = X.sum(axis=0, dtype=np.int64)
+        scores = PartitionScores(
+            cut_sizes=on_A_degrees.sum(axis=0, dtype=accumulate) - np.einsum('ij,ij->j', X, Y, dtype=accumulate),
+            size_A=size_A,
+            imbalance=np.abs(2 * size_A - n),
+            boundary_counts=np.count_nonzero(Y != on_A_degrees, axis=0),
+        )
+        if per_node:
+            external = np.where(X.T != 0, (degrees[:, None] - Y).T, Y.T)
+            scores = scores._replace(external=external, internal=degrees - external)
+        yield lo, scores
+
+
+def evaluate_partitions(
+    G: GraphLike,
+    sides: np.ndarray,
+    per_node: bool = True,
+    max_block_elements: int = DEFAULT_MAX_BLOCK_ELEMENTS
+) -> PartitionScores:
+    """
+    一次性评估全部候选划分。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        sides (np.ndarray): (k × n) 布尔矩阵，列顺序与 graph_to_arrays(G).nodes 一致，True 表示A区。
+        per_node (bool): 是否返回每个节点的 E/I（各为 k × n 矩阵）；只需要汇总指标时应设为 False。
+        max_block_elements (int): 每块中间矩阵的元素上限。
+
+    Returns:
+        PartitionScores: 各字段按候选顺序拼接的评估结果。
+    """
+    blocks = [scores for _, scores in iter_partition_scores(G, sides, per_node, max_block_elements)]
+    if not blocks:
+        n = graph_to_arrays(G).number_of_nodes()
+        empty = np.zeros(0, dtype=np.int64)
+        per_node_empty = np.zeros((0, n)) if per_node else None
+        return PartitionScores(empty, empty, empty, empty, per_node_empty, per_node_empty)
+
+    def _concat(field: str) -> Optional[np.ndarray]:
+        parts: Sequence[Optional[np.ndarray]] = [getattr(scores, field) for scores in blocks]
+        return None if parts[0] is None else np.concatenate(parts)
+
+    return PartitionScores(*(_concat(field) for field in PartitionScores._fields))
@@ -0,0 +1,260 @@
+# EDA_Circuit_Partitioning_KL/src/core/graph_reduction.py
+
+"""
+graph_reduction.py - 划分前的精确图约简
+真实网表中有大量度为1的单元、较长的度为2链以及平行边，KL 需要逐个节点处理它们。
+该模块在划分前反复执行以下约简，把节点收缩为带节点权重（包含的原始节点数）的超节点：
+1. 叶节点：度为1的节点并入其唯一邻居（放在邻居一侧永远不会增加割边）。
+2. 度为2的节点：并入连接边较重的邻居，另一条边改连到该邻居上；沿链反复执行后，
+   整条度为2链收缩为一条权重等于链上最小边权的边。
+3. 平行边：收缩产生的平行边合并为一条边，权重相加；自环被丢弃。
+约简是精确的：约简图上任意划分的割边数与展开到原始节点后的割边数相同。
+超节点的权重受 max_node_weight 限制；在约简图上划分后展开回原始节点，
+再以单节点移动（每次移动增益最大的节点）恢复两区节点数的平衡。
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .array_graph import ArrayGraph, GraphLike, adjacency_dict, arrays_from_adjacency, partitioned_copy
+from .kl_classic import _calculate_cut_size, _calculate_D_values, kernighan_lin_partition
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+DEFAULT_MAX_NODE_WEIGHT_FRACTION = 0.05  # 默认超节点权重上限占节点总数的比例
+
+
+class ReducedGraph(NamedTuple):
+    """
+    约简结果。
+
+    属性:
+        graph (ArrayGraph): 约简图，超节点以其代表节点（某个原始节点）命名。
+        members (Dict[str, List[str]]): 超节点 -> 其包含的原始节点。
+        node_weights (Dict[str, int]): 超节点 -> 包含的原始节点数。
+        num_original_nodes (int): 原始图的节点数。
+    """
+    graph: ArrayGraph
+    members: Dict[str, List[str]]
+    node_weights: Dict[str, int]
+    num_original_nodes: int
+
+    def reduction_ratio(self) -> float:
+        """约简减少的节点比例。"""
+        if not self.num_original_nodes:
+            return 0.0
+        return 1 - self.graph.number_of_nodes() / self.num_original_nodes
+
+
+def reduce_graph(G: GraphLike, max_node_weight: Optional[int] = None) -> ReducedGraph:
+    """
+    对图执行精确约简（叶节点收缩、度为2节点收缩、平行边合并）。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图，边权重需非负。
+        max_node_weight (Optional[int]): 超节点最多包含的原始节点数；
+            默认为节点总数的 DEFAULT_MAX_NODE_WEIGHT_FRACTION（至少为2），过大的超节点会使展开后的平衡恢复代价变高。
+
+    Returns:
+        ReducedGraph: 约简图及超节点与原始节点的对应关系。
+    """
+    adjacency = {u: {v: w for v, w in neighbors.items() if v != u} for u, neighbors in adjacency_dict(G).items()}
+    num_nodes = len(adjacency)
+    if max_node_weight is None:
+        max_node_weight = max(2, math.ceil(DEFAULT_MAX_NODE_WEIGHT_FRACTION * num_nodes))
+    if max_node_weight < 1:
+        raise ValueError(f"max_node_weight 必须为正整数，实际为 {max_node_weight}。")
+
+    members = {u: [u] for u in adjacency}
+    node_weights = {u: 1 for u in adjacency}
+    queue = deque(u for u, neighbors in adjacency.items() if 1 <= len(neighbors) <= 2)
+
+    def contract(x: str, target: str):
+        """把 x 并入 target：x 的其余边改连到 target，平行边权重相加。"""
+        neighbors_x = adjacency.pop(x)
+        del neighbors_x[target]
+        del adjacency[target][x]
+        neighbors_t = adjacency[target]
+        for y, weight in neighbors_x.items():
+            neighbors_y = adjacency[y]
+            del neighbors_y[x]
+            neighbors_t[y] = neighbors_t.get(y, 0) + weight
+            neighbors_y[target] = neighbors_y.get(target, 0) + weight
+            queue.append(y)
+        members[target].extend(members.pop(x))
+        node_weights[target] += node_weights.pop(x)
+        queue.append(target)
+
+    while queue:
+        x = queue.popleft()
+        if x not in adjacency or not 1 <= len(adjacency[x]) <= 2:
+            continue
+        # 候选目标：边权较重的邻居（放在一起不会增加割边）；边权相同时优先较轻的超节点
+        heaviest = max(adjacency[x].values())
+        candidates = sorted((node_weights[t], t) for t, w in adjacency[x].items() if w == heaviest)
+        for target_weight, target in candidates:
+            if node_weights[x] + target_weight <= max_node_weight:
+                contract(x, target)
+                break
+
+    graph = arrays_from_adjacency(adjacency)
+    return ReducedGraph(graph, {u: members[u] for u in graph.nodes},
+                        {u: node_weights[u] for u in graph.nodes}, num_nodes)
+
+
+def contract_groups(G: GraphLike, groups: Iterable[Iterable[str]]) -> ReducedGraph:
+    """
+    把每组节点收缩为一个超节点（以组内第一个节点命名）：组间的边合并、权重相加，组内的边丢弃。
+    只要划分不拆开任何一组，收缩图上的割边数与展开后相同。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        groups (Iterable[Iterable[str]]): 节点分组，必须恰好覆盖图中的每个节点一次。
+    """
+    adjacency = adjacency_dict(G)
+    members: Dict[str, List[str]] = {}
+    owner: Dict[str, str] = {}
+    for group in groups:
+        group = list(group)
+        if not group:
+            continue
+        members[group[0]] = group
+        for v in group:
+            if v in owner or v not in adjacency:
+                raise ValueError(f"节点 '{v}' 不在图中或被分到了多个组。")
+            owner[v] = group[0]
+    if len(owner) != len(adjacency):
+        raise ValueError(f"分组只覆盖了 {len(owner)} / {len(adjacency)} 个节点。")
+
+    contracted: Dict[str, Dict[str, float]] = {u: {} for u in members}
+    for u, neighbors in adjacency.items():
+        neighbors_u = contracted[owner[u]]
+        for v, weight in neighbors.items():
+            if owner[v] != owner[u]:
+                neighbors_u[owner[v]] = neighbors_u.get(owner[v], 0) + weight
+
+    graph = arrays_from_adjacency(contracted)
+    return ReducedGraph(graph, members, {u: len(group) for u, group in members.items()}, len(adjacency))
+
+
+def project_partition(reduced: ReducedGraph, partition: Tuple[Set[str], Set[str]]) -> Tuple[Set[str], Set[str]]:
+    """将原始图上的划分投影到约简图：超节点归入其多数成员所在的分区（相同时归入A区）。"""
+    partition_A = partition[0]
+    reduced_A = {u for u, group in reduced.members.items()
+                 if 2 * sum(1 for v in group if v in partition_A) >= len(group)}
+    return reduced_A, set(reduced.members) - reduced_A
+
+
+def expand_partition(reduced: ReducedGraph, reduced_A: Set[str], reduced_B: Set[str]) -> Tuple[Set[str], Set[str]]:
+    """将约简图上的划分展开为原始节点的划分。"""
+    partition_A = {v for u in reduced_A for v in reduced.members[u]}
+    partition_B = {v for u in reduced_B for v in reduced.members[u]}
+    return partition_A, partition_B
+
+
+def rebalance_partition(
+    G: GraphLike,
+    partition_A: Set[str],
+    partition_B: Set[str],
+    max_imbalance: int = 1
+) -> Tuple[Set[str], Set[str], int, int]:
+    """
+    从较大的分区逐个移出D值 (E - I，即移动的增益) 最大的节点，直到两区节点数之差不超过 max_imbalance。
+
+    Returns:
+        Tuple[Set[str], Set[str], int, int]: (分区A, 分区B, 移动的节点数, 平衡后的割边数)
+    """
+    adjacency = adjacency_dict(G)
+    partition_A, partition_B = set(partition_A), set(partition_B)
+    D = _calculate_D_values(adjacency, partition_A, partition_B)
+    cut_size = _calculate_cut_size(adjacency, partition_A, partition_B)
+    moved = 0
+    while abs(len(partition_A) - len(partition_B)) > max_imbalance:
+        source, destination = (partition_A, partition_B) if len(partition_A) > len(partition_B) else (partition_B, partition_A)
+        u = max(source, key=lambda v: (D[v], v))
+        source.remove(u)
+        destination.add(u)
+        cut_size -= D[u]
+        D[u] = -D[u]
+        for v, weight in adjacency[u].items():
+            if v != u:
+                # v 与 u 变为同侧则 D[v] 减少 2w，变为异侧则增加 2w
+                D[v] += -2 * weight if v in destination else 2 * weight
+        moved += 1
+    return partition_A, partition_B, moved, cut_size
+
+
+def partition_with_reduction(
+    G: GraphLike,
+    initial_partition: Tuple[Set[str], Set[str]],
+    partitioner: Callable = kernighan_lin_partition,
+    max_node_weight: Optional[int] = None,
+    verbose: bool = True,
+    **partitioner_kwargs
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    先约简图，再在约简图上运行 partitioner，最后展开回原始节点并恢复平衡。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Tuple[Set[str], Set[str]]): 原始图上的初始划分，按多数成员投影到约简图。
+        partitioner (Callable): 接受 (G, initial_partition, verbose=..., **kwargs) 并返回七元组的划分函数。
+        max_node_weight (Optional[int]): 超节点权重上限，见 reduce_graph。
+        verbose (bool): 是否打印详细的执行过程信息。
+        **partitioner_kwargs: 传给 partitioner 的其他参数（如 max_passes）。
+
+    Returns:
+        (与kl_classic.py的返回接口完全一致；割边数与 history 均以原始图计。
+         history 第一项为原始初始划分，其后为约简图上的各轮，若展开后需要恢复平衡则追加一项。)
+    """
+    start_time = time.perf_counter()
+
+    adjacency = adjacency_dict(G)
+    initial_graph = partitioned_copy(G, initial_partition[0], initial_partition[1])
+    initial_cut_size = _calculate_cut_size(adjacency, initial_partition[0], initial_partition[1])
+    history = [{'pass': 0, 'cut_size': initial_cut_size, 'details': 'Initial state', 'elapsed': time.perf_counter() - start_time}]
+
+    reduced = reduce_graph(adjacency, max_node_weight)
+    if verbose:
+        print(f"--- 图约简: {reduced.num_original_nodes} -> {reduced.graph.number_of_nodes()} 个节点 "
+              f"(减少 {reduced.reduction_ratio():.1%}) ---")
+
+    reduced_start = time.perf_counter() - start_time
+    reduced_A, reduced_B, _, reduced_history, _, _, _ = partitioner(
+        reduced.graph, project_partition(reduced, initial_partition), verbose=verbose, **partitioner_kwargs)
+    # 约简是精确的，约简图上的割边数即原始图上的割边数；耗时换算为自本函数开始起
+    history.extend(dict(entry, elapsed=entry['elapsed'] + reduced_start) for entry in reduced_history[1:])
+
+    partition_A, partition_B = expand_partition(reduced, reduced_A, reduced_B)
+    partition_A, partition_B, moved, cut_size = rebalance_partition(adjacency, partition_A, partition_B)
+    if moved:
+        last = history[-1]
+        round_key = 'iteration' if 'iteration' in last else 'pass'
+        history.append({round_key: last[round_key], 'cut_size': cut_size,
+                        'details': f'Expanded and rebalanced ({moved} moves)', 'elapsed': time.perf_counter() - start_time})
+
+    final_graph = partitioned_copy(G, partition_A, partition_B)
+    execution_time = time.perf_counter() - start_time
+
+    if verbose:
+        print(f"\n--- 展开回原始图: 恢复平衡移动 {moved} 个节点，最终割边数: {cut_size} ---")
+        print(f"总运行时间: {execution_time:.6f} 秒")
+
+    return partition_A, partition_B, cut_size, history, execution_time, initial_graph, final_graph
+
+
+def kernighan_lin_reduced(
+    G: GraphLike,
+    initial_partition: Tuple[Set[str], Set[str]],
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = True
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """在约简图上运行经典KL（参数与 kl_classic.kernighan_lin_partition 相同）。"""
+    return partition_with_reduction(G, initial_partition, kernighan_lin_partition, verbose=verbose,
+                                    max_passes=max_passes, pass_cutoff=pass_cutoff)
@@ -0,0 +1,287 @@
+# EDA_Circuit_Partitioning_KL/src/core/kl_batched.py
+
+"""
+kl_batched.py - 批量多起点KL算法 (NumPy向量化)
+该模块将多次独立随机起点的经典KL运行合并为一次数组计算：
+1. 用 (运行数 × 节点数) 的布尔矩阵保存每次运行的分区，True 表示A区。
+2. 用同形状的矩阵保存D值，每一步对所有运行同时选出最佳交换对并更新D值。
+3. 批量生成随机初始划分并批量计算初始割边数。
+每轮(pass)的交换、锁定、最大累积增益前缀的选取与 kl_classic.py 完全一致，
+仅在增益相同的候选对之间按节点编号顺序（而非集合迭代顺序）选择。
+固定节点在每轮开始时即被锁定，随机初始划分也只打乱非固定节点。
+规模限制：邻接矩阵 W 以稠密 n×n 数组保存（O(n²) 内存），每一步交换都要构造 运行数×n×n 的增益张量
+（按 max_block_elements 分块，但访存量仍为 O(运行数·n²)，一轮为 O(运行数·n³)）。
+因此只适用于数千节点以内的图，用于在小图上提高多起点运行的吞吐量；更大的图请使用 kl_classic.py 或 kl_fast.py。
+"""
+
+import time
+import numpy as np
+from typing import Set, Tuple, List, Dict, Optional
+
+from .array_graph import graph_to_arrays, dense_adjacency
+from .kl_classic import _resolve_fixed, _resolve_pass_cutoff
+
+
+def _random_initial_sides(
+    num_nodes: int,
+    num_runs: int,
+    seed: Optional[int] = None,
+    fixed_A: Optional[np.ndarray] = None,
+    fixed_B: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    批量生成随机平衡初始划分：每行前 num_nodes//2 个随机节点放入A区。
+    给出固定节点的布尔掩码 fixed_A / fixed_B 时，固定节点放在指定的一侧，只用随机的非固定节点把A区补足到 num_nodes//2 个。
+    """
+    rng = np.random.default_rng(seed)
+    keys = rng.random((num_runs, num_nodes))
+    num_A = num_nodes // 2
+    if fixed_A is not None:
+        keys[:, fixed_A | fixed_B] = 2.0  # 排在所有非固定节点之后
+        num_A = min(max(0, num_A - int(fixed_A.sum())), num_nodes - int((fixed_A | fixed_B).sum()))
+    order = np.argsort(keys, axis=1)
+    sides = np.zeros((num_runs, num_nodes), dtype=bool)
+    rows = np.arange(num_runs)[:, None]
+    sides[rows, order[:, :num_A]] = True
+    if fixed_A is not None:
+        sides[:, fixed_A] = True
+    return sides
+
+
+def _batched_cut_sizes(W: np.ndarray, sides: np.ndarray) -> np.ndarray:
+    """
+    批量计算割边数。
+    令 s = ±1 表示分区，则 sᵀWs = ΣW - 4·cut，因此 cut = (ΣW - sᵀWs) / 4。
+    """
+    s = np.where(sides, 1, -1).astype(W.dtype)
+    quad = np.einsum('ri,ri->r', s, s @ W)
+    diff = W.sum() - quad
+    return diff // 4 if W.dtype.kind in 'iu' else diff / 4
+
+
+def _batched_D_values(W: np.ndarray, sides: np.ndarray) -> np.ndarray:
+    """批量计算D值：D_i = E_i - I_i = -s_i·(Ws)_i。"""
+    s = np.where(sides, 1, -1).astype(W.dtype)
+    return -s * (s @ W)
+
+
+def _masked_fill_value(dtype: np.dtype):
+    """被屏蔽（已锁定或同侧）候选对使用的增益值。"""
+    return np.iinfo(np.int64).min // 4 if np.dtype(dtype).kind in 'iu' else -np.inf
+
+
+def _gain_tolerance(W: np.ndarray):
+    """判定累积增益为正的阈值：整数权重为0；浮点权重留出舍入误差余量，避免整轮对换后的镜像分区被误判为改进。"""
+    return 0 if W.dtype.kind in 'iu' else 1e-9 * float(np.abs(W).sum())
+
+
+def _batched_best_pairs(
+    W: np.ndarray,
+    D: np.ndarray,
+    free_A: np.ndarray,
+    free_B: np.ndarray,
+    max_block_elements: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    为每次运行选出增益 D[a] + D[b] - 2·c_ab 最大的未锁定交换对。
+    按运行分块计算增益张量，使内存占用不超过 max_block_elements 个元素。
+    """
+    runs, n = D.shape
+    fill = _masked_fill_value(W.dtype)
+    chunk = max(1, max_block_elements // max(1, n * n))
+    best_a = np.empty(runs, dtype=np.int64)
+    best_b = np.empty(runs, dtype=np.int64)
+    best_gain = np.empty(runs, dtype=W.dtype)
+
+    for lo in range(0, runs, chunk):
+        hi = min(lo + chunk, runs)
+        gain = D[lo:hi, :, None] + D[lo:hi, None, :] - 2 * W[None, :, :]
+        mask = free_A[lo:hi, :, None] & free_B[lo:hi, None, :]
+        gain = np.where(mask, gain, fill).reshape(hi - lo, -1)
+        flat = gain.argmax(axis=1)
+        best_a[lo:hi], best_b[lo:hi] = np.divmod(flat, n)
+        best_gain[lo:hi] = gain[np.arange(hi - lo), flat]
+    return best_a, best_b, best_gain
+
+
+def _batched_pass(
+    W: np.ndarray,
+    sides: np.ndarray,
+    max_block_elements: int,
+    cutoff: Optional[int] = None,
+    fixed: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    对一组运行同时执行一轮KL。
+    cutoff 不为 None 时，某次运行连续 cutoff 次交换未刷新最大累积增益即停止该运行的本轮交换。
+    fixed 为固定节点的布尔掩码，这些节点在本轮开始时即被锁定。
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            - new_sides: 应用最佳交换前缀后的分区矩阵。
+            - max_gain: 每次运行的最大累积增益。
+            - best_k: 每次运行达到最大累积增益的交换序号（从0开始）。
+            - skipped: 每次运行因提前结束而跳过的交换次数。
+    """
+    runs, n = sides.shape
+    rows = np.arange(runs)
+    fill = _masked_fill_value(W.dtype)
+
+    D = _batched_D_values(W, sides)
+    unlocked = np.ones((runs, n), dtype=bool) if fixed is None else np.tile(~fixed, (runs, 1))
+    candidate_steps = np.minimum((sides & unlocked).sum(axis=1), (~sides & unlocked).sum(axis=1))
+    steps = candidate_steps.copy()
+    num_steps = int(steps.max()) if runs else 0
+    running_gain = np.zeros(runs, dtype=W.dtype)
+    running_best = np.zeros(runs, dtype=W.dtype)
+    since_best = np.zeros(runs, dtype=np.int64)
+
+    gains = np.zeros((runs, num_steps), dtype=W.dtype)
+    pairs_a = np.zeros((runs, num_steps), dtype=np.int64)
+    pairs_b = np.zeros((runs, num_steps), dtype=np.int64)
+
+    for k in range(num_steps):
+        live = np.flatnonzero(steps > k)
+        if live.size == 0:
+            break
+        free = unlocked[live]
+        a, b, g = _batched_best_pairs(
+            W, D[live], sides[live] & free, ~sides[live] & free, max_block_elements
+        )
+        gains[live, k], pairs_a[live, k], pairs_b[live, k] = g, a, b
+        unlocked[live, a] = False
+        unlocked[live, b] = False
+
+        # A区节点: D[u] += 2c_ua - 2c_ub；B区节点: D[v] += 2c_vb - 2c_va
+        delta = 2 * (W[a] - W[b])
+        delta = np.where(sides[live], delta, -delta)
+        D[live] += np.where(unlocked[live], delta, 0)
+
+        if cutoff is not None:
+            running_gain[live] += g
+            improved = running_gain[live] > running_best[live]
+            running_best[live] = np.where(improved, running_gain[live], running_best[live])
+            since_best[live] = np.where(improved, 0, since_best[live] + 1)
+            stopped = live[since_best[live] >= cutoff]
+            steps[stopped] = np.minimum(steps[stopped], k + 1)
+
+    valid = np.arange(num_steps)[None, :] < steps[:, None]
+    cumulative = np.where(valid, np.cumsum(np.where(valid, gains, 0), axis=1), fill)
+    if num_steps:
+        best_k = cumulative.argmax(axis=1)
+        max_gain = cumulative[rows, best_k]
+    else:
+        best_k = np.full(runs, -1)
+        max_gain = np.zeros(runs, dtype=W.dtype)
+
+    new_sides = sides.copy()
+    max_gain = np.where(max_gain > _gain_tolerance(W), max_gain, 0)
+    apply = valid & (np.arange(num_steps)[None, :] <= best_k[:, None]) & (max_gain > 0)[:, None]
+    rr, kk = np.nonzero(apply)
+    new_sides[rr, pairs_a[rr, kk]] = False
+    new_sides[rr, pairs_b[rr, kk]] = True
+    return new_sides, max_gain, best_k, candidate_steps - steps
+
+
+def kernighan_lin_batched(
+    G,
+    num_runs: int = 20,
+    initial_sides: Optional[np.ndarray] = None,
+    max_passes: int = 10,
+    seed: Optional[int] = None,
+    pass_cutoff: Optional[float] = None,
+    max_block_elements: int = 1 << 24,
+    verbose: bool = True,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Tuple[List[Set[str]], List[Set[str]], List[int], List[List[Dict]], float]:
+    """
+    同时对多个随机初始划分运行经典KL算法。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        num_runs (int): 随机起点数量（提供 initial_sides 时忽略）。
+        initial_sides (Optional[np.ndarray]): 形状为 (运行数, 节点数) 的布尔矩阵，
+            列顺序与 G.nodes() 一致，True 表示A区。为None时批量随机生成。
+        max_passes (int): 最大迭代轮数上限。
+        seed (Optional[int]): 批量随机初始划分的随机种子。
+        pass_cutoff (Optional[float]): 轮内提前结束阈值，含义与 kl_classic.kernighan_lin_partition 相同。
+        max_block_elements (int): 单次增益张量的元素上限，用于控制内存。
+        verbose (bool): 是否打印详细的执行过程信息。
+        fixed (Optional[Tuple[Set[str], Set[str]]]): 固定在A区、B区的节点，含义与 kl_classic.kernighan_lin_partition 相同；
+            随机初始划分自动满足该约束，给出的 initial_sides 不满足时抛出 ValueError。
+
+    Returns:
+        Tuple[...]: 与 kl_classic.py 返回接口的前五项一一对应，但每项均为按运行排列的列表:
+            - best_partitions_A, best_partitions_B: 每次运行优化后的分区。
+            - best_cut_sizes: 每次运行的最小割边数。
+            - histories: 每次运行的每轮迭代信息（首项为初始状态）。
+            - execution_time: 全部运行的总时间（秒）。
+    """
+    start_time = time.perf_counter()
+
+    ag = graph_to_arrays(G)
+    W = dense_adjacency(ag)
+    n = len(ag.nodes)
+
+    fixed_A = fixed_B = fixed_mask = None
+    if fixed:
+        all_nodes = set(ag.nodes)  # 此处只检查两侧的固定节点互不重叠且都在图中
+        _resolve_fixed(fixed, all_nodes - set(fixed[1]), all_nodes - set(fixed[0]))
+        fixed_A = np.fromiter((u in fixed[0] for u in ag.nodes), dtype=bool, count=n)
+        fixed_B = np.fromiter((u in fixed[1] for u in ag.nodes), dtype=bool, count=n)
+        fixed_mask = fixed_A | fixed_B
+
+    if initial_sides is None:
+        sides = _random_initial_sides(n, num_runs, seed, fixed_A, fixed_B)
+    else:
+        sides = np.array(initial_sides, dtype=bool)
+        if sides.ndim != 2 or sides.shape[1] != n:
+            raise ValueError(f"initial_sides 的形状应为 (运行数, {n})，实际为 {sides.shape}。")
+        if fixed_mask is not None and not (sides[:, fixed_A].all() and not sides[:, fixed_B].any()):
+            raise ValueError("initial_sides 中有固定节点不在指定的一侧。")
+    num_runs = sides.shape[0]
+
+    cut_sizes = _batched_cut_sizes(W, sides)
+    best_sides, best_cuts = sides.copy(), cut_sizes.copy()
+    histories = [[{'pass': 0, 'cut_size': cut, 'details': 'Initial state'}] for cut in cut_sizes.tolist()]
+
+    if verbose:
+        print(f"--- 批量KL算法开始 ({num_runs} 个起点) ---")
+        print(f"初始割边数: 最小 {cut_sizes.min()}, 平均 {cut_sizes.mean():.2f}")
+
+    cutoff = _resolve_pass_cutoff(pass_cutoff, n)
+    active = np.ones(num_runs, dtype=bool)
+    for pass_num in range(1, max_passes + 1):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        if verbose: print(f"\n--- Pass {pass_num} ({idx.size} 个运行未收敛) ---")
+
+        new_sides, max_gain, best_k, skipped = _batched_pass(W, sides[idx], max_block_elements, cutoff, fixed_mask)
+        improved = max_gain > 0
+        active[idx[~improved]] = False
+
+        idx, new_sides, best_k, skipped = idx[improved], new_sides[improved], best_k[improved], skipped[improved]
+        sides[idx] = new_sides
+        cut_sizes[idx] = _batched_cut_sizes(W, new_sides)
+        for r, k, skip in zip(idx.tolist(), best_k.tolist(), skipped.tolist()):
+            histories[r].append({'pass': pass_num, 'cut_size': cut_sizes[r].item(), 'details': f'Applied {k+1} swaps.', 'skipped_swaps': skip})
+
+        better = idx[cut_sizes[idx] < best_cuts[idx]]
+        best_cuts[better] = cut_sizes[better]
+        best_sides[better] = sides[better]
+        if verbose: print(f"Pass {pass_num} 结束。{idx.size} 个运行有改进，当前最小割边数: {best_cuts.min()}")
+
+    nodes = np.array(ag.nodes, dtype=object)
+    best_partitions_A = [set(nodes[row]) for row in best_sides]
+    best_partitions_B = [set(nodes[~row]) for row in best_sides]
+
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+
+    if verbose:
+        print("\n--- 批量KL算法结束 ---")
+        print(f"最终最小割边数: 最小 {best_cuts.min()}, 平均 {best_cuts.mean():.2f}")
+        print(f"总运行时间: {execution_time:.6f} 秒")
+
+    return best_partitions_A, best_partitions_B, best_cuts.tolist(), histories, execution_time
@@ -8,24 +8,35 @@ kl_classic.py - 经典Kernighan-Lin (KL) 算法实现
 1. 运行时间统计
 2. 最大迭代轮次上限设置
 3. (新) 输出带有分区信息的初始和最终图对象，用于可视化。
+4. 生成器形式 kernighan_lin_passes：逐轮产出状态快照，支持检查点保存与断点续跑。
+5. 固定节点 (fixed)：预先指定所在一侧的节点（如I/O焊盘、宏单元）不参与交换，也不进入每步的交换对扫描；
+   它们对其余节点D值的贡献在轮内保持不变，已包含在每轮开始时计算的D值中。
 """
 
-import networkx as nx
+from __future__ import annotations
+
 import time
-from typing import Set, Tuple, List, Dict
+from typing import TYPE_CHECKING, FrozenSet, Iterator, Set, Tuple, List, Dict, Optional
+
+from .array_graph import GraphLike, adjacency_dict, partitioned_copy
+from .checkpoint import PartitionState, check_resume_state, last_state
 
-def _calculate_cut_size(G: nx.Graph, partition_A: Set[str], partition_B: Set[str]) -> int:
-    """计算两个分区之间的割边数量（考虑权重）。"""
+if TYPE_CHECKING:
+    import networkx as nx
+
+def _calculate_cut_size(G: GraphLike, partition_A: Set[str], partition_B: Set[str]) -> int:
+    """计算两个分区之间的割边数量（考虑权重）。G 可以是 nx.Graph、ArrayGraph 或邻接字典。"""
     cut_size = 0
-    for u, v, data in G.edges(data=True):
-        weight = data.get('weight', 1)
-        if (u in partition_A and v in partition_B) or \
-           (u in partition_B and v in partition_A):
-            cut_size += weight
+    for u, neighbors in adjacency_dict(G).items():
+        if u in partition_A:
+            for v, weight in neighbors.items():
+                if v in partition_B:
+                    cut_size += weight
     return cut_size
 
-def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str]) -> Dict[str, int]:
-    """为图中所有节点计算初始D值 (E(v) - I(v))。"""
+def _calculate_D_values(G: GraphLike, partition_A: Set[str], partition_B: Set[str]) -> Dict[str, int]:
+    """为图中所有节点计算初始D值 (E(v) - I(v))。G 可以是 nx.Graph、ArrayGraph 或邻接字典。"""
+    adjacency = adjacency_dict(G)
     D_values = {}
     nodes = list(partition_A) + list(partition_B)
     
@@ -34,8 +45,7 @@ def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str
         current_partition = partition_A if node in partition_A else partition_B
         other_partition = partition_B if node in partition_A else partition_A
 
-        for neighbor in G.neighbors(node):
-            weight = G.get_edge_data(node, neighbor).get('weight', 1)
+        for neighbor, weight in adjacency[node].items():
             if neighbor in other_partition:
                 E_v += weight
             elif neighbor in current_partition:
@@ -43,70 +53,116 @@ def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str
         D_values[node] = E_v - I_v
     return D_values
 
-def kernighan_lin_partition(
-    G: nx.Graph, 
-    initial_partition: Tuple[Set[str], Set[str]],
-    max_passes: int = 10,
-    verbose: bool = True
-) -> Tuple[Set[str], Set[str], int, List[Dict], float, nx.Graph, nx.Graph]:
+def _resolve_pass_cutoff(pass_cutoff: Optional[float], num_nodes: int) -> Optional[int]:
     """
-    使用经典Kernighan-Lin算法对图进行两路划分。
-    此实现严格遵循原始论文，包含轮次内D值更新。
+    将 pass_cutoff 参数解析为"连续多少次交换未刷新最大累积增益即结束本轮"的次数。
+    None 表示不截断；(0, 1) 之间的小数按节点总数的比例计算；其余按交换次数计算。
+    """
+    if pass_cutoff is None:
+        return None
+    if pass_cutoff <= 0:
+        raise ValueError(f"pass_cutoff 必须为正数，实际为 {pass_cutoff}。")
+    if pass_cutoff < 1:
+        return max(1, int(pass_cutoff * num_nodes))
+    return int(pass_cutoff)
 
-    Returns:
-        Tuple[...]:
-            - ... (原有返回项)
-            - initial_graph (nx.Graph): 带有初始分区信息的图对象。
-            - final_graph (nx.Graph): 带有最终分区信息的图对象。
+def _resolve_fixed(
+    fixed: Optional[Tuple[Set[str], Set[str]]],
+    partition_A: Set[str],
+    partition_B: Set[str]
+) -> FrozenSet[str]:
     """
-    start_time = time.perf_counter()
+    检查固定节点 (fixed_A, fixed_B) 是否分别位于 partition_A、partition_B 中，返回全部固定节点。
+    固定节点位于错误的一侧时抛出 ValueError；可先用 kl_improvements.place_fixed_vertices 调整初始划分。
+    """
+    if not fixed:
+        return frozenset()
+    fixed_A, fixed_B = set(fixed[0]), set(fixed[1])
+    if fixed_A & fixed_B:
+        raise ValueError(f"节点不能同时固定在两侧: {sorted(fixed_A & fixed_B)[:10]}")
+    misplaced = (fixed_A - partition_A) | (fixed_B - partition_B)
+    if misplaced:
+        raise ValueError(f"{len(misplaced)} 个固定节点不在划分中指定的一侧: {sorted(misplaced)[:10]}")
+    return frozenset(fixed_A | fixed_B)
 
-    partition_A, partition_B = initial_partition[0].copy(), initial_partition[1].copy()
-    
-    # --- 新功能：创建带有初始分区信息的图 ---
-    initial_graph = G.copy()
-    for node in partition_A:
-        initial_graph.nodes[node]['partition'] = 'A'
-    for node in partition_B:
-        initial_graph.nodes[node]['partition'] = 'B'
-    
-    best_partition_A = partition_A.copy()
-    best_partition_B = partition_B.copy()
-    best_cut_size = _calculate_cut_size(G, partition_A, partition_B)
-    
-    if verbose:
-        print(f"--- KL算法开始 (遵从原始论文) ---")
-        print(f"初始割边数: {best_cut_size}")
+def _initial_kl_state(
+    algorithm: str,
+    adjacency: Dict[str, Dict[str, float]],
+    partition_A: Set[str],
+    partition_B: Set[str],
+    details: str,
+    start_time: float
+) -> PartitionState:
+    """由初始划分构建第0轮的状态快照（供 KL 类生成器共用）。"""
+    cut_size = _calculate_cut_size(adjacency, partition_A, partition_B)
+    elapsed = time.perf_counter() - start_time
+    history = [{'pass': 0, 'cut_size': cut_size, 'details': details, 'elapsed': elapsed}]
+    return PartitionState(
+        algorithm, 0, partition_A.copy(), partition_B.copy(), _calculate_D_values(adjacency, partition_A, partition_B),
+        cut_size, partition_A.copy(), partition_B.copy(), cut_size, history, elapsed
+    )
 
-    history = [{'pass': 0, 'cut_size': best_cut_size, 'details': 'Initial state'}]
-    
-    # ... (算法核心循环部分保持不变)
-    for pass_num in range(1, max_passes + 1):
+def _kl_passes(
+    adjacency: Dict[str, Dict[str, float]],
+    state: PartitionState,
+    max_passes: int,
+    cutoff: Optional[int],
+    verbose: bool,
+    fixed: FrozenSet[str] = frozenset()
+) -> Iterator[PartitionState]:
+    """
+    从给定状态开始执行KL轮次：先产出该状态，之后每完成一轮产出一个新的快照，
+    直到收敛或完成第 max_passes 轮。计时在 state.elapsed 的基础上继续。
+    fixed 中的节点从一开始就处于锁定状态。
+    """
+    clock_start = time.perf_counter() - state.elapsed
+    yield state
+    if state.converged:
+        return
+
+    partition_A, partition_B = state.partition_A.copy(), state.partition_B.copy()
+    best_partition_A, best_partition_B = state.best_partition_A, state.best_partition_B
+    best_cut_size, current_cut_size = state.best_cut_size, state.cut_size
+    history = list(state.history)
+    next_D = state.D_values
+
+    for pass_num in range(state.pass_num + 1, max_passes + 1):
         if verbose: print(f"\n--- Pass {pass_num} ---")
-        D = _calculate_D_values(G, partition_A, partition_B)
+        D = dict(next_D)
         current_A, current_B = partition_A.copy(), partition_B.copy()
         unlocked_A, unlocked_B = current_A.copy(), current_B.copy()
+        if fixed:
+            unlocked_A -= fixed; unlocked_B -= fixed
         swap_history = []
-        for _ in range(min(len(current_A), len(current_B))):
+        num_candidate_swaps = min(len(unlocked_A), len(unlocked_B))
+        running_gain, running_best, swaps_since_best = 0, 0, 0
+        for _ in range(num_candidate_swaps):
+            if cutoff is not None and swaps_since_best >= cutoff:
+                break
             best_gain, best_pair = -float('inf'), (None, None)
             for a in unlocked_A:
                 for b in unlocked_B:
-                    c_ab = G.get_edge_data(a, b, default={'weight': 0})['weight']
+                    c_ab = adjacency[a].get(b, 0)
                     gain = D[a] + D[b] - 2 * c_ab
                     if gain > best_gain:
                         best_gain, best_pair = gain, (a, b)
             if best_pair == (None, None): break
             a_swap, b_swap = best_pair
             swap_history.append({'gain': best_gain, 'pair': (a_swap, b_swap)})
+            running_gain += best_gain
+            if running_gain > running_best:
+                running_best, swaps_since_best = running_gain, 0
+            else:
+                swaps_since_best += 1
             unlocked_A.remove(a_swap)
             unlocked_B.remove(b_swap)
             for u in unlocked_A:
-                c_ua = G.get_edge_data(u, a_swap, default={'weight': 0})['weight']
-                c_ub = G.get_edge_data(u, b_swap, default={'weight': 0})['weight']
+                c_ua = adjacency[u].get(a_swap, 0)
+                c_ub = adjacency[u].get(b_swap, 0)
                 D[u] += 2 * c_ua - 2 * c_ub
             for v in unlocked_B:
-                c_va = G.get_edge_data(v, a_swap, default={'weight': 0})['weight']
-                c_vb = G.get_edge_data(v, b_swap, default={'weight': 0})['weight']
+                c_va = adjacency[v].get(a_swap, 0)
+                c_vb = adjacency[v].get(b_swap, 0)
                 D[v] += 2 * c_vb - 2 * c_va
         max_cumulative_gain, best_k = 0, -1
         cumulative_gain = 0
@@ -114,35 +170,130 @@ def kernighan_lin_partition(
             cumulative_gain += item['gain']
             if cumulative_gain > max_cumulative_gain:
                 max_cumulative_gain, best_k = cumulative_gain, i
+        skipped_swaps = num_candidate_swaps - len(swap_history)
         if verbose: print(f"本轮找到 {len(swap_history)} 个交换对，最大累积增益 G = {max_cumulative_gain} (在第 {best_k + 1} 次交换时达到)。")
-        if max_cumulative_gain > 0:
+        if verbose and skipped_swaps: print(f"连续 {cutoff} 次交换未刷新最大累积增益，提前结束本轮，跳过 {skipped_swaps} 次交换。")
+        converged = max_cumulative_gain <= 0
+        if not converged:
             for i in range(best_k + 1):
                 a_swapped, b_swapped = swap_history[i]['pair']
                 partition_A.remove(a_swapped); partition_A.add(b_swapped)
                 partition_B.remove(b_swapped); partition_B.add(a_swapped)
-            current_cut_size = _calculate_cut_size(G, partition_A, partition_B)
-            history.append({'pass': pass_num, 'cut_size': current_cut_size, 'details': f'Applied {best_k+1} swaps.'})
+            current_cut_size = _calculate_cut_size(adjacency, partition_A, partition_B)
+            history.append({'pass': pass_num, 'cut_size': current_cut_size, 'details': f'Applied {best_k+1} swaps.', 'skipped_swaps': skipped_swaps, 'elapsed': time.perf_counter() - clock_start})
             if current_cut_size < best_cut_size:
                 best_cut_size = current_cut_size
                 best_partition_A, best_partition_B = partition_A.copy(), partition_B.copy()
             if verbose: print(f"Pass {pass_num} 结束。更新后割边数: {current_cut_size}")
-        else:
-            if verbose: print("最大累积增益 <= 0，算法收敛。")
+            # 下一轮的D值在本轮结束时计算，随快照一起保存，续跑时无需重算
+            next_D = _calculate_D_values(adjacency, partition_A, partition_B)
+        elif verbose:
+            print("最大累积增益 <= 0，算法收敛。")
+
+        yield PartitionState(
+            state.algorithm, pass_num, partition_A.copy(), partition_B.copy(), next_D, current_cut_size,
+            best_partition_A, best_partition_B, best_cut_size, list(history),
+            time.perf_counter() - clock_start, converged
+        )
+        if converged:
             break
 
+def kernighan_lin_passes(
+    G: GraphLike,
+    initial_partition: Optional[Tuple[Set[str], Set[str]]] = None,
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = False,
+    resume_from: Optional[PartitionState] = None,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Iterator[PartitionState]:
+    """
+    经典KL算法的生成器形式：先产出起始状态，之后每完成一轮产出一个 PartitionState 快照，
+    可用于观察、暂停（停止迭代即可）以及配合 checkpoint.save_checkpoint 保存检查点。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Optional[Tuple[Set[str], Set[str]]]): 初始分区 A 和 B；续跑时可省略。
+        max_passes (int): 最大轮数上限（按总轮数计，续跑时已完成的轮数也计算在内）。
+        pass_cutoff (Optional[float]): 轮内提前结束阈值，含义与 kernighan_lin_partition 相同。
+        verbose (bool): 是否打印详细的执行过程信息。
+        resume_from (Optional[PartitionState]): 从该检查点继续；给出时忽略 initial_partition。
+        fixed (Optional[Tuple[Set[str], Set[str]]]): 固定在A区、B区的节点，含义与 kernighan_lin_partition 相同；
+            检查点中不保存固定节点，续跑时需再次给出。
+
+    Yields:
+        PartitionState: 起始状态（或续跑的检查点）以及之后每一轮结束时的状态。
+    """
+    start_time = time.perf_counter()
+    adjacency = adjacency_dict(G)
+    if resume_from is not None:
+        check_resume_state(resume_from, 'kl_classic', adjacency)
+        state = resume_from
+    elif initial_partition is None:
+        raise ValueError("需要提供 initial_partition 或 resume_from。")
+    else:
+        state = _initial_kl_state('kl_classic', adjacency, initial_partition[0], initial_partition[1], 'Initial state', start_time)
+        if verbose:
+            print(f"--- KL算法开始 (遵从原始论文) ---")
+            print(f"初始割边数: {state.cut_size}")
+    fixed_nodes = _resolve_fixed(fixed, state.partition_A, state.partition_B)
+
+    yield from _kl_passes(adjacency, state, max_passes, _resolve_pass_cutoff(pass_cutoff, len(adjacency)), verbose, fixed_nodes)
+
+def kernighan_lin_partition(
+    G: GraphLike, 
+    initial_partition: Tuple[Set[str], Set[str]],
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = True,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    使用经典Kernighan-Lin算法对图进行两路划分。
+    此实现严格遵循原始论文，包含轮次内D值更新。
+
+    可选的 pass_cutoff 参照FM算法的常用做法：若连续 pass_cutoff 次交换
+    (取 (0, 1) 之间的小数时为节点总数的该比例) 都未刷新本轮最大累积增益，
+    则提前结束本轮，跳过的交换次数记录在 history 的 'skipped_swaps' 中。
+    默认为 None，即与原始论文一致地完成全部交换。
+
+    G 既可以是 nx.Graph，也可以是 ArrayGraph（此时全程无需导入 NetworkX，
+    返回的 initial_graph 与 final_graph 为 None）。
+
+    history 的每一项都带有 'elapsed'：自函数开始到该状态得出时的耗时（秒），
+    可用于绘制随时间变化的割边数曲线（anytime 曲线）。
+
+    可选的 fixed = (fixed_A, fixed_B) 给出预先固定在A区、B区的节点（如I/O焊盘、宏单元），
+    它们必须已位于 initial_partition 中对应的一侧（否则抛出 ValueError），在所有轮次中都不参与交换，
+    每轮的候选交换数为两侧非固定节点数的较小值。
+
+    该函数只是把 kernighan_lin_passes 运行到底；需要逐轮观察或断点续跑时请直接使用生成器。
+
+    Returns:
+        Tuple[...]:
+            - ... (原有返回项)
+            - initial_graph (nx.Graph): 带有初始分区信息的图对象。
+            - final_graph (nx.Graph): 带有最终分区信息的图对象。
+    """
+    start_time = time.perf_counter()
+
+    states = kernighan_lin_passes(G, initial_partition, max_passes, pass_cutoff, verbose, fixed=fixed)
+    initial_state = next(states)
+
+    # --- 新功能：创建带有初始分区信息的图 ---
+    initial_graph = partitioned_copy(G, initial_state.partition_A, initial_state.partition_B)
+
+    state = last_state(states, initial_state)
+
     # --- 新功能：创建带有最终分区信息的图 ---
-    final_graph = G.copy()
-    for node in best_partition_A:
-        final_graph.nodes[node]['partition'] = 'A'
-    for node in best_partition_B:
-        final_graph.nodes[node]['partition'] = 'B'
+    final_graph = partitioned_copy(G, state.best_partition_A, state.best_partition_B)
 
     end_time = time.perf_counter()
     execution_time = end_time - start_time
 
     if verbose:
         print("\n--- KL算法结束 ---")
-        print(f"最终最小割边数: {best_cut_size}")
+        print(f"最终最小割边数: {state.best_cut_size}")
         print(f"总运行时间: {execution_time:.6f} 秒")
 
-    return best_partition_A, best_partition_B, best_cut_size, history, execution_time, initial_graph, final_graph
+    return state.best_partition_A, state.best_partition_B, state.best_cut_size, state.history, execution_time, initial_graph, final_graph
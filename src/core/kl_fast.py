@@ -0,0 +1,240 @@
+# EDA_Circuit_Partitioning_KL/src/core/kl_fast.py
+
+"""
+kl_fast.py - 近似快速KL算法
+kl_original.py 在一轮内从不更新D值，按过期的D值选择交换对；kl_classic.py 每次交换后更新全部未锁定节点的D值，
+并在全部 |A|×|B| 个节点对中选择增益最大的一对，单次交换的代价为 O(n²)。
+该模块介于两者之间：
+1. 每 refresh_interval 次交换重算一次未锁定节点的D值，并按D值从大到小排序两侧节点。
+2. 每次交换只考虑两侧排序靠前的 num_candidates 个未锁定节点，选择前先按当前（含本轮已做的交换）的划分
+   重算这些候选的D值，再在候选对中按精确增益 D(a) + D(b) - 2c(a,b) 选择。
+3. 排序之外的节点使用上次全量刷新时的D值，这是唯一的近似来源；单次交换的代价降为 O(num_candidates · (度数 + num_candidates))。
+每轮的锁定、最大累积增益前缀的选取与交换的应用与 kl_classic.py 完全相同，返回接口也完全一致。
+num_candidates 不小于节点数且 refresh_interval 为1时，结果与 kl_classic.py 相同。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from .array_graph import GraphLike, adjacency_dict, partitioned_copy
+from .checkpoint import PartitionState, check_resume_state, last_state
+from .kl_classic import _calculate_cut_size, _calculate_D_values, _initial_kl_state, _resolve_fixed, _resolve_pass_cutoff
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+DEFAULT_NUM_CANDIDATES = 8     # 每侧参与选择的候选节点数
+DEFAULT_REFRESH_INTERVAL = 4   # 全量刷新D值与重新排序的间隔（交换次数）
+
+
+def _node_D_value(adjacency: Dict[str, Dict[str, float]], in_A: Dict[str, bool], u: str) -> float:
+    """按当前划分 in_A 计算单个节点的 D 值 (E - I)。"""
+    side = in_A[u]
+    return sum(weight if in_A[v] != side else -weight for v, weight in adjacency[u].items())
+
+
+def _top_unlocked(order: List[str], unlocked: Set[str], start: int, count: int) -> Tuple[List[str], int]:
+    """
+    从 order[start:] 中依次取出 count 个未锁定节点。
+
+    Returns:
+        Tuple[List[str], int]: (候选节点, 第一个未锁定节点的位置，下次从这里开始扫描)
+    """
+    while start < len(order) and order[start] not in unlocked:
+        start += 1
+    candidates = []
+    for u in order[start:]:
+        if u in unlocked:
+            candidates.append(u)
+            if len(candidates) == count:
+                break
+    return candidates, start
+
+
+def _fast_kl_passes(
+    adjacency: Dict[str, Dict[str, float]],
+    state: PartitionState,
+    max_passes: int,
+    cutoff: Optional[int],
+    num_candidates: int,
+    refresh_interval: int,
+    verbose: bool,
+    fixed: FrozenSet[str] = frozenset()
+) -> Iterator[PartitionState]:
+    """
+    从给定状态开始执行近似KL轮次，产出方式与 kl_classic._kl_passes 相同。
+    """
+    clock_start = time.perf_counter() - state.elapsed
+    yield state
+    if state.converged:
+        return
+
+    partition_A, partition_B = state.partition_A.copy(), state.partition_B.copy()
+    best_partition_A, best_partition_B = state.best_partition_A, state.best_partition_B
+    best_cut_size, current_cut_size = state.best_cut_size, state.cut_size
+    history = list(state.history)
+    next_D = state.D_values
+
+    for pass_num in range(state.pass_num + 1, max_passes + 1):
+        if verbose: print(f"\n--- Pass {pass_num} ---")
+        D = dict(next_D)
+        in_A = dict.fromkeys(partition_A, True)
+        in_A.update(dict.fromkeys(partition_B, False))
+        unlocked_A, unlocked_B = partition_A.copy(), partition_B.copy()
+        if fixed:
+            unlocked_A -= fixed; unlocked_B -= fixed
+        swap_history = []
+        num_candidate_swaps = min(len(unlocked_A), len(unlocked_B))
+        running_gain, running_best, swaps_since_best = 0, 0, 0
+        swaps_since_refresh, refreshes = refresh_interval, 0
+        for step in range(num_candidate_swaps):
+            if cutoff is not None and swaps_since_best >= cutoff:
+                break
+            if swaps_since_refresh >= refresh_interval:
+                if step:  # 本轮开始时的D值已是精确值
+                    for u in unlocked_A | unlocked_B:
+                        D[u] = _node_D_value(adjacency, in_A, u)
+                    refreshes += 1
+                order_A = sorted(unlocked_A, key=D.__getitem__, reverse=True)
+                order_B = sorted(unlocked_B, key=D.__getitem__, reverse=True)
+                start_A = start_B = swaps_since_refresh = 0
+
+            candidates_A, start_A = _top_unlocked(order_A, unlocked_A, start_A, num_candidates)
+            candidates_B, start_B = _top_unlocked(order_B, unlocked_B, start_B, num_candidates)
+            if swaps_since_refresh:  # 自上次全量刷新以来已有交换，候选的D值可能已过期
+                for u in candidates_A + candidates_B:
+                    D[u] = _node_D_value(adjacency, in_A, u)
+            best_gain, best_pair = -float('inf'), (None, None)
+            for a in candidates_A:
+                for b in candidates_B:
+                    gain = D[a] + D[b] - 2 * adjacency[a].get(b, 0)
+                    if gain > best_gain:
+                        best_gain, best_pair = gain, (a, b)
+            if best_pair == (None, None): break
+            a_swap, b_swap = best_pair
+            swap_history.append({'gain': best_gain, 'pair': (a_swap, b_swap)})
+            running_gain += best_gain
+            if running_gain > running_best:
+                running_best, swaps_since_best = running_gain, 0
+            else:
+                swaps_since_best += 1
+            unlocked_A.remove(a_swap)
+            unlocked_B.remove(b_swap)
+            in_A[a_swap], in_A[b_swap] = False, True
+            swaps_since_refresh += 1
+        max_cumulative_gain, best_k = 0, -1
+        cumulative_gain = 0
+        for i, item in enumerate(swap_history):
+            cumulative_gain += item['gain']
+            if cumulative_gain > max_cumulative_gain:
+                max_cumulative_gain, best_k = cumulative_gain, i
+        skipped_swaps = num_candidate_swaps - len(swap_history)
+        if verbose: print(f"本轮找到 {len(swap_history)} 个交换对 (全量刷新D值 {refreshes} 次)，最大累积增益 G = {max_cumulative_gain} (在第 {best_k + 1} 次交换时达到)。")
+        if verbose and skipped_swaps: print(f"连续 {cutoff} 次交换未刷新最大累积增益，提前结束本轮，跳过 {skipped_swaps} 次交换。")
+        converged = max_cumulative_gain <= 0
+        if not converged:
+            for i in range(best_k + 1):
+                a_swapped, b_swapped = swap_history[i]['pair']
+                partition_A.remove(a_swapped); partition_A.add(b_swapped)
+                partition_B.remove(b_swapped); partition_B.add(a_swapped)
+            current_cut_size = _calculate_cut_size(adjacency, partition_A, partition_B)
+            history.append({'pass': pass_num, 'cut_size': current_cut_size, 'details': f'Applied {best_k+1} swaps.', 'skipped_swaps': skipped_swaps, 'elapsed': time.perf_counter() - clock_start})
+            if current_cut_size < best_cut_size:
+                best_cut_size = current_cut_size
+                best_partition_A, best_partition_B = partition_A.copy(), partition_B.copy()
+            if verbose: print(f"Pass {pass_num} 结束。更新后割边数: {current_cut_size}")
+            next_D = _calculate_D_values(adjacency, partition_A, partition_B)
+        elif verbose:
+            print("最大累积增益 <= 0，算法收敛。")
+
+        yield PartitionState(
+            state.algorithm, pass_num, partition_A.copy(), partition_B.copy(), next_D, current_cut_size,
+            best_partition_A, best_partition_B, best_cut_size, list(history),
+            time.perf_counter() - clock_start, converged
+        )
+        if converged:
+            break
+
+
+def kernighan_lin_fast_passes(
+    G: GraphLike,
+    initial_partition: Optional[Tuple[Set[str], Set[str]]] = None,
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    num_candidates: int = DEFAULT_NUM_CANDIDATES,
+    refresh_interval: int = DEFAULT_REFRESH_INTERVAL,
+    verbose: bool = False,
+    resume_from: Optional[PartitionState] = None,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Iterator[PartitionState]:
+    """
+    近似快速KL算法的生成器形式，产出方式与 kl_classic.kernighan_lin_passes 相同。
+    参数与 kernighan_lin_fast 相同；resume_from 给出时忽略 initial_partition，从该检查点继续（fixed 需再次给出）。
+    """
+    if num_candidates < 1 or refresh_interval < 1:
+        raise ValueError(f"num_candidates 与 refresh_interval 必须为正整数，实际为 {num_candidates}、{refresh_interval}。")
+    start_time = time.perf_counter()
+    adjacency = adjacency_dict(G)
+    if resume_from is not None:
+        check_resume_state(resume_from, 'kl_fast', adjacency)
+        state = resume_from
+    elif initial_partition is None:
+        raise ValueError("需要提供 initial_partition 或 resume_from。")
+    else:
+        state = _initial_kl_state('kl_fast', adjacency, initial_partition[0], initial_partition[1], 'Initial state', start_time)
+        if verbose:
+            print(f"--- 近似快速KL算法开始 (候选数 {num_candidates}, 每 {refresh_interval} 次交换全量刷新D值) ---")
+            print(f"初始割边数: {state.cut_size}")
+    fixed_nodes = _resolve_fixed(fixed, state.partition_A, state.partition_B)
+
+    yield from _fast_kl_passes(adjacency, state, max_passes, _resolve_pass_cutoff(pass_cutoff, len(adjacency)),
+                               num_candidates, refresh_interval, verbose, fixed_nodes)
+
+
+def kernighan_lin_fast(
+    G: GraphLike,
+    initial_partition: Tuple[Set[str], Set[str]],
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    num_candidates: int = DEFAULT_NUM_CANDIDATES,
+    refresh_interval: int = DEFAULT_REFRESH_INTERVAL,
+    verbose: bool = True,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    使用近似快速KL算法对图进行两路划分（把 kernighan_lin_fast_passes 运行到底）。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Tuple[Set[str], Set[str]]): 初始分区 A 和 B。
+        max_passes (int): 最大迭代轮数上限。
+        pass_cutoff (Optional[float]): 轮内提前结束阈值，含义与 kl_classic.kernighan_lin_partition 相同。
+        num_candidates (int): 每次交换时每侧参与选择的候选节点数，越大越接近经典KL。
+        refresh_interval (int): 每多少次交换全量刷新一次D值并重新排序，越小越接近经典KL。
+        verbose (bool): 是否打印详细的执行过程信息。
+        fixed (Optional[Tuple[Set[str], Set[str]]]): 固定在A区、B区的节点，含义与 kl_classic.kernighan_lin_partition 相同。
+
+    Returns:
+        (与kl_classic.py的返回接口完全一致)
+    """
+    start_time = time.perf_counter()
+
+    states = kernighan_lin_fast_passes(G, initial_partition, max_passes, pass_cutoff, num_candidates, refresh_interval, verbose,
+                                       fixed=fixed)
+    initial_state = next(states)
+    initial_graph = partitioned_copy(G, initial_state.partition_A, initial_state.partition_B)
+
+    state = last_state(states, initial_state)
+    final_graph = partitioned_copy(G, state.best_partition_A, state.best_partition_B)
+
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+
+    if verbose:
+        print("\n--- 近似快速KL算法结束 ---")
+        print(f"最终最小割边数: {state.best_cut_size}")
+        print(f"总运行时间: {execution_time:.6f} 秒")
+
+    return state.best_partition_A, state.best_partition_B, state.best_cut_size, state.history, execution_time, initial_graph, final_graph
@@ -5,27 +5,42 @@ kl_improvements.py - KL算法改进策略：BFS初始划分
 该模块实现了对经典KL算法的改进。它不接受外部的初始划分，
 而是使用广度优先搜索（BFS）策略来生成一个高质量的初始划分，
 旨在减少后续KL算法的迭代次数并可能获得更好的结果。
+此外提供谱方法(Fiedler向量)与贪心图生长(GGGP)初始划分，并通过 create_initial_partition
+为所有接受 initial_partition 的算法提供统一的初始划分策略选择。
+生成器形式 kernighan_lin_bfs_passes 逐轮产出状态快照，支持断点续跑。
+place_fixed_vertices 把初始划分中位于错误一侧的固定节点与对侧的非固定节点互换，供各初始划分策略共用。
 """
 
-import networkx as nx
+from __future__ import annotations
+
 import time
 import random
-from typing import Set, Tuple, List, Dict, Optional
+from collections import deque
+from typing import TYPE_CHECKING, Iterator, Set, Tuple, List, Dict, Optional
+
+from .array_graph import GraphLike, graph_to_arrays, adjacency_dict, partitioned_copy
+from .checkpoint import PartitionState, check_resume_state, last_state
+from .kl_classic import _resolve_fixed, _resolve_pass_cutoff, _initial_kl_state, _kl_passes
+from .streaming_partition import _create_streaming_initial_partition
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 # --- 从 kl_classic.py 中复用的辅助函数 ---
 
-def _calculate_cut_size(G: nx.Graph, partition_A: Set[str], partition_B: Set[str]) -> int:
-    """计算两个分区之间的割边数量（考虑权重）。"""
+def _calculate_cut_size(G: GraphLike, partition_A: Set[str], partition_B: Set[str]) -> int:
+    """计算两个分区之间的割边数量（考虑权重）。G 可以是 nx.Graph、ArrayGraph 或邻接字典。"""
     cut_size = 0
-    for u, v, data in G.edges(data=True):
-        weight = data.get('weight', 1)
-        if (u in partition_A and v in partition_B) or \
-           (u in partition_B and v in partition_A):
-            cut_size += weight
+    for u, neighbors in adjacency_dict(G).items():
+        if u in partition_A:
+            for v, weight in neighbors.items():
+                if v in partition_B:
+                    cut_size += weight
     return cut_size
 
-def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str]) -> Dict[str, int]:
-    """为图中所有节点计算初始D值 (E(v) - I(v))。"""
+def _calculate_D_values(G: GraphLike, partition_A: Set[str], partition_B: Set[str]) -> Dict[str, int]:
+    """为图中所有节点计算初始D值 (E(v) - I(v))。G 可以是 nx.Graph、ArrayGraph 或邻接字典。"""
+    adjacency = adjacency_dict(G)
     D_values = {}
     nodes = list(partition_A) + list(partition_B)
     
@@ -34,8 +49,7 @@ def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str
         current_partition = partition_A if node in partition_A else partition_B
         other_partition = partition_B if node in partition_A else partition_A
 
-        for neighbor in G.neighbors(node):
-            weight = G.get_edge_data(node, neighbor).get('weight', 1)
+        for neighbor, weight in adjacency[node].items():
             if neighbor in other_partition:
                 E_v += weight
             elif neighbor in current_partition:
@@ -45,25 +59,45 @@ def _calculate_D_values(G: nx.Graph, partition_A: Set[str], partition_B: Set[str
 
 # --- 核心改进：BFS初始划分函数 ---
 
+def _bfs_order(ag, start_node: str) -> List[str]:
+    """
+    在 CSR 邻接数组上执行BFS，按发现顺序返回 start_node 所在连通分量的节点。
+    邻居按 CSR 中的顺序（即原图邻接字典的顺序）访问，结果与 nx.bfs_tree 的节点顺序一致。
+    """
+    indptr, indices = ag.indptr.tolist(), ag.indices.tolist()
+    source = ag.index[start_node]
+    visited = [False] * len(ag.nodes)
+    visited[source] = True
+    order, queue = [source], deque([source])
+    while queue:
+        u = queue.popleft()
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if not visited[v]:
+                visited[v] = True
+                order.append(v)
+                queue.append(v)
+    return [ag.nodes[i] for i in order]
+
 def _create_bfs_initial_partition(
-    G: nx.Graph, 
+    G: GraphLike, 
     start_node: Optional[str] = None
 ) -> Tuple[Set[str], Set[str]]:
     """
     使用广度优先搜索(BFS)创建一个初始划分。
     
     参数:
-        G (nx.Graph): 输入图。
+        G (nx.Graph | ArrayGraph): 输入图。
         start_node (Optional[str]): BFS的起始节点。如果为None，则随机选择一个。
         
     Returns:
         Tuple[Set[str], Set[str]]: 分区A和分区B的节点集合。
     """
     if not start_node:
-        start_node = random.choice(list(G.nodes()))
+        start_node = random.choice(list(G.nodes))
         
     # 执行BFS并按遍历顺序列出节点
-    bfs_nodes = list(nx.bfs_tree(G, source=start_node).nodes())
+    bfs_nodes = _bfs_order(graph_to_arrays(G), start_node)
     
     # 将前一半节点放入A区，后一半放入B区
     num_nodes_A = G.number_of_nodes() // 2
@@ -72,109 +106,348 @@ def _create_bfs_initial_partition(
     
     return partition_A, partition_B
 
+def _fiedler_vector(W, tol: float, maxiter: int, seed: Optional[int]):
+    """求没有孤立节点的稀疏权重矩阵 W 对应拉普拉斯矩阵的 Fiedler 向量（小图稠密分解，大图 LOBPCG）。"""
+    import numpy as np
+    import scipy.sparse as sp
+    n = W.shape[0]
+    if n < 3:
+        return np.zeros(n)
+    degrees = np.asarray(W.sum(axis=1)).ravel()
+    L = sp.diags(degrees) - W
+
+    if n <= 200:
+        _, vectors = np.linalg.eigh(L.toarray())
+        return vectors[:, 1]
+
+    import warnings
+    from scipy.sparse.linalg import lobpcg
+
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, 1))
+    Y = np.ones((n, 1)) / np.sqrt(n)  # 约束：与常向量(特征值0)正交
+    M = sp.diags(1.0 / degrees)
+    with warnings.catch_warnings():
+        # 达到 maxiter 时 LOBPCG 会给出警告，此时近似解对排序已足够
+        warnings.simplefilter('ignore', UserWarning)
+        _, vectors = lobpcg(L, X, M=M, Y=Y, tol=tol, maxiter=maxiter, largest=False)
+    return vectors[:, 0]
+
+def _create_spectral_initial_partition(
+    G: GraphLike,
+    tol: float = 1e-5,
+    maxiter: int = 100,
+    seed: Optional[int] = 0
+) -> Tuple[Set[str], Set[str]]:
+    """
+    使用谱方法(Fiedler向量)创建一个初始划分。
+
+    以稀疏拉普拉斯矩阵 L = D - W 的第二小特征向量(Fiedler向量)为节点排序，
+    在中位数处切分：前一半节点放入A区，其余放入B区。
+    特征向量由 LOBPCG 迭代求解（以常向量为约束、度数倒数为预条件子），
+    小图则直接使用稠密特征分解。
+    孤立节点（悬空单元）在求解前去掉：它们会使特征值0重复、Fiedler向量退化，度数为0也会使预条件子病态；
+    它们不影响割边数，排序时放在非孤立节点的中位数处，用于补足两侧的节点数。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        tol (float): LOBPCG 收敛容差。
+        maxiter (int): LOBPCG 最大迭代次数，达到上限时使用当前近似解。
+        seed (Optional[int]): LOBPCG 初始向量的随机种子。
+
+    Returns:
+        Tuple[Set[str], Set[str]]: 分区A和分区B的节点集合。
+    """
+    import numpy as np
+    import scipy.sparse as sp
+    ag = graph_to_arrays(G)
+    n = len(ag.nodes)
+    num_nodes_A = n // 2
+    if n < 3:
+        return set(ag.nodes[:num_nodes_A]), set(ag.nodes[num_nodes_A:])
+
+    W = sp.csr_matrix((ag.weights.astype(np.float64), ag.indices, ag.indptr), shape=(n, n))
+    connected = np.asarray(W.sum(axis=1)).ravel() > 0
+    active = np.flatnonzero(connected)
+    fiedler = _fiedler_vector(W[active][:, active], tol, maxiter, seed)
+
+    ranked = active[np.argsort(fiedler, kind='stable')]
+    split = len(ranked) // 2
+    order = np.concatenate([ranked[:split], np.flatnonzero(~connected), ranked[split:]])
+    partition_A = {ag.nodes[i] for i in order[:num_nodes_A]}
+    partition_B = {ag.nodes[i] for i in order[num_nodes_A:]}
+    return partition_A, partition_B
+
+def _bfs_farthest(indptr: List[int], indices: List[int], source: int) -> Tuple[int, int]:
+    """
+    从 source 出发做数组BFS，返回 (离心距, 最远层中度数最小的节点)。
+    """
+    level = {source: 0}
+    frontier = [source]
+    depth = 0
+    while True:
+        next_frontier = []
+        for u in frontier:
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if v not in level:
+                    level[v] = depth + 1
+                    next_frontier.append(v)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+        depth += 1
+    farthest = min(frontier, key=lambda v: (indptr[v + 1] - indptr[v], v))
+    return depth, farthest
+
+def _find_pseudo_peripheral_node(indptr: List[int], indices: List[int], start: int) -> int:
+    """
+    通过反复BFS寻找伪外围节点：每次跳到最远层中度数最小的节点，
+    直到离心距不再增大。
+    """
+    node = start
+    eccentricity, candidate = _bfs_farthest(indptr, indices, node)
+    while True:
+        candidate_eccentricity, next_candidate = _bfs_farthest(indptr, indices, candidate)
+        if candidate_eccentricity <= eccentricity:
+            return node
+        node, eccentricity, candidate = candidate, candidate_eccentricity, next_candidate
+
+def _grow_region(
+    indptr: List[int],
+    indices: List[int],
+    weights: List[float],
+    seed_node: int,
+    target_size: int
+) -> Tuple[List[bool], float]:
+    """
+    贪心图生长(GGGP)：从 seed_node 出发，每次把能使割边数减少最多
+    (即 2·与A区的连接权重 - 加权度数 最大) 的边界节点加入A区，直到A区达到 target_size。
+    增益保存在带懒删除的最大堆中，总代价为 O(m log n)。
+
+    Returns:
+        Tuple[List[bool], float]: (节点是否在A区, A区生长完成时的割边数)
+    """
+    import heapq
+
+    n = len(indptr) - 1
+    in_A = [False] * n
+    connection = [0] * n  # 与A区相连的边权重之和
+    weighted_degree = [0] * n
+    for u in range(n):
+        weighted_degree[u] = sum(weights[k] for k in range(indptr[u], indptr[u + 1]) if indices[k] != u)
+
+    heap = [(-(2 * connection[seed_node] - weighted_degree[seed_node]), seed_node)]
+    cut_size, size_A, next_unvisited = 0, 0, 0
+    while size_A < target_size:
+        while heap:
+            neg_gain, v = heapq.heappop(heap)
+            if not in_A[v] and -neg_gain == 2 * connection[v] - weighted_degree[v]:
+                break
+        else:
+            # 边界为空（图不连通）：从编号最小的未分配节点继续生长
+            while in_A[next_unvisited]:
+                next_unvisited += 1
+            v = next_unvisited
+
+        in_A[v] = True
+        size_A += 1
+        cut_size += weighted_degree[v] - 2 * connection[v]
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            if not in_A[u] and u != v:
+                connection[u] += weights[k]
+                heapq.heappush(heap, (-(2 * connection[u] - weighted_degree[u]), u))
+    return in_A, cut_size
+
+def _grow_region_task(args: Tuple) -> Tuple[List[bool], float]:
+    """供进程池调用的 _grow_region 包装（参数打包为单个元组）。"""
+    return _grow_region(*args)
+
+def _create_gggp_initial_partition(
+    G: GraphLike,
+    start_node: Optional[str] = None,
+    num_seeds: int = 1,
+    n_jobs: int = 1
+) -> Tuple[Set[str], Set[str]]:
+    """
+    使用贪心图生长划分(GGGP)创建一个初始划分。
+
+    与 _create_bfs_initial_partition 按BFS顺序机械地填满A区不同，
+    这里从伪外围节点出发，每一步把使割边数增加最少的边界节点加入A区。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        start_node (Optional[str]): 寻找第一个伪外围种子的起点。如果为None，则随机选择一个。
+        num_seeds (int): 尝试的种子数量，保留割边数最小的结果。
+            第一个种子由 start_node 出发求得，其余种子由随机节点出发求得。
+        n_jobs (int): 大于1时使用进程池并行生长各个种子。
+
+    Returns:
+        Tuple[Set[str], Set[str]]: 分区A和分区B的节点集合。
+    """
+    ag = graph_to_arrays(G)
+    n = len(ag.nodes)
+    if n == 0:
+        return set(), set()
+    indptr, indices, weights = ag.indptr.tolist(), ag.indices.tolist(), ag.weights.tolist()
+
+    if not start_node:
+        start_node = random.choice(ag.nodes)
+    starts = [ag.index[start_node]] + [random.randrange(n) for _ in range(num_seeds - 1)]
+    seeds = list(dict.fromkeys(_find_pseudo_peripheral_node(indptr, indices, s) for s in starts))
+
+    tasks = [(indptr, indices, weights, seed, n // 2) for seed in seeds]
+    if n_jobs > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_grow_region_task, tasks))
+    else:
+        results = [_grow_region_task(task) for task in tasks]
+
+    in_A, _ = min(results, key=lambda result: result[1])
+    partition_A = {ag.nodes[i] for i in range(n) if in_A[i]}
+    partition_B = {ag.nodes[i] for i in range(n) if not in_A[i]}
+    return partition_A, partition_B
+
+def _create_random_initial_partition(G: GraphLike) -> Tuple[Set[str], Set[str]]:
+    """随机打乱节点后对半切分（使用 random 模块的全局状态，与实验脚本的随机初始划分一致）。"""
+    nodes = list(G.nodes)
+    random.shuffle(nodes)
+    num_nodes_A = len(nodes) // 2
+    return set(nodes[:num_nodes_A]), set(nodes[num_nodes_A:])
+
+# 可选的初始划分策略，名称 -> 生成函数 (G) -> (A, B)
+INITIAL_PARTITION_STRATEGIES = {
+    'random': _create_random_initial_partition,
+    'bfs': _create_bfs_initial_partition,
+    'spectral': _create_spectral_initial_partition,
+    'gggp': _create_gggp_initial_partition,
+    'streaming': _create_streaming_initial_partition,
+}
+
+def place_fixed_vertices(
+    partition: Tuple[Set[str], Set[str]],
+    fixed: Optional[Tuple[Set[str], Set[str]]]
+) -> Tuple[Set[str], Set[str]]:
+    """
+    使固定节点 fixed = (fixed_A, fixed_B) 位于各自指定的一侧，两侧的节点数保持不变。
+    位于错误一侧的固定节点先两两互换；其余的与对侧的非固定节点（按节点名顺序选取，结果可复现）互换。
+
+    Returns:
+        Tuple[Set[str], Set[str]]: 调整后的分区A和分区B（新的集合，不修改输入）。
+    """
+    partition_A, partition_B = set(partition[0]), set(partition[1])
+    if not fixed:
+        return partition_A, partition_B
+    fixed_A, fixed_B = set(fixed[0]), set(fixed[1])
+    unknown = (fixed_A | fixed_B) - partition_A - partition_B
+    if unknown:
+        raise ValueError(f"固定节点不在图中: {sorted(unknown)[:10]}")
+    if fixed_A & fixed_B:
+        raise ValueError(f"节点不能同时固定在两侧: {sorted(fixed_A & fixed_B)[:10]}")
+
+    to_A, to_B = sorted(fixed_A & partition_B), sorted(fixed_B & partition_A)
+    extra = len(to_A) - len(to_B)
+    free_A, free_B = sorted(partition_A - fixed_A - fixed_B), sorted(partition_B - fixed_A - fixed_B)
+    if extra > len(free_A) or -extra > len(free_B):
+        raise ValueError(f"固定节点过多，无法在保持两侧节点数 ({len(partition_A)}, {len(partition_B)}) 不变的情况下放置。")
+    if extra > 0:
+        to_B += free_A[:extra]
+    elif extra < 0:
+        to_A += free_B[:-extra]
+    return (partition_A - set(to_B)) | set(to_A), (partition_B - set(to_A)) | set(to_B)
+
+def create_initial_partition(
+    G: GraphLike,
+    strategy: str = 'random',
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Tuple[Set[str], Set[str]]:
+    """
+    按指定策略生成初始划分，结果可直接作为任意算法的 initial_partition 参数。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 输入图。
+        strategy (str): 'random'、'bfs'、'spectral'、'gggp' 或 'streaming'。
+        fixed (Optional[Tuple[Set[str], Set[str]]]): 固定在A区、B区的节点；给出时按 place_fixed_vertices 调整结果。
+
+    Returns:
+        Tuple[Set[str], Set[str]]: 分区A和分区B的节点集合。
+    """
+    if strategy not in INITIAL_PARTITION_STRATEGIES:
+        raise ValueError(f"未知的初始划分策略 '{strategy}'，可选: {list(INITIAL_PARTITION_STRATEGIES)}")
+    return place_fixed_vertices(INITIAL_PARTITION_STRATEGIES[strategy](G), fixed)
+
 # --- 改进后的KL主函数 ---
 
+def kernighan_lin_bfs_passes(
+    G: GraphLike,
+    max_passes: int = 10,
+    start_node: Optional[str] = None,
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = False,
+    resume_from: Optional[PartitionState] = None,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Iterator[PartitionState]:
+    """
+    BFS初始划分KL算法的生成器形式：先产出BFS初始状态，之后每完成一轮产出一个 PartitionState 快照。
+    参数与 kernighan_lin_bfs_init 相同；resume_from 给出时跳过BFS初始划分，从该检查点继续（fixed 需再次给出）。
+    """
+    start_time = time.perf_counter()
+    adjacency = adjacency_dict(G)
+    if resume_from is not None:
+        check_resume_state(resume_from, 'kl_bfs', adjacency)
+        state = resume_from
+    else:
+        # --- 关键改动：调用BFS函数生成初始划分，而非接收外部传入 ---
+        partition_A, partition_B = place_fixed_vertices(_create_bfs_initial_partition(G, start_node), fixed)
+        state = _initial_kl_state('kl_bfs', adjacency, partition_A, partition_B, 'BFS Initial state', start_time)
+        if verbose:
+            print(f"--- KL算法开始 (使用BFS初始划分) ---")
+            print(f"BFS生成的初始割边数: {state.cut_size}")
+    fixed_nodes = _resolve_fixed(fixed, state.partition_A, state.partition_B)
+
+    # 后续的KL核心优化流程与 kl_classic.py 完全相同
+    yield from _kl_passes(adjacency, state, max_passes, _resolve_pass_cutoff(pass_cutoff, len(adjacency)), verbose, fixed_nodes)
+
 def kernighan_lin_bfs_init(
-    G: nx.Graph, 
+    G: GraphLike, 
     max_passes: int = 10,
     start_node: Optional[str] = None,
-    verbose: bool = True
-) -> Tuple[Set[str], Set[str], int, List[Dict], float, nx.Graph, nx.Graph]:
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = True,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
     """
-    使用带有BFS初始划分的经典KL算法对图进行两路划分。
+    使用带有BFS初始划分的经典KL算法对图进行两路划分（把 kernighan_lin_bfs_passes 运行到底）。
 
     参数:
-        G (nx.Graph): 待划分的图。
+        G (nx.Graph | ArrayGraph): 待划分的图。
         max_passes (int): 最大迭代轮数上限。
         start_node (Optional[str]): BFS的起始节点。
+        pass_cutoff (Optional[float]): 轮内提前结束阈值，含义与 kl_classic.kernighan_lin_partition 相同。
         verbose (bool): 是否打印详细的执行过程信息。
+        fixed (Optional[Tuple[Set[str], Set[str]]]): 固定在A区、B区的节点；BFS初始划分中位于错误一侧的固定节点
+            先按 place_fixed_vertices 与对侧节点互换，之后的各轮中不参与交换。
 
     Returns:
         (与kl_classic.py的返回接口完全一致)
     """
     start_time = time.perf_counter()
 
-    # --- 关键改动：调用BFS函数生成初始划分，而非接收外部传入 ---
-    partition_A, partition_B = _create_bfs_initial_partition(G, start_node)
-    
-    initial_graph = G.copy()
-    for node in partition_A:
-        initial_graph.nodes[node]['partition'] = 'A'
-    for node in partition_B:
-        initial_graph.nodes[node]['partition'] = 'B'
-    
-    best_partition_A = partition_A.copy()
-    best_partition_B = partition_B.copy()
-    best_cut_size = _calculate_cut_size(G, partition_A, partition_B)
-    
-    if verbose:
-        print(f"--- KL算法开始 (使用BFS初始划分) ---")
-        print(f"BFS生成的初始割边数: {best_cut_size}")
-
-    history = [{'pass': 0, 'cut_size': best_cut_size, 'details': 'BFS Initial state'}]
-    
-    # 后续的KL核心优化流程与 kl_classic.py 完全相同
-    for pass_num in range(1, max_passes + 1):
-        # ... (这部分代码与 kl_classic.py 相同)
-        if verbose: print(f"\n--- Pass {pass_num} ---")
-        D = _calculate_D_values(G, partition_A, partition_B)
-        current_A, current_B = partition_A.copy(), partition_B.copy()
-        unlocked_A, unlocked_B = current_A.copy(), current_B.copy()
-        swap_history = []
-        for _ in range(min(len(current_A), len(current_B))):
-            best_gain, best_pair = -float('inf'), (None, None)
-            for a in unlocked_A:
-                for b in unlocked_B:
-                    c_ab = G.get_edge_data(a, b, default={'weight': 0})['weight']
-                    gain = D[a] + D[b] - 2 * c_ab
-                    if gain > best_gain:
-                        best_gain, best_pair = gain, (a, b)
-            if best_pair == (None, None): break
-            a_swap, b_swap = best_pair
-            swap_history.append({'gain': best_gain, 'pair': (a_swap, b_swap)})
-            unlocked_A.remove(a_swap); unlocked_B.remove(b_swap)
-            for u in unlocked_A:
-                c_ua = G.get_edge_data(u, a_swap, default={'weight': 0})['weight']
-                c_ub = G.get_edge_data(u, b_swap, default={'weight': 0})['weight']
-                D[u] += 2 * c_ua - 2 * c_ub
-            for v in unlocked_B:
-                c_va = G.get_edge_data(v, a_swap, default={'weight': 0})['weight']
-                c_vb = G.get_edge_data(v, b_swap, default={'weight': 0})['weight']
-                D[v] += 2 * c_vb - 2 * c_va
-        max_cumulative_gain, best_k = 0, -1
-        cumulative_gain = 0
-        for i, item in enumerate(swap_history):
-            cumulative_gain += item['gain']
-            if cumulative_gain > max_cumulative_gain:
-                max_cumulative_gain, best_k = cumulative_gain, i
-        if verbose: print(f"本轮找到 {len(swap_history)} 个交换对，最大累积增益 G = {max_cumulative_gain} (在第 {best_k + 1} 次交换时达到)。")
-        if max_cumulative_gain > 0:
-            for i in range(best_k + 1):
-                a_swapped, b_swapped = swap_history[i]['pair']
-                partition_A.remove(a_swapped); partition_A.add(b_swapped)
-                partition_B.remove(b_swapped); partition_B.add(a_swapped)
-            current_cut_size = _calculate_cut_size(G, partition_A, partition_B)
-            history.append({'pass': pass_num, 'cut_size': current_cut_size, 'details': f'Applied {best_k+1} swaps.'})
-            if current_cut_size < best_cut_size:
-                best_cut_size = current_cut_size
-                best_partition_A, best_partition_B = partition_A.copy(), partition_B.copy()
-            if verbose: print(f"Pass {pass_num} 结束。更新后割边数: {current_cut_size}")
-        else:
-            if verbose: print("最大累积增益 <= 0，算法收敛。")
-            break
+    states = kernighan_lin_bfs_passes(G, max_passes, start_node, pass_cutoff, verbose, fixed=fixed)
+    initial_state = next(states)
+    initial_graph = partitioned_copy(G, initial_state.partition_A, initial_state.partition_B)
 
-    final_graph = G.copy()
-    for node in best_partition_A:
-        final_graph.nodes[node]['partition'] = 'A'
-    for node in best_partition_B:
-        final_graph.nodes[node]['partition'] = 'B'
+    state = last_state(states, initial_state)
+    final_graph = partitioned_copy(G, state.best_partition_A, state.best_partition_B)
 
     end_time = time.perf_counter()
     execution_time = end_time - start_time
     
     if verbose:
         print("\n--- KL算法 (BFS初始划分) 结束 ---")
-        print(f"最终最小割边数: {best_cut_size}")
+        print(f"最终最小割边数: {state.best_cut_size}")
         print(f"总运行时间: {execution_time:.6f} 秒")
 
-    return best_partition_A, best_partition_B, best_cut_size, history, execution_time, initial_graph, final_graph
\ No newline at end of file
+    return state.best_partition_A, state.best_partition_B, state.best_cut_size, state.history, execution_time, initial_graph, final_graph
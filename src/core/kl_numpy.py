@@ -0,0 +1,237 @@
+# EDA_Circuit_Partitioning_KL/src/core/kl_numpy.py
+
+"""
+kl_numpy.py - 向量化的精确KL算法
+与 kl_classic.py 逐步相同的KL实现，把每次交换中对 |A|×|B| 个节点对的 Python 双重循环换成 NumPy 数组运算：
+1. 每轮开始时把 A×B 之间的边权重装入稠密矩阵 C_AB（只取跨两区的块，内存为 |A|·|B| 个元素，适合数千节点的图）。
+2. 每次交换计算增益矩阵 D_A[:, None] + D_B[None, :] - 2·C_AB，已锁定的行列以极小值屏蔽后取 argmax；
+   已锁定的行列累计到四分之一时压缩掉，使后续交换的矩阵随之变小。
+3. 交换后只按两个被交换节点的邻接数组向量化地更新D值。
+结果与 kl_classic.py 完全相同（而不只是割边数相同）：
+- 增益矩阵的行列按经典实现遍历 unlocked_A / unlocked_B 的顺序排列，argmax 返回第一个最大值，
+  与经典实现中“严格大于才替换”的选择规则一致，增益相同时选中同一个交换对。
+- 增益与D值更新的浮点运算顺序与经典实现相同，浮点权重下也逐位一致。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .array_graph import GraphLike, adjacency_dict, arrays_from_adjacency, partitioned_copy
+from .checkpoint import PartitionState, check_resume_state, last_state
+from .kl_batched import _masked_fill_value
+from .kl_classic import _calculate_cut_size, _calculate_D_values, _initial_kl_state, _resolve_fixed, _resolve_pass_cutoff
+
+if TYPE_CHECKING:
+    import networkx as nx
+    from .array_graph import ArrayGraph
+
+
+def _cross_weights(ag: ArrayGraph, rows: np.ndarray, cols: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """返回 |rows|×|cols| 的矩阵 2·C，C[i, j] 为节点 rows[i] 与 cols[j] 之间的边权重（rows 与 cols 为不相交的节点编号）。"""
+    n = len(ag.nodes)
+    position = np.full(n, -1, dtype=np.int64)
+    position[rows] = np.arange(len(rows))
+    in_cols = np.zeros(n, dtype=bool)
+    in_cols[cols] = True
+    col_position = np.zeros(n, dtype=np.int64)
+    col_position[cols] = np.arange(len(cols))
+
+    source = np.repeat(np.arange(n), np.diff(ag.indptr))
+    cross = (position[source] >= 0) & in_cols[ag.indices]
+    C2 = np.zeros((len(rows), len(cols)), dtype=dtype)
+    C2[position[source[cross]], col_position[ag.indices[cross]]] = 2 * ag.weights[cross]
+    return C2
+
+
+def _numpy_kl_passes(
+    adjacency: Dict[str, Dict[str, float]],
+    state: PartitionState,
+    max_passes: int,
+    cutoff: Optional[int],
+    verbose: bool,
+    fixed: FrozenSet[str] = frozenset()
+) -> Iterator[PartitionState]:
+    """
+    从给定状态开始执行KL轮次，产出方式与 kl_classic._kl_passes 相同；固定节点不进入增益矩阵。
+    """
+    clock_start = time.perf_counter() - state.elapsed
+    yield state
+    if state.converged:
+        return
+
+    ag = arrays_from_adjacency(adjacency)
+    n = len(ag.nodes)
+    dtype = np.int64 if ag.weights.dtype.kind in 'iu' else np.float64
+    fill = _masked_fill_value(dtype)
+    weights2 = 2 * ag.weights.astype(dtype)
+    indptr, indices = ag.indptr, ag.indices
+
+    partition_A, partition_B = state.partition_A.copy(), state.partition_B.copy()
+    best_partition_A, best_partition_B = state.best_partition_A, state.best_partition_B
+    best_cut_size, current_cut_size = state.best_cut_size, state.cut_size
+    history = list(state.history)
+    next_D = state.D_values
+
+    for pass_num in range(state.pass_num + 1, max_passes + 1):
+        if verbose: print(f"\n--- Pass {pass_num} ---")
+        # 与经典实现相同的复制与去除固定节点过程，使节点顺序与其遍历 unlocked_A / unlocked_B 的顺序一致
+        # （-= 在删除较多元素后可能重建哈希表，从而改变其余节点的顺序与平局时的选择）
+        current_A, current_B = partition_A.copy(), partition_B.copy()
+        unlocked_A, unlocked_B = current_A.copy(), current_B.copy()
+        if fixed:
+            unlocked_A -= fixed; unlocked_B -= fixed
+        order_A, order_B = list(unlocked_A), list(unlocked_B)
+        nodes_A = np.fromiter((ag.index[u] for u in order_A), dtype=np.int64, count=len(order_A))
+        nodes_B = np.fromiter((ag.index[v] for v in order_B), dtype=np.int64, count=len(order_B))
+        D = np.zeros(n, dtype=dtype)
+        D[nodes_A] = [next_D[u] for u in order_A]
+        D[nodes_B] = [next_D[v] for v in order_B]
+        sign = np.ones(n, dtype=dtype)
+        sign[nodes_B] = -1
+        locked = np.zeros(n, dtype=bool)
+
+        C2 = _cross_weights(ag, nodes_A, nodes_B, dtype)
+        active_A, active_B = np.arange(len(order_A)), np.arange(len(order_B))
+        block = C2
+        buffer = np.empty(C2.size, dtype=dtype)
+
+        swap_history = []
+        num_candidate_swaps = min(len(order_A), len(order_B))
+        running_gain, running_best, swaps_since_best = 0, 0, 0
+        for _ in range(num_candidate_swaps):
+            if cutoff is not None and swaps_since_best >= cutoff:
+                break
+            rows, cols = nodes_A[active_A], nodes_B[active_B]
+            gain = buffer[:len(rows) * len(cols)].reshape(len(rows), len(cols))
+            np.add.outer(np.where(locked[rows], fill, D[rows]), np.where(locked[cols], fill, D[cols]), out=gain)
+            gain -= block
+            r, c = divmod(int(gain.argmax()), len(cols))
+            best_gain = gain[r, c].item()
+            a_idx, b_idx = int(rows[r]), int(cols[c])
+            a_swap, b_swap = ag.nodes[a_idx], ag.nodes[b_idx]
+            swap_history.append({'gain': best_gain, 'pair': (a_swap, b_swap)})
+            running_gain += best_gain
+            if running_gain > running_best:
+                running_best, swaps_since_best = running_gain, 0
+            else:
+                swaps_since_best += 1
+            locked[a_idx] = locked[b_idx] = True
+
+            # delta[u] = 2c_ua - 2c_ub；A区节点 D[u] += delta[u]，B区节点 D[v] -= delta[v]
+            delta = np.zeros(n, dtype=dtype)
+            delta[indices[indptr[a_idx]:indptr[a_idx + 1]]] = weights2[indptr[a_idx]:indptr[a_idx + 1]]
+            delta[indices[indptr[b_idx]:indptr[b_idx + 1]]] -= weights2[indptr[b_idx]:indptr[b_idx + 1]]
+            D += sign * delta
+
+            if int(locked[rows].sum()) * 4 >= len(rows):
+                active_A, active_B = active_A[~locked[nodes_A[active_A]]], active_B[~locked[nodes_B[active_B]]]
+                block = C2[np.ix_(active_A, active_B)]
+        max_cumulative_gain, best_k = 0, -1
+        cumulative_gain = 0
+        for i, item in enumerate(swap_history):
+            cumulative_gain += item['gain']
+            if cumulative_gain > max_cumulative_gain:
+                max_cumulative_gain, best_k = cumulative_gain, i
+        skipped_swaps = num_candidate_swaps - len(swap_history)
+        if verbose: print(f"本轮找到 {len(swap_history)} 个交换对，最大累积增益 G = {max_cumulative_gain} (在第 {best_k + 1} 次交换时达到)。")
+        if verbose and skipped_swaps: print(f"连续 {cutoff} 次交换未刷新最大累积增益，提前结束本轮，跳过 {skipped_swaps} 次交换。")
+        converged = max_cumulative_gain <= 0
+        if not converged:
+            for i in range(best_k + 1):
+                a_swapped, b_swapped = swap_history[i]['pair']
+                partition_A.remove(a_swapped); partition_A.add(b_swapped)
+                partition_B.remove(b_swapped); partition_B.add(a_swapped)
+            current_cut_size = _calculate_cut_size(adjacency, partition_A, partition_B)
+            history.append({'pass': pass_num, 'cut_size': current_cut_size, 'details': f'Applied {best_k+1} swaps.', 'skipped_swaps': skipped_swaps, 'elapsed': time.perf_counter() - clock_start})
+            if current_cut_size < best_cut_size:
+                best_cut_size = current_cut_size
+                best_partition_A, best_partition_B = partition_A.copy(), partition_B.copy()
+            if verbose: print(f"Pass {pass_num} 结束。更新后割边数: {current_cut_size}")
+            next_D = _calculate_D_values(adjacency, partition_A, partition_B)
+        elif verbose:
+            print("最大累积增益 <= 0，算法收敛。")
+
+        yield PartitionState(
+            state.algorithm, pass_num, partition_A.copy(), partition_B.copy(), next_D, current_cut_size,
+            best_partition_A, best_partition_B, best_cut_size, list(history),
+            time.perf_counter() - clock_start, converged
+        )
+        if converged:
+            break
+
+
+def kernighan_lin_numpy_passes(
+    G: GraphLike,
+    initial_partition: Optional[Tuple[Set[str], Set[str]]] = None,
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = False,
+    resume_from: Optional[PartitionState] = None,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Iterator[PartitionState]:
+    """
+    向量化精确KL算法的生成器形式，产出方式与 kl_classic.kernighan_lin_passes 相同。
+    参数与 kernighan_lin_numpy 相同；resume_from 给出时忽略 initial_partition，从该检查点继续（fixed 需再次给出）。
+    """
+    start_time = time.perf_counter()
+    adjacency = adjacency_dict(G)
+    if resume_from is not None:
+        check_resume_state(resume_from, 'kl_numpy', adjacency)
+        state = resume_from
+    elif initial_partition is None:
+        raise ValueError("需要提供 initial_partition 或 resume_from。")
+    else:
+        state = _initial_kl_state('kl_numpy', adjacency, initial_partition[0], initial_partition[1], 'Initial state', start_time)
+        if verbose:
+            print(f"--- 向量化精确KL算法开始 ---")
+            print(f"初始割边数: {state.cut_size}")
+    fixed_nodes = _resolve_fixed(fixed, state.partition_A, state.partition_B)
+
+    yield from _numpy_kl_passes(adjacency, state, max_passes, _resolve_pass_cutoff(pass_cutoff, len(adjacency)), verbose, fixed_nodes)
+
+
+def kernighan_lin_numpy(
+    G: GraphLike,
+    initial_partition: Tuple[Set[str], Set[str]],
+    max_passes: int = 10,
+    pass_cutoff: Optional[float] = None,
+    verbose: bool = True,
+    fixed: Optional[Tuple[Set[str], Set[str]]] = None
+) -> Tuple[Set[str], Set[str], int, List[Dict], float, Optional[nx.Graph], Optional[nx.Graph]]:
+    """
+    使用向量化的精确KL算法对图进行两路划分（把 kernighan_lin_numpy_passes 运行到底）。
+    划分、割边数与逐轮 history（耗时除外）都与 kl_classic.kernighan_lin_partition 完全相同。
+
+    参数:
+        G (nx.Graph | ArrayGraph): 待划分的图。
+        initial_partition (Tuple[Set[str], Set[str]]): 初始分区 A 和 B。
+        max_passes (int): 最大迭代轮数上限。
+        pass_cutoff (Optional[float]): 轮内提前结束阈值，含义与 kl_classic.kernighan_lin_partition 相同。
+        verbose (bool): 是否打印详细的执行过程信息。
+        fixed (Optional[Tuple[Set[str], Set[str]]]): 固定在A区、B区的节点，含义与 kl_classic.kernighan_lin_partition 相同。
+
+    Returns:
+        (与kl_classic.py的返回接口完全一致)
+    """
+    start_time = time.perf_counter()
+
+    states = kernighan_lin_numpy_passes(G, initial_partition, max_passes, pass_cutoff, verbose, fixed=fixed)
+    initial_state = next(states)
+    initial_graph = partitioned_copy(G, initial_state.partition_A, initial_state.partition_B)
+
+    state = last_state(states, initial_state)
+    final_graph = partitioned_copy(G, state.best_partition_A, state.best_partition_B)
+
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+
+    if verbose:
+        print("\n--- 向量化精确KL算法结束 ---")
+        print(f"最终最小割边数: {state.best_cut_size}")
+        print(f"总运行时间: {execution_time:.6f} 秒")
+
+    return state.best_partition_A, state.best_partition_B, state.best_cut_size, state.history, execution_time, initial_graph, final_graph
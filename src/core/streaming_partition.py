@@ -0,0 +1,212 @@
+# EDA_Circuit_Partitioning_KL/src/core/streaming_partition.py
+
+"""
+streaming_partition.py - 单遍流式两路划分 (Fennel / 线性确定性贪心 LDG)
+该模块在边流上一次性完成划分，不需要构建完整的图：
+1. 边按网表中的顺序到达，同一起点的连续边视为该节点的一条邻接记录
+   （generate_netlists.py 生成的网表按起点排序，每个节点的记录是连续的）。
+2. 每条记录结束时为其起点分配分区：得分 = 连向该分区已分配邻居的权重 - 规模惩罚，
+   且分区大小不超过容量上限；分配后把记录中尚未分配的邻居向该分区“拉近”。
+3. 没有自己记录的节点（其所有边都出现在其他节点的记录中）：若记录起点按名称递增到达，
+   则流越过该节点名称时它的邻居都已分配，立即按同样的得分分配，效果等同于按节点顺序的顶点流；
+   否则在流结束时分配。
+4. 给出全部节点名 (nodes) 时，从未出现在边流中的节点（孤立节点）在流结束后放入较小的分区。
+5. 最后按实际分配的节点数检查容量：声明的节点数大于实际节点数时，流式阶段的容量偏大，
+   较大分区中超出的节点（按“拉向本区的权重 - 拉向另一区的权重”从小到大）移到另一区。
+全部状态为按节点编号存放的分区标记、两个“拉力”数组与待分配节点的最小堆，外加当前一条记录的缓冲，
+即 O(n) 内存，与边数无关。
+规模惩罚：
+    fennel: α·γ·|S|^(γ-1)，γ = 1.5，α = m·2^(γ-1) / n^γ (Tsourakakis et al., 2014)
+    ldg:    得分乘以 (1 - |S| / 容量) (Stanton & Kliot, 2012)
+"""
+
+import math
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .array_graph import GraphLike, adjacency_dict
+
+STREAMING_METHODS = ('ldg', 'fennel')
+FENNEL_GAMMA = 1.5
+
+_UNASSIGNED, _SIDE_A, _SIDE_B = 0, 1, 2
+
+
+class _StreamState:
+    """流式划分的 O(n) 状态：节点编号、分区标记、两侧拉力与两侧大小。"""
+
+    def __init__(self, num_nodes: int, num_edges: int, method: str, imbalance: float):
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.side = bytearray(num_nodes)
+        self.pull = (array('d', bytes(8 * num_nodes)), array('d', bytes(8 * num_nodes)))
+        self.sizes = [0, 0]
+        self.pending: List[str] = []  # 尚未开始记录的节点名（最小堆），仅在记录起点按名称递增时维护
+        self.sorted_stream = True
+        self.num_nodes = num_nodes
+        self.capacity = math.ceil(num_nodes / 2 * (1 + imbalance))
+        self.method = method
+        self.alpha = num_edges * 2 ** (FENNEL_GAMMA - 1) / num_nodes ** FENNEL_GAMMA
+
+    def node_id(self, name: str) -> int:
+        node = self.index.get(name)
+        if node is None:
+            node = len(self.names)
+            if node >= self.num_nodes:
+                raise ValueError(f"实际节点数超过声明的节点数 {self.num_nodes}，请检查网表头部或 num_nodes 参数。")
+            self.index[name] = node
+            self.names.append(name)
+            if self.sorted_stream:
+                heapq.heappush(self.pending, name)
+        return node
+
+    def start_record(self, source_name: str, previous_name: Optional[str]):
+        """新记录开始：记录起点按名称递增时，名称更小且未分配的节点不会再有自己的记录，立即分配。"""
+        if not self.sorted_stream:
+            return
+        if previous_name is not None and source_name < previous_name:
+            self.sorted_stream, self.pending = False, []
+            return
+        while self.pending and self.pending[0] < source_name:
+            node = self.index[heapq.heappop(self.pending)]
+            if self.side[node] == _UNASSIGNED:
+                self.assign(node)
+
+    def _score(self, node: int, s: int) -> float:
+        size = self.sizes[s]
+        if size >= self.capacity:
+            return -math.inf
+        if self.method == 'ldg':
+            return self.pull[s][node] * (1 - size / self.capacity)
+        return self.pull[s][node] - self.alpha * FENNEL_GAMMA * size ** (FENNEL_GAMMA - 1)
+
+    def assign(self, node: int) -> int:
+        """按得分为节点选择分区（得分相同时选较小的分区，再相同时选A区），返回分区下标 0/1。"""
+        scores = (self._score(node, 0), self._score(node, 1))
+        if scores[0] != scores[1]:
+            s = 0 if scores[0] > scores[1] else 1
+        else:
+            s = 0 if self.sizes[0] <= self.sizes[1] else 1
+        self.side[node] = _SIDE_A + s
+        self.sizes[s] += 1
+        return s
+
+    def add_pull(self, node: int, neighbor_side: int, weight: float):
+        if self.side[node] == _UNASSIGNED:
+            self.pull[neighbor_side - _SIDE_A][node] += weight
+
+    def assign_to_smaller(self, node: int):
+        """把没有任何已知邻居的节点放入较小的分区（大小相同时放入A区）。"""
+        s = 0 if self.sizes[0] <= self.sizes[1] else 1
+        self.side[node] = _SIDE_A + s
+        self.sizes[s] += 1
+
+    def rebalance(self, imbalance: float):
+        """按实际分配的节点数重新计算容量，把较大分区中超出容量的节点移到另一区。"""
+        capacity = math.ceil(len(self.names) / 2 * (1 + imbalance))
+        heavy = 0 if self.sizes[0] >= self.sizes[1] else 1
+        excess = self.sizes[heavy] - capacity
+        if excess <= 0:
+            return
+        own, other = self.pull[heavy], self.pull[1 - heavy]
+        members = (node for node in range(len(self.names)) if self.side[node] == _SIDE_A + heavy)
+        for node in heapq.nsmallest(excess, members, key=lambda node: own[node] - other[node]):
+            self.side[node] = _SIDE_A + 1 - heavy
+        self.sizes[heavy] -= excess
+        self.sizes[1 - heavy] += excess
+
+
+def streaming_partition(
+    edges: Iterable[Tuple[str, str, float]],
+    num_nodes: int,
+    num_edges: Optional[int] = None,
+    method: str = 'ldg',
+    imbalance: float = 0.0,
+    nodes: Optional[Iterable[str]] = None
+) -> Tuple[Set[str], Set[str]]:
+    """
+    单遍消费边流并给出两路划分，结果可直接作为 KL 等引擎的 initial_partition。
+
+    参数:
+        edges (Iterable[Tuple[str, str, float]]): 依次到达的 (节点A, 节点B, 权重)，只被遍历一次。
+        num_nodes (int): 节点总数（用于分配数组与确定容量上限），不得小于实际节点数。
+        num_edges (Optional[int]): 边数，用于 fennel 的 α；未知时按 num_nodes 估计（平均度为2）。
+        method (str): 'ldg' 或 'fennel'（fennel 的规模惩罚在小图上偏强，会过早地把相邻节点分开）。
+        imbalance (float): 允许的不平衡度，每个分区最多容纳 ceil(n/2·(1+imbalance)) 个节点，
+            n 为实际分配的节点数；为0时两区大小至多相差1。
+        nodes (Optional[Iterable[str]]): 全部节点名；其中从未出现在边流中的节点在流结束后放入较小的分区。
+            未给出时结果只包含边流中出现过的节点。
+
+    Returns:
+        Tuple[Set[str], Set[str]]: 分区A和分区B的节点集合。
+    """
+    if method not in STREAMING_METHODS:
+        raise ValueError(f"未知的流式划分方法 '{method}'，可选: {list(STREAMING_METHODS)}")
+    if num_nodes <= 0:
+        raise ValueError("流式划分需要正的节点总数 num_nodes。")
+
+    state = _StreamState(num_nodes, num_edges if num_edges else num_nodes, method, imbalance)
+    record_source: Optional[int] = None
+    record: List[Tuple[int, float]] = []  # 当前记录中尚未分配的邻居
+
+    def close_record():
+        """记录结束：分配起点，并把记录中尚未分配的邻居拉向起点所在分区。"""
+        if record_source is None:
+            return
+        if state.side[record_source] == _UNASSIGNED:
+            state.assign(record_source)
+        source_side = state.side[record_source]
+        for neighbor, weight in record:
+            state.add_pull(neighbor, source_side, weight)
+        record.clear()
+
+    # 逐边处理是热点路径，这里直接操作局部变量而不经过方法调用
+    index, node_id, side, pull = state.index, state.node_id, state.side, state.pull
+    for u_name, v_name, weight in edges:
+        u = index.get(u_name)
+        if u is None:
+            u = node_id(u_name)
+        v = index.get(v_name)
+        if v is None:
+            v = node_id(v_name)
+        if u != record_source:
+            close_record()
+            state.start_record(u_name, state.names[record_source] if record_source is not None else None)
+            record_source = u
+        side_u, side_v = side[u], side[v]
+        if side_v and not side_u:
+            pull[side_v - _SIDE_A][u] += weight
+        if not side_u:
+            record.append((v, weight))
+        elif not side_v:
+            pull[side_u - _SIDE_A][v] += weight
+    close_record()
+
+    # 其余尚未分配的节点（只作为终点出现过）
+    for node in range(len(state.names)):
+        if state.side[node] == _UNASSIGNED:
+            state.assign(node)
+    # 从未出现在边流中的节点
+    for name in nodes or ():
+        if name not in index:
+            state.assign_to_smaller(node_id(name))
+    state.rebalance(imbalance)
+
+    partition_A = {state.names[i] for i in range(len(state.names)) if state.side[i] == _SIDE_A}
+    partition_B = {state.names[i] for i in range(len(state.names)) if state.side[i] == _SIDE_B}
+    return partition_A, partition_B
+
+
+def _create_streaming_initial_partition(G: GraphLike) -> Tuple[Set[str], Set[str]]:
+    """
+    以内存中的图为边流运行 LDG 流式划分：按节点名称顺序逐条输出邻接记录，每条边只在较小端点的记录中出现一次，
+    与 generate_netlists.py 写出的网表顺序相同，因此结果与直接流式读取该网表一致
+    （孤立节点不出现在网表的边中，这里在流结束后把它们放入较小的分区）。
+    """
+    adjacency = adjacency_dict(G)
+    order = {u: i for i, u in enumerate(sorted(adjacency))}
+    num_edges = sum(1 for u, neighbors in adjacency.items() for v in neighbors if order[u] <= order[v])
+    edges = ((u, v, weight) for u in sorted(adjacency)
+             for v, weight in sorted(adjacency[u].items()) if order[u] <= order[v])
+    return streaming_partition(edges, len(adjacency), num_edges, 'ldg', nodes=sorted(adjacency))
@@ -0,0 +1,70 @@
+# EDA_Circuit_Partitioning_KL/src/utils/anytime_analysis.py
+
+"""
+anytime_analysis.py - 随时间变化的划分质量分析
+各划分算法的 history 中每一项都带有 'elapsed'（自开始起的耗时，秒）和 'cut_size'。
+该模块据此计算：
+1. anytime 曲线：任意时刻为止找到的最小割边数，以及多次运行的中位数曲线。
+2. time-to-target：首次达到目标割边数所需的时间及其经验分布。
+从而可以按“单位时间内的划分质量”而非仅按最终结果比较算法和 max_passes 设置。
+"""
+
+import math
+import warnings
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+
+
+def anytime_samples(history: List[Dict]) -> List[Tuple[float, float]]:
+    """
+    将一次运行的 history 转换为 (耗时, 截至此时的最小割边数) 序列。
+
+    Returns:
+        List[Tuple[float, float]]: 按耗时递增、割边数单调不增的采样点。
+    """
+    samples, best = [], math.inf
+    for entry in history:
+        best = min(best, entry['cut_size'])
+        samples.append((entry['elapsed'], best))
+    return samples
+
+
+def time_to_target(history: List[Dict], target: float) -> float:
+    """返回一次运行首次达到 cut_size <= target 的耗时；始终未达到时返回 inf。"""
+    for elapsed, best in anytime_samples(history):
+        if best <= target:
+            return elapsed
+    return math.inf
+
+
+def anytime_curve(history: List[Dict], time_grid: Sequence[float]) -> np.ndarray:
+    """
+    在给定的时间网格上对一次运行的 anytime 曲线取值（阶梯函数）。
+    早于初始状态得出的时刻尚无可用划分，取值为 NaN。
+    """
+    samples = anytime_samples(history)
+    times = np.array([t for t, _ in samples], dtype=float)
+    cuts = np.array([c for _, c in samples], dtype=float)
+    pos = np.searchsorted(times, np.asarray(time_grid, dtype=float), side='right') - 1
+    return np.where(pos >= 0, cuts[np.maximum(pos, 0)], np.nan)
+
+
+def median_anytime_curve(histories: List[List[Dict]], time_grid: Sequence[float]) -> np.ndarray:
+    """多次运行的 anytime 曲线在每个时刻的中位数（忽略尚未得出初始划分的运行）。"""
+    curves = np.vstack([anytime_curve(history, time_grid) for history in histories])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # 某时刻所有运行均无划分时结果为 NaN
+        return np.nanmedian(curves, axis=0)
+
+
+def time_to_target_cdf(times: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    time-to-target 的经验累积分布。
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 达到目标的耗时（升序）及对应的已达标运行比例
+        （分母为全部运行数，未达标的运行不计入分子）。
+    """
+    finite = np.sort(np.array([t for t in times if math.isfinite(t)], dtype=float))
+    fractions = np.arange(1, len(finite) + 1) / max(1, len(times))
+    return finite, fractions
@@ -0,0 +1,317 @@
+# EDA_Circuit_Partitioning_KL/src/utils/distributed_sweep.py
+
+"""
+distributed_sweep.py - 跨机器的分布式参数扫描
+该模块将实验拆分为协调者(coordinator)与工作进程(worker)两部分，二者通过
+multiprocessing.managers 在 TCP 上通信：
+1. 协调者把扫描定义 (算法 × 网表 × 随机种子 × max_passes) 展开为任务列表，并对外提供任务服务。
+2. 工作进程连接协调者，循环领取任务、运行 src/core 中的划分算法并回传结果，
+   同时由后台线程定期发送心跳。
+3. 某个工作进程的心跳超时后，协调者把它正在执行的任务重新放回待分配队列，交给其他工作进程。
+工作进程使用 parse_netlist_to_arrays 读取网表，不依赖 NetworkX。
+"""
+
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import BaseManager
+from typing import Dict, List, Optional, Tuple
+
+from ..core.base_partitioning import simple_greedy_partition
+from ..core.kl_classic import kernighan_lin_partition
+from ..core.kl_improvements import kernighan_lin_bfs_init, create_initial_partition
+from .netlist_parser import parse_netlist_to_arrays, netlist_name
+from .profiling import RunProfiler, profile_section
+
+DEFAULT_AUTHKEY = b'eda-kl-sweep'
+
+# 扫描可用的算法: 名称 -> (划分函数, 是否需要外部初始划分, 轮数上限参数名)
+SWEEP_ALGORITHMS = {
+    'greedy': (simple_greedy_partition, True, 'max_iterations'),
+    'kl_random': (kernighan_lin_partition, True, 'max_passes'),
+    'kl_bfs': (kernighan_lin_bfs_init, False, 'max_passes'),
+}
+
+
+def expand_sweep(sweep: Dict) -> List[Dict]:
+    """
+    将扫描定义展开为任务列表。
+
+    参数:
+        sweep (Dict): 包含 'algorithms'、'netlists'、'seeds' 与可选 'max_passes' (默认 [10]) 的字典；
+            'seeds' 可以是种子列表，也可以是表示 range(seeds) 的整数。
+
+    Returns:
+        List[Dict]: 每个任务包含 task_id、algorithm、netlist、seed、max_passes。
+    """
+    unknown = [name for name in sweep['algorithms'] if name not in SWEEP_ALGORITHMS]
+    if unknown:
+        raise ValueError(f"未知的算法 {unknown}，可选: {list(SWEEP_ALGORITHMS)}")
+    seeds = sweep['seeds']
+    seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+
+    tasks = []
+    for algorithm in sweep['algorithms']:
+        for netlist in sweep['netlists']:
+            for max_passes in sweep.get('max_passes', [10]):
+                for seed in seeds:
+                    tasks.append({'task_id': len(tasks), 'algorithm': algorithm, 'netlist': netlist,
+                                  'seed': seed, 'max_passes': max_passes})
+    return tasks
+
+
+def execute_task(task: Dict, graph_cache: Optional[Dict] = None) -> Dict:
+    """
+    以任务中的随机种子运行一次划分算法（随机性与 run_experiments.py 的单次运行一致）。
+
+    Returns:
+        Dict: initial_cut、final_cut、exec_time、passes。
+    """
+    graph_cache = {} if graph_cache is None else graph_cache
+    if task['netlist'] not in graph_cache:
+        graph_cache[task['netlist']] = parse_netlist_to_arrays(task['netlist'])
+    graph = graph_cache[task['netlist']]
+    if graph is None:
+        raise ValueError(f"无法读取网表文件 '{task['netlist']}'。")
+
+    func, requires_initial_partition, limit_name = SWEEP_ALGORITHMS[task['algorithm']]
+    random.seed(task['seed'])
+    if requires_initial_partition:
+        initial_partition = create_initial_partition(graph, 'random')
+        _, _, final_cut, history, exec_time, _, _ = func(
+            graph, initial_partition, verbose=False, **{limit_name: task['max_passes']})
+    else:
+        _, _, final_cut, history, exec_time, _, _ = func(
+            graph, start_node=random.choice(list(graph.nodes)), verbose=False, **{limit_name: task['max_passes']})
+    return {'initial_cut': history[0]['cut_size'], 'final_cut': final_cut,
+            'exec_time': exec_time, 'passes': len(history) - 1}
+
+
+class SweepService:
+    """
+    协调者进程内的任务服务，工作进程通过代理调用其方法（各方法在服务端线程中执行，由锁保护）。
+    """
+
+    def __init__(self, tasks: List[Dict], heartbeat_timeout: float = 10.0):
+        self._lock = threading.Lock()
+        self._tasks = {task['task_id']: task for task in tasks}
+        self._pending = deque(self._tasks)
+        self._in_flight: Dict[int, str] = {}      # task_id -> worker_id
+        self._last_seen: Dict[str, float] = {}    # worker_id -> 最近一次心跳时间
+        self._results: Dict[int, Dict] = {}
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reassigned = 0
+
+    def heartbeat(self, worker_id: str):
+        with self._lock:
+            self._last_seen[worker_id] = time.monotonic()
+
+    def get_task(self, worker_id: str) -> Optional[Dict]:
+        """
+        为工作进程分配下一个任务。
+
+        Returns:
+            Optional[Dict]: 任务字典；暂时没有可分配任务（其余任务仍在执行）时返回空字典；
+            全部任务完成时返回 None。
+        """
+        with self._lock:
+            self._last_seen[worker_id] = time.monotonic()
+            self._reassign_expired_locked()
+            while self._pending:
+                task_id = self._pending.popleft()
+                if task_id not in self._results:
+                    self._in_flight[task_id] = worker_id
+                    return self._tasks[task_id]
+            return None if len(self._results) == len(self._tasks) else {}
+
+    def submit_result(self, worker_id: str, task_id: int, result: Dict):
+        """接收任务结果；任务被重新分配后可能收到重复结果，只保留第一个。"""
+        with self._lock:
+            self._last_seen[worker_id] = time.monotonic()
+            if task_id not in self._results:
+                self._results[task_id] = dict(result, worker=worker_id)
+            self._in_flight.pop(task_id, None)
+
+    def reassign_expired(self) -> int:
+        with self._lock:
+            return self._reassign_expired_locked()
+
+    def _reassign_expired_locked(self) -> int:
+        """把心跳超时的工作进程手中的任务放回待分配队列，返回重新分配的任务数。"""
+        now = time.monotonic()
+        expired = [task_id for task_id, worker_id in self._in_flight.items()
+                   if now - self._last_seen.get(worker_id, 0.0) > self.heartbeat_timeout]
+        for task_id in expired:
+            del self._in_flight[task_id]
+            self._pending.appendleft(task_id)
+        self.reassigned += len(expired)
+        return len(expired)
+
+    def progress(self) -> Tuple[int, int]:
+        """返回 (已完成任务数, 任务总数)。"""
+        with self._lock:
+            return len(self._results), len(self._tasks)
+
+    def results(self) -> Dict[int, Dict]:
+        with self._lock:
+            return dict(self._results)
+
+
+class _WorkerManager(BaseManager):
+    """工作进程一侧的管理器，只需知道服务名称。"""
+
+
+_WorkerManager.register('sweep_service')
+
+
+class SweepCoordinator:
+    """
+    在本进程中启动 TCP 任务服务，并等待全部任务完成。
+
+    参数:
+        tasks (List[Dict]): expand_sweep 生成的任务列表。
+        address (Tuple[str, int]): 监听地址，端口为0时由系统分配（实际地址见 self.address）。
+        authkey (bytes): 工作进程连接时使用的认证密钥。
+        heartbeat_timeout (float): 超过该秒数没有心跳的工作进程被视为失联。
+    """
+
+    def __init__(
+        self,
+        tasks: List[Dict],
+        address: Tuple[str, int] = ('127.0.0.1', 0),
+        authkey: bytes = DEFAULT_AUTHKEY,
+        heartbeat_timeout: float = 10.0
+    ):
+        self.service = SweepService(tasks, heartbeat_timeout)
+        # 每个协调者使用独立的管理器类，注册的服务对象互不干扰
+        manager_cls = type('_CoordinatorManager', (BaseManager,), {})
+        manager_cls.register('sweep_service', callable=lambda: self.service)
+        self._server = manager_cls(address=address, authkey=authkey).get_server()
+        self.address = self._server.address
+        self._server.stop_event = threading.Event()  # 连接处理线程据此退出
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self):
+        """接受工作进程的连接，每个连接由独立线程处理（不使用 Server.serve_forever，以便在 close 时干净退出）。"""
+        while not self._server.stop_event.is_set():
+            try:
+                conn = self._server.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue
+            threading.Thread(target=self._server.handle_request, args=(conn,), daemon=True).start()
+
+    def run(self, poll_interval: float = 0.2, on_result=None, workers_alive=None, verbose: bool = True) -> List[Dict]:
+        """
+        阻塞直到全部任务完成，期间定期回收失联工作进程的任务。
+
+        参数:
+            poll_interval (float): 检查进度的间隔（秒）。
+            on_result (Optional[Callable[[Dict, Dict], None]]): 每收到一个新结果时以 (任务, 结果) 调用，
+                在调用 run 的线程中执行（例如写入 ExperimentStore）。
+            workers_alive (Optional[Callable[[], bool]]): 由调用者启动工作进程时，用于检查是否仍有工作进程存活；
+                全部退出而任务未完成时抛出 RuntimeError，而不是无限等待新的工作进程。
+            verbose (bool): 是否打印进度。
+
+        Returns:
+            List[Dict]: 按 task_id 排列的结果，每项为任务字段与结果字段的合并。
+        """
+        reported = set()
+        start_time = time.perf_counter()
+        while True:
+            self.service.reassign_expired()
+            results = self.service.results()
+            for task_id in sorted(set(results) - reported):
+                reported.add(task_id)
+                if on_result is not None:
+                    on_result(self.service._tasks[task_id], results[task_id])
+            done, total = self.service.progress()
+            if done == total:
+                break
+            if workers_alive is not None and not workers_alive():
+                raise RuntimeError(f"所有工作进程均已退出，仍有 {total - done} 个任务未完成。")
+            time.sleep(poll_interval)
+
+        if verbose:
+            elapsed = time.perf_counter() - start_time
+            print(f"扫描完成: {total} 个任务, 用时 {elapsed:.2f} 秒, 重新分配 {self.service.reassigned} 次。")
+        results = self.service.results()
+        return [dict(self.service._tasks[task_id], **results[task_id]) for task_id in sorted(results)]
+
+    def close(self):
+        """停止 TCP 服务。"""
+        self._server.stop_event.set()
+        try:
+            # 阻塞中的 accept 不会因为关闭监听套接字而返回，先发起一次连接将其唤醒
+            socket.create_connection(self.address, timeout=1.0).close()
+        except OSError:
+            pass
+        self._thread.join(timeout=1.0)
+        self._server.listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _heartbeat_loop(service, worker_id: str, interval: float, stop: threading.Event):
+    """后台心跳线程：在任务执行期间也定期告知协调者本进程仍然存活。"""
+    while not stop.wait(interval):
+        try:
+            service.heartbeat(worker_id)
+        except (OSError, EOFError):
+            return
+
+
+def run_worker(
+    address: Tuple[str, int],
+    authkey: bytes = DEFAULT_AUTHKEY,
+    worker_id: Optional[str] = None,
+    heartbeat_interval: float = 2.0,
+    idle_wait: float = 0.2,
+    profiler: Optional[RunProfiler] = None
+) -> int:
+    """
+    连接协调者并循环执行任务，直到全部任务完成或协调者关闭。
+    给出 profiler 时按 (算法, 网表) 分别剖析任务的执行，并在结果中以 'profile' 标明剖析模式
+    （剖析会拖慢运行，协调者据此把这些结果与正常运行分开记录）；剖析文件由调用者写出。
+
+    Returns:
+        int: 本工作进程完成的任务数。
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    manager = _WorkerManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    service = manager.sweep_service()
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat_loop, args=(service, worker_id, heartbeat_interval, stop), daemon=True)
+    heartbeat.start()
+
+    graph_cache, completed = {}, 0
+    try:
+        while True:
+            task = service.get_task(worker_id)
+            if task is None:
+                break
+            if not task:
+                time.sleep(idle_wait)
+                continue
+            with profile_section(profiler, f"{task['algorithm']}_{netlist_name(task['netlist'])}"):
+                result = execute_task(task, graph_cache)
+            if profiler is not None:
+                result['profile'] = profiler.mode
+            service.submit_result(worker_id, task['task_id'], result)
+            completed += 1
+    except (OSError, EOFError):
+        pass  # 协调者已关闭
+    finally:
+        stop.set()
+    return completed
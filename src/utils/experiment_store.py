@@ -0,0 +1,174 @@
+# EDA_Circuit_Partitioning_KL/src/utils/experiment_store.py
+
+"""
+experiment_store.py - 基于 SQLite 的可续跑实验记录
+该模块将每一次独立运行（算法、网表哈希、随机种子、参数、初始/最终割边数、运行时间、轮数）
+在完成时立即写入本地 SQLite 数据库，使大规模实验可以中断后继续：
+1. 重新启动时，已完成的 (算法, 网表, 参数, 种子) 组合会被跳过。
+2. 汇总指标直接由数据库中的数值记录计算，无需解析格式化后的CSV字符串，
+   并给出平均减少率与平均运行时间的置信区间半宽，供自适应运行次数判断是否收敛。
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    algorithm    TEXT    NOT NULL,
+    netlist_hash TEXT    NOT NULL,
+    params       TEXT    NOT NULL,
+    seed         INTEGER NOT NULL,
+    netlist      TEXT,
+    initial_cut  REAL    NOT NULL,
+    final_cut    REAL    NOT NULL,
+    exec_time    REAL    NOT NULL,
+    passes       INTEGER,
+    created_at   TEXT    DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (algorithm, netlist_hash, params, seed)
+)
+"""
+
+
+def netlist_hash(file_path: str) -> str:
+    """计算网表文件内容的 SHA-1 哈希，文件内容变化后旧的运行记录不会被误用。"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def confidence_half_width(values: List[float], level: float = 0.95) -> float:
+    """
+    基于 t 分布计算样本均值置信区间的半宽。
+
+    参数:
+        values (List[float]): 样本值。
+        level (float): 置信水平，例如 0.95。
+
+    Returns:
+        float: 半宽；样本数少于2时无法估计，返回 inf。
+    """
+    n = len(values)
+    if n < 2:
+        return math.inf
+    from scipy.stats import t
+
+    mean = sum(values) / n
+    sample_std = math.sqrt(sum((x - mean) ** 2 for x in values) / (n - 1))
+    return float(t.ppf((1 + level) / 2, n - 1)) * sample_std / math.sqrt(n)
+
+
+def _encode_params(params: Optional[Dict]) -> str:
+    """将参数字典编码为键有序的JSON字符串，作为主键的一部分。"""
+    return json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+
+
+class ExperimentStore:
+    """
+    单次运行粒度的实验记录库。
+
+    每条记录以 (algorithm, netlist_hash, params, seed) 为主键；
+    record_run 在每次运行完成后立即提交，进程崩溃最多丢失正在进行的那一次运行。
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def completed_seeds(self, algorithm: str, netlist_digest: str, params: Optional[Dict] = None) -> Set[int]:
+        """返回指定 (算法, 网表, 参数) 组合下已完成的随机种子集合。"""
+        rows = self._conn.execute(
+            "SELECT seed FROM runs WHERE algorithm = ? AND netlist_hash = ? AND params = ?",
+            (algorithm, netlist_digest, _encode_params(params))
+        )
+        return {seed for (seed,) in rows}
+
+    def record_run(
+        self,
+        algorithm: str,
+        netlist_digest: str,
+        seed: int,
+        initial_cut: float,
+        final_cut: float,
+        exec_time: float,
+        passes: Optional[int] = None,
+        params: Optional[Dict] = None,
+        netlist: Optional[str] = None
+    ):
+        """写入（或覆盖）一次运行的结果并立即提交。"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO runs "
+            "(algorithm, netlist_hash, params, seed, netlist, initial_cut, final_cut, exec_time, passes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (algorithm, netlist_digest, _encode_params(params), int(seed), netlist,
+             float(initial_cut), float(final_cut), float(exec_time), passes)
+        )
+        self._conn.commit()
+
+    def fetch_runs(
+        self,
+        algorithm: str,
+        netlist_digest: str,
+        params: Optional[Dict] = None,
+        seeds: Optional[Iterable[int]] = None
+    ) -> List[Dict]:
+        """按种子顺序返回运行记录；给出 seeds 时只返回这些种子的记录。"""
+        rows = self._conn.execute(
+            "SELECT seed, initial_cut, final_cut, exec_time, passes FROM runs "
+            "WHERE algorithm = ? AND netlist_hash = ? AND params = ? ORDER BY seed",
+            (algorithm, netlist_digest, _encode_params(params))
+        )
+        wanted = None if seeds is None else set(seeds)
+        keys = ('seed', 'initial_cut', 'final_cut', 'exec_time', 'passes')
+        return [dict(zip(keys, row)) for row in rows if wanted is None or row[0] in wanted]
+
+    def aggregate(
+        self,
+        algorithm: str,
+        netlist_digest: str,
+        params: Optional[Dict] = None,
+        seeds: Optional[Iterable[int]] = None,
+        level: float = 0.95
+    ) -> Optional[Dict[str, float]]:
+        """
+        由数据库中的运行记录计算汇总指标（与 run_experiments.py 的报告行一一对应）。
+
+        Returns:
+            Optional[Dict[str, float]]: 包含最大/平均割边减少率、平均运行时间、
+            最终割边数标准差、运行次数，以及平均减少率与平均运行时间在 level 置信水平下的
+            置信区间半宽；没有任何记录时返回 None。
+        """
+        runs = self.fetch_runs(algorithm, netlist_digest, params, seeds)
+        if not runs:
+            return None
+        rates = [
+            (r['initial_cut'] - r['final_cut']) / r['initial_cut'] if r['initial_cut'] > 0 else 0.0
+            for r in runs
+        ]
+        times = [r['exec_time'] for r in runs]
+        finals = [r['final_cut'] for r in runs]
+        mean_final = sum(finals) / len(finals)
+        return {
+            'Max Cut-edge Reduction Rate': max(rates),
+            'Average Cut-edge Reduction Rate': sum(rates) / len(rates),
+            'Average Algorithm Runtime (s)': sum(times) / len(times),
+            'Result Stability (Std Dev)': (sum((x - mean_final) ** 2 for x in finals) / len(finals)) ** 0.5,
+            'Runs': len(runs),
+            'Reduction Rate CI (±)': confidence_half_width(rates, level),
+            'Runtime CI (s, ±)': confidence_half_width(times, level),
+        }
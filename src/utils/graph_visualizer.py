@@ -4,12 +4,115 @@ graph_visualizer.py - 图可视化工具 (增强版)
 新增功能可以根据节点的分区属性进行着色，并高亮割边。
 改进：可调整节点大小和标签字号，并使用自定义布局使分区更清晰。
 新功能：支持 'spring' 和 'bipartite' 两种布局样式。
+大图模式：节点数超过阈值时改用细节层次(LOD)渲染——节点按密度分箱聚合显示，
+割边以单个(可抽样的) LineCollection 绘制，不绘制标签，并栅格化输出，
+使十万节点规模的划分结果也能在数秒内完成绘制。
+布局缓存：只取决于拓扑的布局（spring 布局与大图的近似谱布局）可通过 layout_cache
+在多次绘制间复用——同一网表的布局可被所有算法的划分结果共用；bipartite 布局取决于分区且代价很低，不缓存。
+缓存可用 load_layout_cache / save_layout_cache 以 JSON 格式持久化到磁盘。
 """
 
+import os
+import json
+import hashlib
+import tempfile
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Optional, Dict, Tuple
+from matplotlib.collections import LineCollection
+from typing import Optional, Dict, Tuple, List
+
+from ..core.array_graph import graph_to_arrays, ArrayGraph
+
+CACHED_LAYOUT_STYLES = ('spring',)  # 只取决于拓扑、可在不同划分结果之间复用的布局样式
+
+def _graph_fingerprint(graph: nx.Graph, layout_style: str) -> str:
+    """
+    计算布局缓存的键：只由布局样式与图的拓扑（含边权重，spring 布局会用到）决定，与节点的分区属性无关。
+    """
+    digest = hashlib.sha1()
+    digest.update(layout_style.encode())
+    for node in sorted(map(str, graph.nodes())):
+        digest.update(node.encode() + b'\0')
+    edges = sorted(
+        tuple(sorted((str(u), str(v)))) + (str(data.get('weight', 1)),)
+        for u, v, data in graph.edges(data=True)
+    )
+    for edge in edges:
+        digest.update('\t'.join(edge).encode() + b'\n')
+    return f"{layout_style}:{graph.number_of_nodes()}:{digest.hexdigest()}"
+
+def load_layout_cache(path: str) -> Dict[str, Dict[str, List[float]]]:
+    """
+    从磁盘加载 JSON 格式的布局缓存 {缓存键: {节点名: [x, y]}}；文件不存在、损坏或结构不符时返回空缓存。
+    缓存文件只包含数据，不会执行任何代码。
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict) or not all(
+            isinstance(layout, dict) and all(
+                isinstance(xy, list) and len(xy) == 2 and all(isinstance(c, (int, float)) for c in xy)
+                for xy in layout.values()
+            )
+            for layout in cache.values()
+        ):
+            raise ValueError("缓存结构应为 {缓存键: {节点名: [x, y]}}")
+        return cache
+    except Exception as e:
+        print(f"警告：无法读取布局缓存 '{path}' ({e})，将重新计算布局。")
+        return {}
+
+def save_layout_cache(cache: Dict[str, Dict[str, List[float]]], path: str):
+    """
+    将布局缓存以 JSON 格式写入磁盘：先写入同目录下本进程独有的临时文件再原子替换，
+    避免中断时留下半个文件，也避免多个进程同时保存时相互覆盖临时文件。
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _cache_key(graph: nx.Graph, layout_style: str, layout_cache: Optional[Dict], prefix: str = '') -> Optional[str]:
+    """返回可缓存布局的缓存键；未提供缓存或布局样式不可复用时返回 None。"""
+    if layout_cache is None or layout_style not in CACHED_LAYOUT_STYLES:
+        return None
+    return prefix + _graph_fingerprint(graph, layout_style)
+
+def compute_layout(
+    graph: nx.Graph,
+    layout_style: str = 'spring',
+    layout_cache: Optional[Dict[str, Dict[str, List[float]]]] = None,
+    large_graph_threshold: int = 2000
+) -> Dict:
+    """
+    返回节点坐标 {节点: (x, y)}，与 visualize_partitioned_graph 绘图时使用的布局相同；
+    可用于预先计算布局并写入 layout_cache（如在分发并行绘图任务之前）。
+    """
+    if graph.number_of_nodes() > large_graph_threshold:
+        ag = graph_to_arrays(graph)
+        is_A = np.array([graph.nodes[node].get('partition') == 'A' for node in ag.nodes], dtype=bool)
+        return dict(zip(ag.nodes, map(tuple, _large_layout(graph, ag, is_A, layout_style, layout_cache))))
+
+    cache_key = _cache_key(graph, layout_style, layout_cache)
+    if cache_key in (layout_cache or {}):
+        cached = layout_cache[cache_key]
+        return {node: tuple(cached[str(node)]) for node in graph.nodes()}
+    if layout_style == 'bipartite':
+        pos = _create_bipartite_layout(graph)
+    else:  # 默认为 spring 布局
+        pos = nx.spring_layout(graph, seed=42)
+    if cache_key is not None:
+        layout_cache[cache_key] = {str(node): [float(x), float(y)] for node, (x, y) in pos.items()}
+    return pos
 
 def _create_bipartite_layout(graph: nx.Graph) -> Dict[str, Tuple[float, float]]:
     """
@@ -34,24 +137,170 @@ def _create_bipartite_layout(graph: nx.Graph) -> Dict[str, Tuple[float, float]]:
         
     return pos
 
+def _create_fast_layout(ag: ArrayGraph, seed: int = 42, maxiter: int = 100) -> np.ndarray:
+    """
+    大图使用的近似谱布局：以拉普拉斯矩阵前两个非平凡特征向量(LOBPCG，迭代次数受限)为坐标。
+    代价与边数近似线性，取代二次复杂度的 spring 布局。
+    孤立节点（如悬空单元）不参与特征分解（其度为0，会使预条件矩阵病态），均匀放在布局外侧的圆环上。
+    """
+    import warnings
+    import scipy.sparse as sp
+    from scipy.sparse.linalg import lobpcg
+
+    n = len(ag.nodes)
+    rng = np.random.default_rng(seed)
+    W = sp.csr_matrix((ag.weights.astype(np.float64), ag.indices, ag.indptr), shape=(n, n))
+    degrees = np.asarray(W.sum(axis=1)).ravel()
+    active = np.flatnonzero(degrees > 0)
+    isolated = np.flatnonzero(degrees <= 0)
+    pos = np.empty((n, 2))
+
+    k = len(active)
+    if k >= 8:
+        W_active = W[active][:, active]
+        L = sp.diags(degrees[active]) - W_active
+        Y = np.ones((k, 1)) / np.sqrt(k)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            _, vectors = lobpcg(L, rng.standard_normal((k, 2)), M=sp.diags(1.0 / degrees[active]),
+                                Y=Y, tol=1e-3, maxiter=maxiter, largest=False)
+        scale = np.abs(vectors).max(axis=0)
+        pos[active] = vectors / np.where(scale > 0, scale, 1) + rng.normal(scale=1e-3, size=(k, 2))
+    else:
+        pos[active] = rng.uniform(-1, 1, size=(k, 2))
+
+    angles = rng.uniform(0, 2 * np.pi, size=len(isolated))
+    pos[isolated] = 1.15 * np.column_stack([np.cos(angles), np.sin(angles)])
+    return pos
+
+def _create_large_bipartite_layout(is_A: np.ndarray, seed: int = 42) -> np.ndarray:
+    """大图的左右两列布局：列内按顺序纵向排列，并加入横向抖动以便密度分箱。"""
+    rng = np.random.default_rng(seed)
+    pos = np.empty((len(is_A), 2))
+    for mask, x in ((is_A, -1.0), (~is_A, 1.0)):
+        count = int(mask.sum())
+        pos[mask, 0] = x + rng.uniform(-0.4, 0.4, size=count)
+        pos[mask, 1] = np.linspace(1, 0, count) if count else []
+    return pos
+
+def _large_layout(
+    graph: nx.Graph,
+    ag: ArrayGraph,
+    is_A: np.ndarray,
+    layout_style: str,
+    layout_cache: Optional[Dict[str, Dict[str, List[float]]]]
+) -> np.ndarray:
+    """大图的节点坐标数组（按 ag.nodes 顺序）；近似谱布局只取决于拓扑，可以缓存。"""
+    cache_key = _cache_key(graph, layout_style, layout_cache, prefix='lod-')
+    if cache_key in (layout_cache or {}):
+        cached = layout_cache[cache_key]
+        return np.array([cached[str(node)] for node in ag.nodes])
+    if layout_style == 'bipartite':
+        return _create_large_bipartite_layout(is_A)
+    pos = _create_fast_layout(ag)
+    if cache_key is not None:
+        layout_cache[cache_key] = {str(node): [float(x), float(y)] for node, (x, y) in zip(ag.nodes, pos)}
+    return pos
+
+def _sample_segments(pos: np.ndarray, u: np.ndarray, v: np.ndarray, max_edges: int, rng) -> np.ndarray:
+    """将边转换为线段数组，超过 max_edges 时随机抽样。"""
+    if len(u) > max_edges:
+        keep = rng.choice(len(u), size=max_edges, replace=False)
+        u, v = u[keep], v[keep]
+    return np.stack([pos[u], pos[v]], axis=1)
+
+def _draw_large_partitioned_graph(
+    graph: nx.Graph,
+    ax: plt.Axes,
+    title: str,
+    layout_style: str,
+    layout_cache: Optional[Dict[str, Dict]] = None,
+    max_cut_edges: int = 20000,
+    max_internal_edges: int = 5000,
+    gridsize: int = 60
+):
+    """
+    大图的细节层次(LOD)渲染：
+    1. 节点按分区分别做六边形密度分箱 (hexbin)，不逐个绘制节点与标签；
+    2. 割边用一个 LineCollection 绘制，超过 max_cut_edges 条时随机抽样；
+    3. 内部边只抽样 max_internal_edges 条作为淡色背景；
+    4. 所有图元栅格化，矢量输出的文件大小与节点数无关。
+    """
+    rng = np.random.default_rng(42)
+    ag = graph_to_arrays(graph)
+    partitions = [graph.nodes[node].get('partition') for node in ag.nodes]
+    has_partition = any(p is not None for p in partitions)
+    is_A = np.array([p == 'A' for p in partitions], dtype=bool)
+
+    pos = _large_layout(graph, ag, is_A, layout_style, layout_cache)
+
+    rows = np.repeat(np.arange(len(ag.nodes)), np.diff(ag.indptr))
+    upper = rows < ag.indices  # 每条无向边只取一次
+    u, v = rows[upper], ag.indices[upper]
+    if has_partition:
+        side = np.array([{'A': 0, 'B': 1}.get(p, -1) for p in partitions])
+        is_cut = (side[u] != side[v]) | (side[u] < 0)
+    else:
+        is_cut = np.zeros(len(u), dtype=bool)
+
+    internal = LineCollection(
+        _sample_segments(pos, u[~is_cut], v[~is_cut], max_internal_edges, rng),
+        colors='dimgray', linewidths=0.3, alpha=0.15, rasterized=True
+    )
+    ax.add_collection(internal)
+
+    if has_partition:
+        for mask, cmap in ((is_A, 'Blues'), (~is_A, 'Reds')):
+            if mask.any():
+                ax.hexbin(pos[mask, 0], pos[mask, 1], gridsize=gridsize, cmap=cmap,
+                          mincnt=1, bins='log', alpha=0.8, rasterized=True)
+    else:
+        ax.hexbin(pos[:, 0], pos[:, 1], gridsize=gridsize, cmap='Blues', mincnt=1, bins='log', rasterized=True)
+
+    num_cut = int(is_cut.sum())
+    if num_cut:
+        cut = LineCollection(
+            _sample_segments(pos, u[is_cut], v[is_cut], max_cut_edges, rng),
+            colors='red', linewidths=0.4, alpha=0.3, linestyles='dashed', rasterized=True
+        )
+        ax.add_collection(cut)
+
+    shown = f", {min(num_cut, max_cut_edges)} shown" if num_cut > max_cut_edges else ""
+    ax.set_title(f"{title}\n({len(ag.nodes)} nodes, {num_cut} cut edges{shown})", fontsize=14)
+    ax.autoscale_view()
+    ax.axis('off')
+
 def visualize_partitioned_graph(
     graph: nx.Graph, 
     ax: Optional[plt.Axes] = None, 
     title: str = "Partitioned Graph",
-    layout_style: str = 'spring'  # <-- 新增参数，默认为'spring'
+    layout_style: str = 'spring',  # <-- 新增参数，默认为'spring'
+    large_graph_threshold: int = 2000,
+    max_labeled_nodes: int = 200,
+    layout_cache: Optional[Dict[str, Dict]] = None
 ):
     """
     可视化一个已分区的 NetworkX 图，支持多种布局样式。
+    节点数超过 large_graph_threshold 时改用LOD渲染 (见 _draw_large_partitioned_graph)；
+    节点数超过 max_labeled_nodes 时不绘制节点标签。
+    传入 layout_cache (dict) 时，相同拓扑的 spring 布局只计算一次（bipartite 布局取决于分区，不缓存）。
     """
     if not isinstance(graph, nx.Graph) or graph.number_of_nodes() == 0:
         print("错误：传入的不是一个有效的或非空的图，无法进行可视化。")
         return
 
+    if graph.number_of_nodes() > large_graph_threshold:
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(10, 8))
+            _draw_large_partitioned_graph(graph, ax, title, layout_style, layout_cache)
+            plt.tight_layout()
+            plt.show()
+        else:
+            _draw_large_partitioned_graph(graph, ax, title, layout_style, layout_cache)
+        return
+
     # --- 关键改动：根据 layout_style 选择布局 ---
-    if layout_style == 'bipartite':
-        pos = _create_bipartite_layout(graph)
-    else:  # 默认为 spring 布局
-        pos = nx.spring_layout(graph, seed=42)
+    pos = compute_layout(graph, layout_style, layout_cache, large_graph_threshold)
     
     node_colors = []
     # 如果节点有分区信息，则按分区着色，否则使用默认颜色
@@ -103,7 +352,8 @@ def visualize_partitioned_graph(
             style='dashed'
         )
 
-    nx.draw_networkx_labels(graph, pos, ax=ax, font_size=font_size, font_weight='bold')
+    if graph.number_of_nodes() <= max_labeled_nodes:
+        nx.draw_networkx_labels(graph, pos, ax=ax, font_size=font_size, font_weight='bold')
     ax.set_title(title, fontsize=14)
     ax.axis('off')
     
@@ -1,16 +1,78 @@
 """
 netlist_parser.py - 网表解析器与图构建工具
-该模块用于解析电路网表文件，并构建一个 NetworkX 图对象。
+该模块用于解析电路网表文件，并构建一个 NetworkX 图对象，
+或在不导入 NetworkX 的情况下直接构建紧凑的 ArrayGraph（供快速启动的划分任务使用）。
+对于无法整体载入内存的网表，partition_netlist_streaming 逐行读取文件完成单遍流式划分。
+所有读取网表的函数都通过 open_netlist 打开文件：按文件头的魔数识别 gzip / bz2 / xz 压缩，边读边解压。
 """
 
-import networkx as nx
-from typing import Union, Optional  
+from __future__ import annotations
+
+import importlib
+import os
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Set, TextIO, Tuple, Union, Optional  
+
+from ..core.array_graph import ArrayGraph, arrays_from_adjacency
+from ..core.streaming_partition import streaming_partition
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+_HEADER_PATTERN = re.compile(r'Nodes:\s*(\d+),\s*Edges:\s*(\d+)')
+
+# 压缩格式的魔数 -> 解压模块名（按需导入，不增加未压缩网表的冷启动时间）
+_COMPRESSION_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'BZh', 'bz2'), (b'\xfd7zXZ\x00', 'lzma'))
+_COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.xz')
+
+def open_netlist(file_path: str) -> TextIO:
+    """
+    以文本方式打开网表文件。按文件开头的魔数（而非扩展名）识别 gzip / bz2 / xz 压缩，
+    压缩文件在逐行读取时流式解压，不会写出解压后的副本。
+    """
+    with open(file_path, 'rb') as f:
+        magic = f.read(6)
+    for prefix, module_name in _COMPRESSION_MAGIC:
+        if magic.startswith(prefix):
+            module = importlib.import_module(module_name)
+            return module.open(file_path, 'rt', encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+def netlist_name(file_path: str) -> str:
+    """网表的显示名：去掉目录、压缩后缀与扩展名，例如 'designs/top.txt.gz' -> 'top'。"""
+    name = os.path.basename(file_path)
+    if name.endswith(_COMPRESSED_SUFFIXES):
+        name = os.path.splitext(name)[0]
+    return os.path.splitext(name)[0]
+
+def _iter_netlist_edges(lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+    """
+    逐行解析网表内容，依次产出 (节点A, 节点B, 权重)。
+    注释行与空行被忽略，格式不正确的行打印警告后跳过。
+    """
+    for line in lines:
+        line = line.strip()
+
+        # 忽略空行和注释
+        if not line or line.startswith('#'):
+            continue
+
+        parts = line.split()
+
+        # 期望每行至少有两个部分（节点A, 节点B）
+        if len(parts) >= 2 and parts[0].startswith('N') and parts[1].startswith('N'):
+            # 如果提供了权重信息，可以将其作为边的属性添加
+            weight = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 1
+            yield parts[0], parts[1], weight
+        else:
+            # 只有不满足上述严格条件的行才会被认为是格式错误
+            print(f"警告：跳过格式不正确的行: '{line}'")
 
 def parse_netlist_to_graph(file_path: str) -> Optional[nx.Graph]:
     """
     解析一个网表文件并构建一个 NetworkX 图。
 
-    该函数会忽略注释行和空行，并动态地从边列表构建图。
+    该函数会忽略注释行和空行，并动态地从边列表构建图。文件可以是 gzip / bz2 / xz 压缩的（见 open_netlist）。
 
     兼容的网表格式 (由 generate_netlists.py 生成):
     ----------------------------------------------------
@@ -25,28 +87,14 @@ def parse_netlist_to_graph(file_path: str) -> Optional[nx.Graph]:
         Optional[nx.Graph]: 代表电路的 NetworkX Graph 对象。
                             若文件不存在或解析失败，则返回 None。
     """
+    import networkx as nx
+
     # 将函数返回值的描述从Args部分移到Returns部分
     graph = nx.Graph()
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-
-                # 忽略空行和注释
-                if not line or line.startswith('#'):
-                    continue
-
-                parts = line.split()
-
-                # 期望每行至少有两个部分（节点A, 节点B）
-                if len(parts) >= 2 and parts[0].startswith('N') and parts[1].startswith('N'):
-                    u, v = parts[0], parts[1]
-                    # 如果提供了权重信息，可以将其作为边的属性添加
-                    weight = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 1
-                    graph.add_edge(u, v, weight=weight)
-                else:
-                    # 只有不满足上述严格条件的行才会被认为是格式错误
-                    print(f"警告：跳过格式不正确的行: '{line}'")
+        with open_netlist(file_path) as f:
+            for u, v, weight in _iter_netlist_edges(f):
+                graph.add_edge(u, v, weight=weight)
 
     except FileNotFoundError:
         print(f"错误：文件 '{file_path}' 未找到。")
@@ -56,4 +104,90 @@ def parse_netlist_to_graph(file_path: str) -> Optional[nx.Graph]:
         return None
 
     print(f"成功解析 '{file_path}': 共找到 {graph.number_of_nodes()} 个节点和 {graph.number_of_edges()} 条边。")
-    return graph
\ No newline at end of file
+    return graph
+
+def parse_netlist_to_arrays(file_path: str, reorder: Optional[str] = None) -> Optional[ArrayGraph]:
+    """
+    解析一个网表文件并直接构建 ArrayGraph，全程不导入 NetworkX。
+
+    接受的格式与 parse_netlist_to_graph 相同；重复的边以最后一次出现的权重为准。
+    节点与邻居的编号顺序与 graph_to_arrays(parse_netlist_to_graph(file_path)) 的结果一致。
+
+    参数:
+        file_path (str): 网表文件的完整路径。
+        reorder (Optional[str]): 节点重排方式 'rcm' / 'bfs'（见 array_graph.reorder_arrays），为None时按文件顺序编号。
+
+    Returns:
+        Optional[ArrayGraph]: CSR 形式的图。若文件不存在或解析失败，则返回 None。
+    """
+    adjacency: Dict[str, Dict[str, int]] = {}
+    try:
+        with open_netlist(file_path) as f:
+            for u, v, weight in _iter_netlist_edges(f):
+                neighbors_u = adjacency.setdefault(u, {})
+                neighbors_v = adjacency.setdefault(v, {})
+                neighbors_u[v] = weight
+                neighbors_v[u] = weight
+
+    except FileNotFoundError:
+        print(f"错误：文件 '{file_path}' 未找到。")
+        return None
+    except Exception as e:
+        print(f"解析文件 '{file_path}' 时发生意外错误: {e}")
+        return None
+
+    graph = arrays_from_adjacency(adjacency, reorder)
+    print(f"成功解析 '{file_path}': 共找到 {graph.number_of_nodes()} 个节点和 {graph.number_of_edges()} 条边。")
+    return graph
+
+def read_netlist_header(file_path: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    读取网表开头注释中的 '# Nodes: N, Edges: M'（generate_netlists.py 写出的头部），只读到第一条非注释行为止。
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: (节点数, 边数)，没有头部时为 (None, None)。
+    """
+    with open_netlist(file_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                break
+            match = _HEADER_PATTERN.search(line)
+            if match:
+                return int(match.group(1)), int(match.group(2))
+    return None, None
+
+def partition_netlist_streaming(
+    file_path: str,
+    method: str = 'ldg',
+    imbalance: float = 0.0,
+    num_nodes: Optional[int] = None
+) -> Tuple[Set[str], Set[str]]:
+    """
+    逐行读取网表文件，单遍完成流式两路划分（见 core/streaming_partition.py），内存只与节点数成正比。
+    网表只记录边，头部计入但从未出现在边中的节点无法得知名称，不在结果中；两区按实际出现的节点数保持平衡。
+
+    参数:
+        file_path (str): 网表文件的完整路径。
+        method (str): 'ldg' 或 'fennel'。
+        imbalance (float): 允许的不平衡度。
+        num_nodes (Optional[int]): 节点总数；默认取自网表头部，头部缺失时必须给出。
+
+    Returns:
+        Tuple[Set[str], Set[str]]: 分区A和分区B的节点集合，可直接作为 initial_partition。
+    """
+    header_nodes, header_edges = read_netlist_header(file_path)
+    num_nodes = num_nodes or header_nodes
+    if not num_nodes:
+        raise ValueError(f"网表 '{file_path}' 缺少 '# Nodes: N, Edges: M' 头部，请通过 num_nodes 指定节点总数。")
+    with open_netlist(file_path) as f:
+        return streaming_partition(_iter_netlist_edges(f), num_nodes, header_edges, method, imbalance)
+
+def netlist_cut_size(file_path: str, partition_A: Set[str]) -> int:
+    """再次流式读取网表，计算给定划分的割边数（考虑权重），不构建图。"""
+    cut_size = 0
+    with open_netlist(file_path) as f:
+        for u, v, weight in _iter_netlist_edges(f):
+            if (u in partition_A) != (v in partition_A):
+                cut_size += weight
+    return cut_size
@@ -0,0 +1,248 @@
+# EDA_Circuit_Partitioning_KL/src/utils/profiling.py
+
+"""
+profiling.py - 实验运行的性能剖析
+为每个 (算法, 网表) 组合分别收集剖析数据，同一标签下的多次运行累积到一起：
+1. cprofile: 使用标准库 cProfile 精确统计每个函数的调用次数、自身耗时与累计耗时，
+   输出 .pstats（可用 pstats / snakeviz 查看）以及由调用关系估算的折叠栈文件。
+2. sampling: 后台线程按固定间隔采样被剖析线程的调用栈，开销低、不改变函数调用的相对耗时，
+   输出真实调用栈的折叠栈文件（可直接交给 flamegraph.pl / speedscope 生成火焰图）。
+两种模式都会在 summary.txt 中列出各标签自身耗时最高的函数。
+"""
+
+import os
+import re
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_MODES = ('cprofile', 'sampling')
+DEFAULT_PROFILE_DIR = 'results/profiles'
+DEFAULT_SAMPLE_INTERVAL = 0.001  # 采样间隔（秒）
+DEFAULT_TOP = 15                 # 摘要中列出的函数个数
+_MAX_COLLAPSE_DEPTH = 40         # 由 cProfile 调用关系展开折叠栈时的最大深度
+
+
+def _code_label(filename: str, lineno: int, name: str) -> str:
+    """函数的显示名：'名称 (文件名:行号)'；内置函数只显示名称。"""
+    if filename == '~' or not filename:
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def _safe_filename(label: str) -> str:
+    return re.sub(r'[^\w.-]+', '_', label).strip('_') or 'profile'
+
+
+class SamplingProfiler:
+    """
+    低开销的采样剖析器：启用期间由后台线程定期读取被剖析线程的当前调用栈并计数。
+    启用时所在函数以外的外层调用帧不计入调用栈，使折叠栈以被剖析的代码块为根。
+    采样线程需要取得 GIL 才能运行，因此启用期间把解释器的线程切换间隔临时调整为采样间隔。
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.elapsed = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = 0.0
+        self._switch_interval = sys.getswitchinterval()
+
+    def enable(self, frame=None):
+        """开始采样当前线程；frame 为被剖析代码块所在的帧（缺省为调用者的帧）。"""
+        frame = frame if frame is not None else sys._getframe(1)
+        skip = 0
+        outer = frame.f_back
+        while outer is not None:
+            skip, outer = skip + 1, outer.f_back
+        self._stop.clear()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(target=self._sample, args=(threading.get_ident(), skip), daemon=True)
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+        self.elapsed += time.perf_counter() - self._started
+
+    def _sample(self, target: int, skip: int):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code in _PROFILER_CODES:
+                    break  # 被剖析线程正在停用剖析器，这次采样不属于被剖析的代码块
+                stack.append(_code_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if frame is None and len(stack) > skip:
+                self.stacks[tuple(reversed(stack[:len(stack) - skip]))] += 1
+
+    def function_times(self) -> Dict[str, Tuple[float, float]]:
+        """按采样比例估算每个函数的 (自身耗时, 包含子调用的耗时)，单位为秒。"""
+        total = sum(self.stacks.values())
+        if not total:
+            return {}
+        seconds_per_sample = self.elapsed / total
+        self_counts, inclusive_counts = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                inclusive_counts[label] += count
+        return {label: (self_counts[label] * seconds_per_sample, count * seconds_per_sample)
+                for label, count in inclusive_counts.items()}
+
+    def collapsed_lines(self) -> List[str]:
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+
+
+def _pstats_function_times(stats: pstats.Stats) -> Dict[str, Tuple[float, float]]:
+    return {_code_label(*func): (tt, ct) for func, (cc, nc, tt, ct, callers) in stats.stats.items()}
+
+
+def _pstats_collapsed_lines(stats: pstats.Stats) -> List[str]:
+    """
+    由 cProfile 的调用关系估算折叠栈（cProfile 只记录“调用者 -> 被调用者”的一层关系）：
+    从没有调用者的函数出发向下展开，被调用者在某条路径上的耗时按该调用边的累计耗时占其总累计耗时的比例分摊。
+    输出的数值为微秒。
+    """
+    callees: Dict[Tuple, List[Tuple[Tuple, float]]] = {}
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    totals = {func: (tt, ct) for func, (cc, nc, tt, ct, callers) in stats.stats.items()}
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+
+    weights: Counter = Counter()
+
+    def walk(func, path, share):
+        tt, ct = totals[func]
+        labels = path + (_code_label(*func),)
+        weights[labels] += tt * share
+        if len(labels) >= _MAX_COLLAPSE_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = totals[callee][1]
+            child_share = share * edge_time / callee_total if callee_total > 0 else 0.0
+            # 跳过递归调用与可以忽略的分支（< 1 微秒）
+            if child_share * callee_total >= 1e-6 and _code_label(*callee) not in labels:
+                walk(callee, labels, child_share)
+
+    for root in roots:
+        walk(root, (), 1.0)
+    return [f"{';'.join(stack)} {round(seconds * 1e6)}"
+            for stack, seconds in weights.most_common() if round(seconds * 1e6) > 0]
+
+
+class _Recording:
+    """RunProfiler.record 返回的上下文管理器：进入时启用对应标签的剖析器，退出时停用。"""
+
+    def __init__(self, profiler, collector):
+        self._profiler, self._collector = profiler, collector
+
+    def __enter__(self):
+        if self._profiler.mode == 'sampling':
+            self._collector.enable(sys._getframe(1))
+        else:
+            self._collector.enable()
+        return self._collector
+
+    def __exit__(self, exc_type, exc, tb):
+        self._collector.disable()
+
+
+# 剖析器自身的函数，采样时遇到这些帧的调用栈不计入结果
+_PROFILER_CODES = frozenset({SamplingProfiler.disable.__code__, _Recording.__exit__.__code__})
+
+
+class RunProfiler:
+    """
+    按标签收集剖析数据并写出结果文件。
+
+    用法:
+        profiler = RunProfiler('sampling')
+        with profiler.record('kl_random_Small'):
+            kernighan_lin_partition(...)
+        print(profiler.write())
+
+    参数:
+        mode (str): 'cprofile' 或 'sampling'。
+        output_dir (str): 输出目录，每个标签写出 <标签>.collapsed（cprofile 模式另有 <标签>.pstats），
+            以及汇总所有标签的 summary.txt。
+        interval (float): sampling 模式的采样间隔（秒）。
+        top (int): 摘要中每个标签列出的函数个数。
+    """
+
+    def __init__(self, mode: str = 'cprofile', output_dir: str = DEFAULT_PROFILE_DIR,
+                 interval: float = DEFAULT_SAMPLE_INTERVAL, top: int = DEFAULT_TOP):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"未知的剖析模式 '{mode}'，可选: {list(PROFILE_MODES)}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self._collectors: Dict[str, object] = {}
+
+    def record(self, label: str) -> _Recording:
+        """剖析 with 代码块；同一标签的多次记录累积到一起。剖析期间不能嵌套记录。"""
+        if label not in self._collectors:
+            self._collectors[label] = cProfile.Profile() if self.mode == 'cprofile' else SamplingProfiler(self.interval)
+        return _Recording(self, self._collectors[label])
+
+    def labels(self) -> List[str]:
+        return list(self._collectors)
+
+    def function_times(self, label: str) -> Dict[str, Tuple[float, float]]:
+        """标签下每个函数的 (自身耗时, 累计耗时)，单位为秒（sampling 模式为按采样比例的估计值）。"""
+        collector = self._collectors[label]
+        if self.mode == 'cprofile':
+            return _pstats_function_times(pstats.Stats(collector))
+        return collector.function_times()
+
+    def summary(self, label: str) -> str:
+        """标签下自身耗时最高的 top 个函数的文本摘要。"""
+        times = self.function_times(label)
+        total = sum(self_time for self_time, _ in times.values())
+        lines = [f"== {label} ({self.mode}, 合计 {total:.4f} s) ==",
+                 f"{'自身占比':>8} {'自身(s)':>10} {'累计(s)':>10}  函数"]
+        ranked = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+        for name, (self_time, cumulative) in ranked:
+            share = self_time / total if total > 0 else 0.0
+            lines.append(f"{share:>8.1%} {self_time:>10.4f} {cumulative:>10.4f}  {name}")
+        return '\n'.join(lines)
+
+    def write(self) -> str:
+        """写出全部标签的剖析文件与 summary.txt，返回摘要文本。"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        summaries = []
+        for label, collector in self._collectors.items():
+            base = os.path.join(self.output_dir, _safe_filename(label))
+            if self.mode == 'cprofile':
+                collector.dump_stats(f"{base}.pstats")
+                lines = _pstats_collapsed_lines(pstats.Stats(collector))
+            else:
+                lines = collector.collapsed_lines()
+            with open(f"{base}.collapsed", 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            summaries.append(self.summary(label))
+
+        text = '\n\n'.join(summaries)
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        return text
+
+
+def profile_section(profiler: Optional[RunProfiler], label: str):
+    """profiler 为 None 时返回空的上下文管理器，便于在调用处无条件地使用 with。"""
+    return nullcontext() if profiler is None else profiler.record(label)
@@ -0,0 +1,74 @@
+"""
+tests/test_anytime_analysis.py - 对 anytime_analysis.py 以及各算法 history 中耗时记录的单元测试
+"""
+
+import unittest
+import os
+import sys
+import math
+import random
+import networkx as nx
+import numpy as np
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.base_partitioning import simple_greedy_partition
+from src.core.kl_classic import kernighan_lin_partition
+from src.core.kl_improvements import kernighan_lin_bfs_init
+from src.utils.anytime_analysis import (
+    anytime_samples, time_to_target, median_anytime_curve, time_to_target_cdf
+)
+
+
+class TestAnytimeAnalysis(unittest.TestCase):
+    """测试 anytime 曲线与 time-to-target 的计算"""
+
+    def setUp(self):
+        self.history = [
+            {'cut_size': 10, 'elapsed': 0.1},
+            {'cut_size': 7, 'elapsed': 0.2},
+            {'cut_size': 8, 'elapsed': 0.3},
+            {'cut_size': 5, 'elapsed': 0.4},
+        ]
+
+    def test_samples_are_best_so_far(self):
+        """采样点的割边数为截至当时的最小值"""
+        self.assertEqual(anytime_samples(self.history), [(0.1, 10), (0.2, 7), (0.3, 7), (0.4, 5)])
+
+    def test_time_to_target(self):
+        """首次达标的耗时；从未达标时为 inf"""
+        self.assertEqual(time_to_target(self.history, 7), 0.2)
+        self.assertEqual(time_to_target(self.history, 4), math.inf)
+
+    def test_median_curve_and_cdf(self):
+        """中位数曲线按阶梯函数取值，初始状态之前为 NaN；经验分布的分母为全部运行数"""
+        other = [{'cut_size': 9, 'elapsed': 0.15}, {'cut_size': 3, 'elapsed': 0.25}]
+        curve = median_anytime_curve([self.history, other], [0.05, 0.12, 0.2, 0.5])
+        self.assertTrue(np.isnan(curve[0]))
+        np.testing.assert_allclose(curve[1:], [10, 8, 4])
+
+        times, fractions = time_to_target_cdf([0.3, math.inf, 0.1, math.inf])
+        np.testing.assert_allclose(times, [0.1, 0.3])
+        np.testing.assert_allclose(fractions, [0.25, 0.5])
+
+    def test_algorithm_histories_record_elapsed(self):
+        """三种算法的 history 每一项都带有单调不减的 'elapsed'"""
+        G = nx.relabel_nodes(nx.gnm_random_graph(20, 50, seed=3), lambda i: f"N{i}")
+        nx.set_edge_attributes(G, 1, 'weight')
+        nodes = list(G.nodes())
+        random.Random(0).shuffle(nodes)
+        initial = (set(nodes[:10]), set(nodes[10:]))
+
+        for result in (simple_greedy_partition(G, initial, verbose=False),
+                       kernighan_lin_partition(G, initial, verbose=False),
+                       kernighan_lin_bfs_init(G, start_node='N0', verbose=False)):
+            elapsed = [entry['elapsed'] for entry in result[3]]
+            self.assertEqual(elapsed, sorted(elapsed))
+            self.assertLessEqual(elapsed[-1], result[4])
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
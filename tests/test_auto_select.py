@@ -0,0 +1,99 @@
+"""
+tests/test_auto_select.py - 对 auto_select.py 图特征、代价模型与自动选择的单元测试
+"""
+
+import unittest
+import os
+import sys
+import random
+import tempfile
+import shutil
+import networkx as nx
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.array_graph import graph_to_arrays
+from src.core.auto_select import graph_features, CostModel, select_algorithm, auto_partition
+
+
+def _write_report(path, rates, runtimes):
+    """按 run_experiments.py 的报告格式写出一个三规模的性能CSV。"""
+    with open(path, 'w', encoding='utf-8-sig') as f:
+        f.write(',"Small (10n, 20e)","Medium (20n, 40e)","Large (50n, 100e)"\n')
+        f.write('Average Cut-edge Reduction Rate,' + ','.join(f"{r:.2%}" for r in rates) + '\n')
+        f.write('Average Algorithm Runtime (s),' + ','.join(f"{t:.6f}" for t in runtimes) + '\n')
+
+
+class TestAutoSelect(unittest.TestCase):
+    """测试图特征的计算、由报告拟合的代价模型，以及时间预算下的选择"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        # 'slow' 的质量最好但运行时间按边数的平方增长，'fast' 质量较差但很快
+        _write_report(os.path.join(self.test_dir, 'slow.csv'), [0.5, 0.6, 0.7], [0.001, 0.004, 0.025])
+        _write_report(os.path.join(self.test_dir, 'fast.csv'), [0.2, 0.3, 0.4], [0.0001, 0.0002, 0.0005])
+        self.model = CostModel.from_reports({'kl_random': os.path.join(self.test_dir, 'slow.csv'),
+                                             'greedy': os.path.join(self.test_dir, 'fast.csv')})
+        self.G = nx.relabel_nodes(nx.gnm_random_graph(50, 100, seed=1), lambda i: f"N{i}")
+        nx.set_edge_attributes(self.G, 1, 'weight')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_graph_features(self):
+        """特征与 NetworkX 的计算一致，ArrayGraph 输入给出相同结果"""
+        G = nx.disjoint_union(nx.complete_graph(4), nx.path_graph(3))
+        G = nx.relabel_nodes(G, lambda i: f"N{i}")
+        features = graph_features(G)
+        self.assertEqual((features['n'], features['m'], features['components']), (7, 8, 2))
+        self.assertAlmostEqual(features['avg_degree'], 16 / 7)
+        self.assertEqual(graph_features(graph_to_arrays(G)), features)
+
+    def test_cost_model_fit(self):
+        """幂律运行时间模型在拟合点上复现报告值，减少率在规模之间插值、超出范围时取端点值"""
+        self.assertAlmostEqual(self.model.predict_runtime('greedy', {'m': 40}), 0.0002, delta=0.00005)
+        self.assertAlmostEqual(self.model.predict_reduction_rate('kl_random', {'n': 10}), 0.5)
+        self.assertAlmostEqual(self.model.predict_reduction_rate('kl_random', {'n': 5000}), 0.7)
+        self.assertTrue(0.6 < self.model.predict_reduction_rate('kl_random', {'n': 30}) < 0.7)
+        with self.assertRaises(ValueError):
+            CostModel.from_reports({'greedy': os.path.join(self.test_dir, 'missing.csv')})
+
+    def test_selection_respects_time_budget(self):
+        """预算充足时选预测割边数最小的引擎，预算不足时换成更快的引擎，任何引擎都超预算时收紧轮数上限"""
+        self.assertEqual(select_algorithm(self.G, model=self.model)['algorithm'], 'kl_random')
+        self.assertEqual(select_algorithm(self.G, time_budget=0.001, model=self.model)['algorithm'], 'greedy')
+
+        tight = select_algorithm(self.G, time_budget=1e-6, model=self.model)
+        self.assertEqual(tight['algorithm'], 'kl_random')
+        self.assertEqual(tight['limit'], 1)
+
+    def test_selection_depends_on_components(self):
+        """节点数、边数相同时，图被拆成多个连通分量后不再选择只覆盖起始分量的 kl_bfs"""
+        _write_report(os.path.join(self.test_dir, 'bfs.csv'), [0.9, 0.9, 0.9], [0.0001, 0.0002, 0.0005])
+        model = CostModel.from_reports({'kl_random': os.path.join(self.test_dir, 'slow.csv'),
+                                        'kl_bfs': os.path.join(self.test_dir, 'bfs.csv')})
+        connected = nx.relabel_nodes(nx.cycle_graph(40), lambda i: f"N{i}")
+        split = nx.relabel_nodes(nx.disjoint_union(nx.cycle_graph(20), nx.cycle_graph(20)), lambda i: f"N{i}")
+        for G in (connected, split):
+            nx.set_edge_attributes(G, 1, 'weight')
+        self.assertEqual(graph_features(connected)['m'], graph_features(split)['m'])
+
+        self.assertEqual(select_algorithm(connected, start_node='N0', model=model)['algorithm'], 'kl_bfs')
+        self.assertEqual(select_algorithm(split, start_node='N0', model=model)['algorithm'], 'kl_random')
+
+    def test_auto_partition_interface(self):
+        """auto 算法返回与其他引擎一致的七元组，并在 history 中记录所选引擎"""
+        random.seed(0)
+        A, B, cut, history, exec_time, initial_graph, final_graph = auto_partition(self.G, verbose=False)
+        self.assertEqual(len(A) + len(B), 50)
+        self.assertEqual(abs(len(A) - len(B)), 0)
+        self.assertIn(history[0]['algorithm'], ('greedy', 'kl_random', 'kl_bfs'))
+        self.assertLessEqual(cut, history[0]['cut_size'])
+        self.assertIsNotNone(final_graph)
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+"""
+tests/test_checkpoint.py - 对各引擎生成器形式、检查点保存与断点续跑的单元测试
+"""
+
+import unittest
+import os
+import sys
+import random
+import tempfile
+import shutil
+import networkx as nx
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.checkpoint import save_checkpoint, load_checkpoint, run_with_checkpoint
+from src.core.kl_classic import kernighan_lin_partition, kernighan_lin_passes
+from src.core.kl_improvements import kernighan_lin_bfs_init, kernighan_lin_bfs_passes
+from src.core.base_partitioning import simple_greedy_partition, simple_greedy_iterations
+
+
+class TestCheckpoint(unittest.TestCase):
+    """测试生成器逐轮产出的状态、函数形式与生成器的一致性，以及中断后从检查点续跑的结果"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        # 随机浮点权重使各交换的增益互不相同，结果与集合的遍历顺序无关
+        rng = random.Random(3)
+        self.G = nx.relabel_nodes(nx.gnm_random_graph(40, 120, seed=3), lambda i: f"N{i}")
+        for u, v in self.G.edges():
+            self.G[u][v]['weight'] = rng.random()
+        nodes = sorted(self.G.nodes())
+        rng.shuffle(nodes)
+        self.initial = (set(nodes[:20]), set(nodes[20:]))
+        self.path = os.path.join(self.test_dir, 'run.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _interrupted_then_resumed(self, make_states, stop_after):
+        """运行到第 stop_after 个状态时“中断”，写出检查点后从文件读回并续跑到底。"""
+        for k, state in enumerate(make_states(None)):
+            save_checkpoint(state, self.path)
+            if k == stop_after:
+                break
+        return run_with_checkpoint(make_states(load_checkpoint(self.path)), self.path)
+
+    def test_generator_matches_function(self):
+        """生成器先产出起始状态再逐轮产出快照，最后一个状态与函数形式的返回值一致"""
+        states = list(kernighan_lin_passes(self.G, self.initial))
+        self.assertEqual([s.pass_num for s in states], list(range(len(states))))
+        self.assertTrue(states[-1].converged)
+        self.assertEqual(states[0].history[0]['cut_size'], states[0].cut_size)
+        for s in states:
+            self.assertEqual(s.partition_A | s.partition_B, set(self.G.nodes()))
+            self.assertLessEqual(s.best_cut_size, s.cut_size)
+
+        A, B, cut, history, _, _, _ = kernighan_lin_partition(self.G, self.initial, verbose=False)
+        self.assertEqual((A, cut), (states[-1].best_partition_A, states[-1].best_cut_size))
+        self.assertEqual([h['cut_size'] for h in history], [h['cut_size'] for h in states[-1].history])
+
+        greedy_states = list(simple_greedy_iterations(self.G, self.initial, yield_every=5))
+        self.assertTrue(all(s.pass_num % 5 == 0 for s in greedy_states[:-1]))
+        A, _, cut, history, _, _, _ = simple_greedy_partition(self.G, self.initial, verbose=False)
+        self.assertEqual((A, cut, len(history)), (greedy_states[-1].partition_A, greedy_states[-1].cut_size,
+                                                  len(greedy_states[-1].history)))
+
+    def test_resume_from_checkpoint(self):
+        """中断后从检查点续跑得到与不中断运行完全相同的划分与逐轮记录"""
+        cases = [
+            (lambda resume: kernighan_lin_passes(self.G, self.initial, resume_from=resume),
+             kernighan_lin_partition(self.G, self.initial, verbose=False), 1),
+            (lambda resume: kernighan_lin_bfs_passes(self.G, start_node='N0', resume_from=resume),
+             kernighan_lin_bfs_init(self.G, start_node='N0', verbose=False), 1),
+            (lambda resume: simple_greedy_iterations(self.G, self.initial, resume_from=resume),
+             simple_greedy_partition(self.G, self.initial, verbose=False), 3),
+        ]
+        for make_states, reference, stop_after in cases:
+            state = self._interrupted_then_resumed(make_states, stop_after)
+            self.assertEqual(state.best_partition_A, reference[0])
+            self.assertAlmostEqual(state.best_cut_size, reference[2])
+            self.assertEqual([h['cut_size'] for h in state.history], [h['cut_size'] for h in reference[3]])
+            # 续跑的计时在检查点的基础上继续
+            self.assertEqual([h['elapsed'] for h in state.history], sorted(h['elapsed'] for h in state.history))
+
+    def test_resume_validation(self):
+        """检查点与引擎或图不匹配时报错；已收敛的检查点续跑时只产出其自身"""
+        final = run_with_checkpoint(kernighan_lin_passes(self.G, self.initial), self.path)
+        self.assertEqual(list(kernighan_lin_passes(self.G, resume_from=load_checkpoint(self.path))), [final])
+
+        with self.assertRaises(ValueError):
+            list(simple_greedy_iterations(self.G, resume_from=final))
+        other = self.G.copy()
+        other.add_node('Extra')
+        with self.assertRaises(ValueError):
+            list(kernighan_lin_passes(other, resume_from=final))
+        with self.assertRaises(ValueError):
+            list(kernighan_lin_passes(self.G))
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+"""
+tests/test_consensus_coarsening.py - 对多起点共识粗化与分组收缩的单元测试
+"""
+
+import unittest
+import os
+import sys
+import random
+import networkx as nx
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.consensus_coarsening import consensus_groups, consensus_coarsen, kernighan_lin_consensus
+from src.core.graph_reduction import contract_groups, expand_partition
+from src.core.kl_classic import _calculate_cut_size
+
+
+class TestConsensusCoarsening(unittest.TestCase):
+    """测试共识分组、分组收缩的精确性以及共识粗化KL的返回接口"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.G = nx.relabel_nodes(nx.random_geometric_graph(80, 0.2, seed=7), lambda i: f"N{i}")
+        for u, v in self.G.edges():
+            self.G[u][v]['weight'] = rng.randint(1, 3)
+        nodes = sorted(self.G.nodes())
+        rng.shuffle(nodes)
+        self.initial = (set(nodes[:40]), set(nodes[40:]))
+
+    def test_consensus_groups(self):
+        """每组在所有划分中同侧且连通；翻转某次划分的分区标签不改变分组"""
+        rng = random.Random(1)
+        nodes = sorted(self.G.nodes())
+        partitions = [{u for u in nodes if rng.random() < 0.5} for _ in range(3)]
+        groups = consensus_groups(self.G, partitions)
+        self.assertEqual(sorted(v for group in groups for v in group), nodes)
+        for group in groups:
+            for partition_A in partitions:
+                self.assertEqual(len({v in partition_A for v in group}), 1)
+            self.assertTrue(nx.is_connected(self.G.subgraph(group)))
+
+        flipped = [set(nodes) - partitions[0]] + partitions[1:]
+        self.assertEqual(sorted(map(sorted, groups)), sorted(map(sorted, consensus_groups(self.G, flipped))))
+
+    def test_contract_groups(self):
+        """不拆开任何一组的划分在收缩图与原始图上的割边数相同；分组必须恰好覆盖每个节点一次"""
+        coarse, (start_A, start_B), start_cut = consensus_coarsen(self.G, self.initial, num_starts=4, seed=0)
+        self.assertLess(coarse.graph.number_of_nodes(), self.G.number_of_nodes())
+        self.assertEqual(start_cut, _calculate_cut_size(self.G, start_A, start_B))
+
+        rng = random.Random(0)
+        for _ in range(10):
+            coarse_A = {u for u in coarse.graph.nodes if rng.random() < 0.5}
+            coarse_B = set(coarse.graph.nodes) - coarse_A
+            self.assertEqual(_calculate_cut_size(coarse.graph, coarse_A, coarse_B),
+                             _calculate_cut_size(self.G, *expand_partition(coarse, coarse_A, coarse_B)))
+
+        nodes = sorted(self.G.nodes())
+        with self.assertRaises(ValueError):
+            contract_groups(self.G, [nodes[:10], nodes[5:]])
+        with self.assertRaises(ValueError):
+            contract_groups(self.G, [nodes[:10]])
+
+    def test_kernighan_lin_consensus(self):
+        """七元组返回接口：结果平衡、割边数正确，且不差于最好的短程运行"""
+        A, B, cut, history, exec_time, initial_graph, final_graph = kernighan_lin_consensus(
+            self.G, self.initial, seed=3, verbose=False)
+        _, _, start_cut = consensus_coarsen(self.G, self.initial, seed=3)
+        self.assertEqual(A | B, set(self.G.nodes()))
+        self.assertFalse(A & B)
+        self.assertLessEqual(abs(len(A) - len(B)), 1)
+        self.assertEqual(cut, _calculate_cut_size(self.G, A, B))
+        self.assertLessEqual(cut, start_cut)
+        self.assertEqual(history[0]['cut_size'], _calculate_cut_size(self.G, *self.initial))
+        self.assertEqual(history[1]['cut_size'], start_cut)
+        self.assertEqual(history[-1]['cut_size'], cut)
+        self.assertGreater(exec_time, 0)
+        self.assertEqual(final_graph.number_of_nodes(), self.G.number_of_nodes())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
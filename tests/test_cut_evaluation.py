@@ -0,0 +1,80 @@
+"""
+tests/test_cut_evaluation.py - 对 cut_evaluation.py 批量划分评估的单元测试
+"""
+
+import unittest
+import os
+import sys
+import random
+import numpy as np
+import networkx as nx
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.array_graph import graph_to_arrays
+from src.core.kl_classic import _calculate_cut_size
+from src.core.kl_batched import _random_initial_sides
+from src.core.cut_evaluation import evaluate_partitions, iter_partition_scores, sides_from_partitions
+
+
+class TestCutEvaluation(unittest.TestCase):
+    """测试批量评估结果与逐个划分的集合计算一致，且与分块方式无关"""
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.G = nx.relabel_nodes(nx.gnm_random_graph(30, 80, seed=5), lambda i: f"N{i}")
+        for u, v in self.G.edges():
+            self.G[u][v]['weight'] = rng.randint(1, 4)
+        self.G.add_node('Isolated')
+        self.ag = graph_to_arrays(self.G)
+        self.sides = _random_initial_sides(self.ag.number_of_nodes(), 25, seed=1)
+
+    def _partition(self, row):
+        partition_A = {self.ag.nodes[i] for i in np.flatnonzero(row)}
+        return partition_A, set(self.ag.nodes) - partition_A
+
+    def test_matches_set_based_evaluation(self):
+        """割边数、两区大小、每个节点的 E/I 以及边界节点数与逐个计算的结果一致"""
+        scores = evaluate_partitions(self.G, self.sides)
+        for r, row in enumerate(self.sides):
+            partition_A, partition_B = self._partition(row)
+            self.assertEqual(scores.cut_sizes[r], _calculate_cut_size(self.G, partition_A, partition_B))
+            self.assertEqual(scores.size_A[r], len(partition_A))
+            self.assertEqual(scores.imbalance[r], abs(len(partition_A) - len(partition_B)))
+
+            boundary = 0
+            for i, u in enumerate(self.ag.nodes):
+                same_side = partition_A if u in partition_A else partition_B
+                E = sum(d['weight'] for v, d in self.G[u].items() if v not in same_side)
+                I = sum(d['weight'] for v, d in self.G[u].items() if v in same_side)
+                self.assertEqual((scores.external[r, i], scores.internal[r, i]), (E, I))
+                boundary += E > 0
+            self.assertEqual(scores.boundary_counts[r], boundary)
+
+    def test_chunking_and_input_types(self):
+        """分块大小、ArrayGraph 输入与 per_node 开关都不影响汇总结果"""
+        full = evaluate_partitions(self.G, self.sides)
+        chunked = evaluate_partitions(self.ag, self.sides, max_block_elements=1)
+        for field in ('cut_sizes', 'size_A', 'imbalance', 'boundary_counts', 'external', 'internal'):
+            np.testing.assert_array_equal(getattr(full, field), getattr(chunked, field))
+
+        starts = [lo for lo, _ in iter_partition_scores(self.ag, self.sides, max_block_elements=10 * 31)]
+        self.assertEqual(starts, [0, 10, 20])
+        summary = evaluate_partitions(self.G, self.sides, per_node=False)
+        self.assertIsNone(summary.external)
+        np.testing.assert_array_equal(summary.cut_sizes, full.cut_sizes)
+
+    def test_sides_from_partitions_and_validation(self):
+        """集合形式的划分可转换为候选矩阵；形状不符时报错"""
+        partitions = [self._partition(row) for row in self.sides[:3]]
+        np.testing.assert_array_equal(sides_from_partitions(self.G, partitions), self.sides[:3])
+        self.assertEqual(len(evaluate_partitions(self.G, self.sides[:0]).cut_sizes), 0)
+        with self.assertRaises(ValueError):
+            evaluate_partitions(self.G, self.sides[:, :-1])
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
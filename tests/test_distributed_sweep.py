@@ -0,0 +1,93 @@
+"""
+tests/test_distributed_sweep.py - 对 distributed_sweep.py 协调者/工作进程的单元测试（全部在 localhost 上运行）
+"""
+
+import unittest
+import os
+import sys
+import time
+import tempfile
+import shutil
+import multiprocessing
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.distributed_sweep import (
+    SweepCoordinator, SweepService, expand_sweep, execute_task, run_worker, _WorkerManager, DEFAULT_AUTHKEY
+)
+
+
+class TestDistributedSweep(unittest.TestCase):
+    """测试扫描展开、心跳超时后的任务重新分配，以及多个工作进程协同完成扫描"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.netlist = os.path.join(self.test_dir, 'netlist.txt')
+        with open(self.netlist, 'w') as f:
+            f.write("# Nodes: 12, Edges: 18\n")
+            for i in range(12):
+                f.write(f"N{i} N{(i + 1) % 12} 1\n")
+            for i in range(0, 12, 2):
+                f.write(f"N{i} N{(i + 5) % 12} 2\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_expand_sweep(self):
+        """任务数为各维度的乘积，task_id 连续；未知算法报错"""
+        tasks = expand_sweep({'algorithms': ['greedy', 'kl_bfs'], 'netlists': ['a', 'b'],
+                              'seeds': 3, 'max_passes': [1, 10]})
+        self.assertEqual(len(tasks), 2 * 2 * 3 * 2)
+        self.assertEqual([task['task_id'] for task in tasks], list(range(24)))
+        with self.assertRaises(ValueError):
+            expand_sweep({'algorithms': ['unknown'], 'netlists': ['a'], 'seeds': 1})
+
+    def test_expired_worker_task_is_reassigned(self):
+        """心跳超时的工作进程手中的任务交给其他工作进程，迟到的重复结果被忽略"""
+        service = SweepService(expand_sweep({'algorithms': ['greedy'], 'netlists': ['a'], 'seeds': 1}),
+                               heartbeat_timeout=0.1)
+        task = service.get_task('ghost')
+        self.assertEqual(service.get_task('live'), {})  # 唯一的任务仍在执行
+        time.sleep(0.2)
+        self.assertEqual(service.get_task('live'), task)
+        self.assertEqual(service.reassigned, 1)
+
+        service.submit_result('live', task['task_id'], {'final_cut': 3})
+        service.submit_result('ghost', task['task_id'], {'final_cut': 9})
+        self.assertEqual(service.results()[task['task_id']]['final_cut'], 3)
+        self.assertIsNone(service.get_task('live'))
+
+    def test_localhost_workers_complete_sweep(self):
+        """多个 TCP 工作进程完成全部任务；领取任务后失联的工作进程的任务被重新执行"""
+        tasks = expand_sweep({'algorithms': ['greedy', 'kl_random', 'kl_bfs'],
+                              'netlists': [self.netlist], 'seeds': 4})
+        with SweepCoordinator(tasks, heartbeat_timeout=1.0) as coordinator:
+            # 一个只领取任务、从不发送心跳也不回传结果的“失联”工作进程
+            ghost = _WorkerManager(address=coordinator.address, authkey=DEFAULT_AUTHKEY)
+            ghost.connect()
+            lost_task = ghost.sweep_service().get_task('ghost')
+
+            workers = [multiprocessing.Process(target=run_worker, args=(coordinator.address,),
+                                               kwargs={'heartbeat_interval': 0.2})
+                       for _ in range(3)]
+            for process in workers:
+                process.start()
+            results = coordinator.run(poll_interval=0.05, verbose=False,
+                                      workers_alive=lambda: any(p.is_alive() for p in workers))
+            for process in workers:
+                process.join(timeout=10)
+
+            self.assertEqual([r['task_id'] for r in results], [t['task_id'] for t in tasks])
+            self.assertGreaterEqual(coordinator.service.reassigned, 1)
+            self.assertNotEqual(results[lost_task['task_id']]['worker'], 'ghost')
+            for result in results:
+                # 初始划分只由种子决定，与本地执行一致
+                self.assertEqual(result['initial_cut'], execute_task(result)['initial_cut'])
+                self.assertLessEqual(result['final_cut'], result['initial_cut'])
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+"""
+tests/test_experiment_store.py - 对 experiment_store.py 可续跑实验库的单元测试
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.experiment_store import ExperimentStore, netlist_hash, confidence_half_width
+
+
+class TestExperimentStore(unittest.TestCase):
+    """测试运行记录的写入、续跑时的跳过判断与数值汇总"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'runs.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_completed_seeds_survive_reopen(self):
+        """重新打开实验库后，已完成的种子仍可查到；参数或网表不同的运行互不复用"""
+        with ExperimentStore(self.db_path) as store:
+            for seed in range(3):
+                store.record_run('kl_random', 'abc', seed, 10, 6, 0.01, passes=2, params={'init': 'random'})
+
+        with ExperimentStore(self.db_path) as store:
+            self.assertEqual(store.completed_seeds('kl_random', 'abc', {'init': 'random'}), {0, 1, 2})
+            self.assertEqual(store.completed_seeds('kl_random', 'abc', {'init': 'gggp'}), set())
+            self.assertEqual(store.completed_seeds('kl_random', 'def', {'init': 'random'}), set())
+            # 重复写入同一种子覆盖旧记录而不是新增
+            store.record_run('kl_random', 'abc', 0, 10, 5, 0.02, passes=3, params={'init': 'random'})
+            self.assertEqual(len(store.fetch_runs('kl_random', 'abc', {'init': 'random'})), 3)
+
+    def test_aggregate_is_numeric(self):
+        """汇总指标由数值记录直接计算"""
+        with ExperimentStore(self.db_path) as store:
+            store.record_run('greedy', 'abc', 0, 10, 5, 1.0)
+            store.record_run('greedy', 'abc', 1, 8, 6, 3.0)
+            store.record_run('greedy', 'abc', 2, 0, 0, 2.0)
+            stats = store.aggregate('greedy', 'abc', seeds=[0, 1])
+
+            self.assertAlmostEqual(stats['Max Cut-edge Reduction Rate'], 0.5)
+            self.assertAlmostEqual(stats['Average Cut-edge Reduction Rate'], 0.375)
+            self.assertAlmostEqual(stats['Average Algorithm Runtime (s)'], 2.0)
+            self.assertAlmostEqual(stats['Result Stability (Std Dev)'], 0.5)
+            self.assertEqual(stats['Runs'], 2)
+            self.assertAlmostEqual(stats['Runtime CI (s, ±)'], 12.706205 * 1.0, places=5)
+            self.assertEqual(store.aggregate('greedy', 'abc')['Runs'], 3)
+            self.assertIsNone(store.aggregate('kl_bfs', 'abc'))
+
+    def test_confidence_half_width(self):
+        """置信区间半宽按 t 分布计算；样本不足两个时为 inf，样本完全相同时为0"""
+        self.assertAlmostEqual(confidence_half_width([1.0, 2.0, 3.0]), 4.302653 / 3 ** 0.5, places=5)
+        self.assertEqual(confidence_half_width([5.0]), float('inf'))
+        self.assertAlmostEqual(confidence_half_width([0.3] * 10), 0.0)
+
+    def test_netlist_hash_tracks_content(self):
+        """网表内容变化时哈希随之变化"""
+        path = os.path.join(self.test_dir, 'netlist.txt')
+        with open(path, 'w') as f:
+            f.write("N1 N2 1\n")
+        first = netlist_hash(path)
+        with open(path, 'a') as f:
+            f.write("N2 N3 1\n")
+        self.assertNotEqual(first, netlist_hash(path))
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
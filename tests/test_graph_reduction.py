@@ -0,0 +1,102 @@
+"""
+tests/test_graph_reduction.py - 对划分前精确图约简与展开的单元测试
+"""
+
+import unittest
+import os
+import sys
+import random
+import networkx as nx
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.graph_reduction import (
+    reduce_graph, project_partition, expand_partition, rebalance_partition, kernighan_lin_reduced
+)
+from src.core.kl_classic import _calculate_cut_size
+from src.core.array_graph import adjacency_dict
+
+
+class TestGraphReduction(unittest.TestCase):
+    """测试约简的精确性、约简比例、展开后的平衡以及与其他引擎一致的返回接口"""
+
+    def setUp(self):
+        # 随机核心图上挂接树与度为2链，模拟含大量低度单元的网表
+        rng = random.Random(5)
+        self.G = nx.relabel_nodes(nx.gnm_random_graph(60, 150, seed=5), lambda i: f"N{i}")
+        next_id = 60
+        for _ in range(60):
+            parent = f"N{rng.randrange(next_id)}"
+            self.G.add_edge(parent, f"N{next_id}")
+            next_id += 1
+        for u, v in self.G.edges():
+            self.G[u][v]['weight'] = rng.randint(1, 4)
+        nodes = sorted(self.G.nodes())
+        rng.shuffle(nodes)
+        half = len(nodes) // 2
+        self.initial = (set(nodes[:half]), set(nodes[half:]))
+
+    def test_reduction_is_exact(self):
+        """约简图上任意划分的割边数都等于展开到原始节点后的割边数"""
+        reduced = reduce_graph(self.G)
+        self.assertLess(reduced.graph.number_of_nodes(), self.G.number_of_nodes())
+        self.assertEqual(sorted(v for group in reduced.members.values() for v in group), sorted(self.G.nodes()))
+        self.assertTrue(all(reduced.node_weights[u] == len(reduced.members[u]) for u in reduced.members))
+
+        rng = random.Random(0)
+        super_nodes = list(reduced.graph.nodes)
+        for _ in range(20):
+            reduced_A = {u for u in super_nodes if rng.random() < 0.5}
+            reduced_B = set(super_nodes) - reduced_A
+            A, B = expand_partition(reduced, reduced_A, reduced_B)
+            self.assertEqual(_calculate_cut_size(reduced.graph, reduced_A, reduced_B),
+                             _calculate_cut_size(self.G, A, B))
+
+    def test_chains_and_leaves(self):
+        """度为2链收缩为权重等于链上最小边权的边，叶节点收缩后超节点权重不超过上限"""
+        G = nx.Graph()
+        nx.add_path(G, ['a', 'x1', 'x2', 'x3', 'b'])
+        for (u, v), w in zip(G.edges(), [5, 2, 7, 3]):
+            G[u][v]['weight'] = w
+        G.add_edge('a', 'b', weight=1)
+        G.add_edges_from([('a', 'c', {'weight': 1}), ('b', 'c', {'weight': 1}), ('a', 'd', {'weight': 1}),
+                          ('b', 'd', {'weight': 1}), ('c', 'd', {'weight': 1})])
+        G.add_edge('c', 'e', weight=2)  # 叶节点
+        reduced = reduce_graph(G, max_node_weight=10)
+        self.assertEqual(sorted(reduced.graph.nodes), ['a', 'b', 'c', 'd'])
+        # a、b 之间的链收缩后与原有的 a-b 边合并为一条边: 1 + min(5, 2, 7, 3) = 3
+        self.assertEqual(adjacency_dict(reduced.graph)['a']['b'], 3)
+        self.assertEqual(sum(reduced.node_weights.values()), 8)
+
+        path = nx.path_graph([f"P{i}" for i in range(40)])
+        capped = reduce_graph(path, max_node_weight=4)
+        self.assertLessEqual(max(capped.node_weights.values()), 4)
+        self.assertGreaterEqual(capped.graph.number_of_nodes(), 10)
+
+    def test_reduced_partition_interface_and_balance(self):
+        """七元组返回接口：割边数按原始图计算，展开后两区节点数之差不超过1"""
+        reduced = reduce_graph(self.G)
+        self.assertGreaterEqual(reduced.reduction_ratio(), 0.3)
+
+        A, B, cut, history, exec_time, initial_graph, final_graph = kernighan_lin_reduced(self.G, self.initial, verbose=False)
+        self.assertEqual(A | B, set(self.G.nodes()))
+        self.assertFalse(A & B)
+        self.assertLessEqual(abs(len(A) - len(B)), 1)
+        self.assertEqual(cut, _calculate_cut_size(self.G, A, B))
+        self.assertEqual(history[0]['cut_size'], _calculate_cut_size(self.G, *self.initial))
+        self.assertEqual(history[-1]['cut_size'], cut)
+        self.assertLess(cut, history[0]['cut_size'])
+        self.assertGreater(exec_time, 0)
+        self.assertEqual(final_graph.number_of_nodes(), self.G.number_of_nodes())
+
+        # 恢复平衡时增量维护的割边数与重新计算的一致
+        unbalanced_A = set(sorted(self.G.nodes())[:90])
+        A, B, moved, cut = rebalance_partition(self.G, unbalanced_A, set(self.G.nodes()) - unbalanced_A)
+        self.assertEqual(moved, 30)
+        self.assertEqual(cut, _calculate_cut_size(self.G, A, B))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,120 @@
+"""
+tests/test_layout_cache.py - 对 graph_visualizer.py 布局缓存与大图布局功能的单元测试
+"""
+
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+import numpy as np
+import networkx as nx
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.graph_visualizer import (
+    visualize_partitioned_graph, compute_layout, load_layout_cache, save_layout_cache, _graph_fingerprint
+)
+
+
+class TestLayoutCache(unittest.TestCase):
+    """测试布局缓存的键计算、复用与磁盘持久化"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.graph = nx.relabel_nodes(nx.cycle_graph(8), lambda i: f"N{i}")
+        nx.set_edge_attributes(self.graph, 1, 'weight')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+        plt.close('all')
+
+    def test_fingerprint_depends_on_topology_only(self):
+        """缓存键只取决于拓扑，与分区无关；bipartite 布局取决于分区，不写入缓存"""
+        copy = self.graph.copy()
+        for i, node in enumerate(copy.nodes()):
+            copy.nodes[node]['partition'] = 'A' if i < 4 else 'B'
+        self.assertEqual(_graph_fingerprint(self.graph, 'spring'), _graph_fingerprint(copy, 'spring'))
+
+        cache = {}
+        compute_layout(copy, 'bipartite', cache)
+        self.assertEqual(cache, {})
+
+        copy.add_edge('N0', 'N4', weight=1)
+        self.assertNotEqual(_graph_fingerprint(self.graph, 'spring'), _graph_fingerprint(copy, 'spring'))
+
+    def test_spring_layout_shared_across_partitions(self):
+        """同一网表的不同划分结果复用同一个 spring 布局"""
+        cache = {}
+        first = self.graph.copy()
+        second = self.graph.copy()
+        for i, node in enumerate(self.graph.nodes()):
+            first.nodes[node]['partition'] = 'A' if i < 4 else 'B'
+            second.nodes[node]['partition'] = 'A' if i % 2 else 'B'
+        pos_first = compute_layout(first, 'spring', cache)
+        pos_second = compute_layout(second, 'spring', cache)
+        self.assertEqual(len(cache), 1)
+        for node in self.graph.nodes():
+            self.assertAlmostEqual(pos_first[node][0], pos_second[node][0])
+            self.assertAlmostEqual(pos_first[node][1], pos_second[node][1])
+
+    def test_layout_reused_and_persisted(self):
+        """同一拓扑只计算一次布局，缓存可写入磁盘并重新加载"""
+        cache = {}
+        fig, axes = plt.subplots(1, 2)
+        visualize_partitioned_graph(self.graph, ax=axes[0], layout_cache=cache)
+        visualize_partitioned_graph(self.graph.copy(), ax=axes[1], layout_cache=cache)
+        self.assertEqual(len(cache), 1)
+
+        path = os.path.join(self.test_dir, 'cache', 'layouts.json')
+        save_layout_cache(cache, path)
+        loaded = load_layout_cache(path)
+        self.assertEqual(loaded, cache)
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['layouts.json'])
+        self.assertEqual(load_layout_cache(os.path.join(self.test_dir, 'missing.json')), {})
+
+    def test_malformed_cache_ignored(self):
+        """结构不符的缓存文件被忽略，返回空缓存"""
+        path = os.path.join(self.test_dir, 'layouts.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'spring:8:abc': {'N0': 'not a position'}}, f)
+        self.assertEqual(load_layout_cache(path), {})
+
+
+class TestLargeGraphLayout(unittest.TestCase):
+    """测试大图 (LOD) 渲染所用的近似谱布局"""
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_isolated_nodes(self):
+        """含孤立节点的大图：布局坐标全部有限，孤立节点位于外侧圆环，连通部分展开而非坍缩，渲染正常完成"""
+        G = nx.relabel_nodes(nx.grid_2d_graph(50, 50), lambda t: f"N{t[0]}_{t[1]}")
+        nx.set_edge_attributes(G, 1, 'weight')
+        isolated = [f"F{i}" for i in range(40)]
+        G.add_nodes_from(isolated)
+        for i, node in enumerate(G.nodes()):
+            G.nodes[node]['partition'] = 'A' if i % 2 else 'B'
+
+        pos = compute_layout(G, 'spring')
+        coords = np.array([pos[node] for node in G.nodes()])
+        self.assertTrue(np.isfinite(coords).all())
+        for node in isolated:
+            self.assertAlmostEqual(float(np.hypot(*pos[node])), 1.15)
+        grid = np.array([pos[node] for node in G.nodes() if node not in isolated])
+        self.assertGreater(grid.std(axis=0).min(), 0.1)
+
+        fig, ax = plt.subplots()
+        visualize_partitioned_graph(G, ax=ax)
+        self.assertTrue(ax.collections)
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -10,6 +10,9 @@ import sys
 import networkx as nx
 import tempfile
 import shutil
+import gzip
+import bz2
+import lzma
 
 # --- 路径设置 ---
 # 让测试脚本能够找到 src 目录下的模块，将项目根目录添加到 sys.path
@@ -19,7 +22,11 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 # 从 src.utils 包中导入被测试的函数
-from src.utils.netlist_parser import parse_netlist_to_graph
+from src.utils.netlist_parser import (
+    parse_netlist_to_graph, parse_netlist_to_arrays, read_netlist_header, partition_netlist_streaming,
+    netlist_cut_size, netlist_name
+)
+from src.core.array_graph import ArrayGraph, graph_to_arrays
 
 class TestNetlistParser(unittest.TestCase):
     """测试 netlist_parser.py 中的核心功能"""
@@ -110,6 +117,65 @@ class TestNetlistParser(unittest.TestCase):
         self.assertIsInstance(graph, nx.Graph)
         self.assertEqual(graph.number_of_nodes(), 0)
 
+    def test_parse_to_arrays_matches_graph(self):
+        """直接构建的 ArrayGraph 应与先构建 nx.Graph 再转换的结果完全一致（含重复边与自环）"""
+        file_path = os.path.join(self.test_dir, "arrays_netlist.txt")
+        content = (
+            "# Nodes: 5, Edges: 5\n"
+            "N3 N1 2\n"
+            "N1 N0\n"
+            "N0 N3 4\n"
+            "N1 N3 7\n"  # 重复边，以最后一次的权重为准
+            "N2 N2 1\n"  # 自环
+            "bad line\n"
+        )
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        arrays = parse_netlist_to_arrays(file_path)
+        expected = graph_to_arrays(parse_netlist_to_graph(file_path))
+
+        self.assertIsInstance(arrays, ArrayGraph)
+        self.assertEqual(arrays.nodes, expected.nodes)
+        self.assertEqual(arrays.indptr.tolist(), expected.indptr.tolist())
+        self.assertEqual(arrays.indices.tolist(), expected.indices.tolist())
+        self.assertEqual(arrays.weights.tolist(), expected.weights.tolist())
+        self.assertEqual(arrays.number_of_edges(), 4)
+
+        self.assertEqual(parse_netlist_to_arrays(os.path.join(self.test_dir, "missing.txt")), None)
+        empty_file_path = os.path.join(self.test_dir, "empty.txt")
+        open(empty_file_path, 'w').close()
+        self.assertEqual(parse_netlist_to_arrays(empty_file_path).number_of_nodes(), 0)
+
+    def test_compressed_netlists(self):
+        """gzip / bz2 / xz 压缩的网表按魔数识别（与扩展名无关），解析结果与未压缩文件相同"""
+        content = "# Nodes: 6, Edges: 6\n" + "".join(
+            f"N{u} N{v} {w}\n" for u, v, w in [(0, 1, 2), (1, 2, 1), (2, 0, 3), (3, 4, 1), (4, 5, 2), (5, 3, 1)]
+        )
+        plain_path = os.path.join(self.test_dir, "plain.txt")
+        with open(plain_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        expected = parse_netlist_to_arrays(plain_path)
+        partition_A = partition_netlist_streaming(plain_path)[0]
+
+        for module, file_name in [(gzip, "design.txt.gz"), (bz2, "design.txt.bz2"), (lzma, "design.txt.xz"),
+                                  (gzip, "mislabeled.txt")]:
+            file_path = os.path.join(self.test_dir, file_name)
+            with module.open(file_path, 'wt', encoding='utf-8') as f:
+                f.write(content)
+
+            self.assertEqual(read_netlist_header(file_path), (6, 6))
+            arrays = parse_netlist_to_arrays(file_path)
+            self.assertEqual(arrays.nodes, expected.nodes)
+            self.assertEqual(arrays.indices.tolist(), expected.indices.tolist())
+            self.assertEqual(arrays.weights.tolist(), expected.weights.tolist())
+            self.assertEqual(parse_netlist_to_graph(file_path).number_of_edges(), 6)
+            self.assertEqual(partition_netlist_streaming(file_path)[0], partition_A)
+            self.assertEqual(netlist_cut_size(file_path, partition_A), netlist_cut_size(plain_path, partition_A))
+
+        self.assertEqual(netlist_name("archive/design.txt.gz"), "design")
+        self.assertEqual(netlist_name("netlist_small_10n_20e.txt"), "netlist_small_10n_20e")
+
 
 # 这使得脚本可以直接从命令行运行
 if __name__ == '__main__':
@@ -0,0 +1,391 @@
+"""
+tests/test_partitioning.py - 对 src/core 中各划分引擎的单元测试
+该文件检查各引擎返回的划分是否合法（平衡、割边数与分区一致），
+并在可以精确比较时与经典KL实现 kl_classic.py 的结果进行对照。
+"""
+
+import unittest
+import os
+import sys
+import random
+import subprocess
+import textwrap
+import networkx as nx
+import numpy as np
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.base_partitioning import simple_greedy_partition
+from src.core.kl_classic import kernighan_lin_partition, _calculate_cut_size, _calculate_D_values
+from src.core.kl_batched import kernighan_lin_batched, _random_initial_sides
+from src.core.kl_fast import kernighan_lin_fast
+from src.core.kl_numpy import kernighan_lin_numpy, kernighan_lin_numpy_passes
+from src.core.kl_improvements import create_initial_partition, kernighan_lin_bfs_init, place_fixed_vertices
+from src.core.array_graph import graph_to_arrays, adjacency_dict, to_original_order, REORDER_METHODS
+
+
+def _make_two_clusters(cluster_size: int, seed: int) -> nx.Graph:
+    """生成两个稠密随机簇、簇间仅有一条边的图，其最优二分割边数为1。"""
+    G = nx.Graph()
+    for offset in (0, cluster_size):
+        cluster = nx.gnm_random_graph(cluster_size, cluster_size * 4, seed=seed + offset)
+        G.add_edges_from((f"N{u + offset}", f"N{v + offset}") for u, v in cluster.edges())
+    G.add_edge("N0", f"N{cluster_size}")
+    nx.set_edge_attributes(G, 1, 'weight')
+    return G
+
+
+def _make_graph(num_nodes: int, num_edges: int, seed: int, max_weight: int = 1) -> nx.Graph:
+    """生成节点名为 N0, N1, ... 的随机带权图。"""
+    rng = random.Random(seed)
+    G = nx.gnm_random_graph(num_nodes, num_edges, seed=seed)
+    G = nx.relabel_nodes(G, {i: f"N{i}" for i in G.nodes()})
+    for u, v in G.edges():
+        G[u][v]['weight'] = rng.randint(1, max_weight)
+    return G
+
+
+class TestSimpleGreedy(unittest.TestCase):
+    """测试 base_partitioning.py 中基于堆的增量贪心引擎"""
+
+    @staticmethod
+    def _reference_greedy(G, partition_A, partition_B):
+        """逐步重算全部D值并穷举所有交换对的参考实现，返回每步后的割边数。"""
+        A, B = set(partition_A), set(partition_B)
+        cuts = [_calculate_cut_size(G, A, B)]
+        while True:
+            D = _calculate_D_values(G, A, B)
+            best_gain, best_pair = 0, None
+            for a in A:
+                for b in B:
+                    gain = D[a] + D[b] - 2 * G.get_edge_data(a, b, default={'weight': 0})['weight']
+                    if gain > best_gain:
+                        best_gain, best_pair = gain, (a, b)
+            if best_pair is None:
+                return A, cuts
+            a, b = best_pair
+            A.remove(a); A.add(b); B.remove(b); B.add(a)
+            cuts.append(_calculate_cut_size(G, A, B))
+
+    def test_matches_exhaustive_reference(self):
+        """权重互不相同时，每一步的交换与割边数都应与穷举参考实现一致"""
+        for seed in range(5):
+            G = _make_graph(24, 70, seed=seed, max_weight=10**6)
+            nodes = list(G.nodes())
+            random.Random(seed).shuffle(nodes)
+            initial = (set(nodes[:12]), set(nodes[12:]))
+
+            ref_A, ref_cuts = self._reference_greedy(G, *initial)
+            final_A, final_B, final_cut, history, _, _, _ = simple_greedy_partition(G, initial, verbose=False)
+
+            self.assertEqual([h['cut_size'] for h in history], ref_cuts)
+            self.assertEqual(final_A, ref_A)
+            self.assertEqual(final_cut, _calculate_cut_size(G, final_A, final_B))
+
+
+class TestBatchedKL(unittest.TestCase):
+    """测试 kl_batched.py 中的批量多起点KL引擎"""
+
+    def test_matches_classic_kl_per_run(self):
+        """权重互不相同（无并列增益）时，每次运行的结果应与经典KL一致"""
+        G = _make_graph(30, 80, seed=1, max_weight=10**6)
+        nodes = list(G.nodes())
+        sides = _random_initial_sides(len(nodes), num_runs=5, seed=7)
+
+        parts_A, parts_B, cuts, histories, _ = kernighan_lin_batched(G, initial_sides=sides, verbose=False)
+
+        for r in range(sides.shape[0]):
+            initial_A = {nodes[i] for i in np.flatnonzero(sides[r])}
+            initial_B = set(nodes) - initial_A
+            ref_A, _, ref_cut, ref_history, _, _, _ = kernighan_lin_partition(G, (initial_A, initial_B), verbose=False)
+            self.assertEqual(cuts[r], ref_cut)
+            self.assertEqual(parts_A[r], ref_A)
+            self.assertEqual([h['cut_size'] for h in histories[r]], [h['cut_size'] for h in ref_history])
+
+    def test_pass_cutoff_matches_classic_kl(self):
+        """启用轮内提前结束时，批量引擎与经典KL应截断在同一位置并记录相同的跳过次数"""
+        G = _make_graph(40, 120, seed=4, max_weight=10**6)
+        nodes = list(G.nodes())
+        sides = _random_initial_sides(len(nodes), num_runs=3, seed=1)
+
+        _, _, cuts, histories, _ = kernighan_lin_batched(G, initial_sides=sides, pass_cutoff=3, verbose=False)
+
+        for r in range(sides.shape[0]):
+            initial_A = {nodes[i] for i in np.flatnonzero(sides[r])}
+            _, _, ref_cut, ref_history, _, _, _ = kernighan_lin_partition(
+                G, (initial_A, set(nodes) - initial_A), pass_cutoff=3, verbose=False
+            )
+            self.assertEqual(cuts[r], ref_cut)
+            self.assertEqual([h.get('skipped_swaps') for h in histories[r]],
+                             [h.get('skipped_swaps') for h in ref_history])
+            self.assertTrue(all(h['skipped_swaps'] > 0 for h in ref_history[1:]))
+
+    def test_bulk_random_starts_are_valid(self):
+        """批量随机起点：分区平衡，且返回的割边数与分区一致"""
+        G = _make_graph(21, 50, seed=3)
+        parts_A, parts_B, cuts, histories, _ = kernighan_lin_batched(G, num_runs=8, seed=0, verbose=False)
+
+        self.assertEqual(len(cuts), 8)
+        for A, B, cut, history in zip(parts_A, parts_B, cuts, histories):
+            self.assertEqual(A | B, set(G.nodes()))
+            self.assertEqual(len(A), 10)
+            self.assertEqual(cut, _calculate_cut_size(G, A, B))
+            self.assertLessEqual(cut, history[0]['cut_size'])
+
+
+class TestFastKL(unittest.TestCase):
+    """测试 kl_fast.py 中的近似快速KL引擎"""
+
+    def test_exact_settings_match_classic_kl(self):
+        """候选数覆盖全部节点且每次交换都全量刷新D值时，结果应与经典KL一致"""
+        G = _make_graph(40, 120, seed=5, max_weight=10**6)
+        nodes = list(G.nodes())
+        random.Random(5).shuffle(nodes)
+        initial = (set(nodes[:20]), set(nodes[20:]))
+
+        ref = kernighan_lin_partition(G, initial, verbose=False)
+        fast = kernighan_lin_fast(G, initial, num_candidates=len(nodes), refresh_interval=1, verbose=False)
+        self.assertEqual(fast[:3], ref[:3])
+        self.assertEqual([h['cut_size'] for h in fast[3]], [h['cut_size'] for h in ref[3]])
+
+    def test_default_settings_are_valid_and_close(self):
+        """默认近似设置：分区平衡、割边数与分区一致，且平均割边数与经典KL相差不大"""
+        G = _make_graph(120, 360, seed=2, max_weight=10**6)
+        fast_cuts, ref_cuts = [], []
+        for seed in range(3):
+            nodes = list(G.nodes())
+            random.Random(seed).shuffle(nodes)
+            initial = (set(nodes[:60]), set(nodes[60:]))
+            A, B, cut, history, _, _, _ = kernighan_lin_fast(G, initial, verbose=False)
+            self.assertEqual(A | B, set(G.nodes()))
+            self.assertEqual(len(A), 60)
+            self.assertEqual(cut, _calculate_cut_size(G, A, B))
+            self.assertLess(cut, history[0]['cut_size'])
+            fast_cuts.append(cut)
+            ref_cuts.append(kernighan_lin_partition(G, initial, verbose=False)[2])
+        self.assertLessEqual(sum(fast_cuts), 1.2 * sum(ref_cuts))
+
+        with self.assertRaises(ValueError):
+            kernighan_lin_fast(G, initial, num_candidates=0, verbose=False)
+
+
+class TestNumpyKL(unittest.TestCase):
+    """测试 kl_numpy.py 中的向量化精确KL引擎"""
+
+    def test_identical_to_classic_kl(self):
+        """整数与浮点权重、有无 pass_cutoff 时，划分与逐轮 history 都应与经典KL完全相同（包括增益相同时的选择）"""
+        for seed, max_weight, float_weights in ((1, 3, False), (2, 1, False), (3, 1, True)):
+            G = _make_graph(50, 150, seed=seed, max_weight=max_weight)
+            if float_weights:
+                rng = random.Random(seed)
+                for u, v in G.edges():
+                    G[u][v]['weight'] = rng.random() * 3
+            nodes = list(G.nodes())
+            random.Random(seed).shuffle(nodes)
+            initial = (set(nodes[:25]), set(nodes[25:]))
+            for pass_cutoff in (None, 0.1):
+                ref = kernighan_lin_partition(G, initial, pass_cutoff=pass_cutoff, verbose=False)
+                vec = kernighan_lin_numpy(G, initial, pass_cutoff=pass_cutoff, verbose=False)
+                self.assertEqual(vec[:3], ref[:3])
+                strip = lambda history: [{k: v for k, v in h.items() if k != 'elapsed'} for h in history]
+                self.assertEqual(strip(vec[3]), strip(ref[3]))
+
+    def test_resume_from_checkpoint(self):
+        """从第1轮的快照续跑，结果与一次运行到底相同"""
+        G = _make_graph(40, 120, seed=4, max_weight=10**6)
+        nodes = list(G.nodes())
+        initial = (set(nodes[:20]), set(nodes[20:]))
+        states = kernighan_lin_numpy_passes(G, initial)
+        next(states)
+        first = next(states)
+        resumed = list(kernighan_lin_numpy_passes(G, resume_from=first))[-1]
+        self.assertEqual(resumed.best_cut_size, kernighan_lin_numpy(G, initial, verbose=False)[2])
+
+
+class TestFixedVertices(unittest.TestCase):
+    """测试各KL引擎对固定节点 (fixed) 的支持"""
+
+    def setUp(self):
+        self.G = _make_graph(60, 180, seed=8, max_weight=10**6)
+        nodes = sorted(self.G.nodes(), key=lambda u: int(u[1:]))
+        random.Random(8).shuffle(nodes)
+        self.initial = (set(nodes[:30]), set(nodes[30:]))
+        self.fixed = (set(nodes[:8]), set(nodes[30:42]))
+
+    def _check(self, A, B, cut):
+        self.assertEqual(A | B, set(self.G.nodes()))
+        self.assertEqual(len(A), 30)
+        self.assertEqual(cut, _calculate_cut_size(self.G, A, B))
+        self.assertLessEqual(self.fixed[0], A)
+        self.assertLessEqual(self.fixed[1], B)
+
+    def test_engines_keep_fixed_vertices(self):
+        """经典、向量化与近似KL都不移动固定节点，每轮的交换数不超过非固定节点数；向量化KL的结果与经典KL完全相同"""
+        ref = kernighan_lin_partition(self.G, self.initial, verbose=False, fixed=self.fixed)
+        self._check(*ref[:3])
+        self.assertLess(ref[2], ref[3][0]['cut_size'])
+        for h in ref[3][1:]:
+            self.assertLessEqual(int(h['details'].split()[1]), 30 - 12)
+        self.assertEqual(kernighan_lin_numpy(self.G, self.initial, verbose=False, fixed=self.fixed)[:3], ref[:3])
+        self._check(*kernighan_lin_fast(self.G, self.initial, verbose=False, fixed=self.fixed)[:3])
+
+        with self.assertRaises(ValueError):
+            kernighan_lin_partition(self.G, self.initial, verbose=False, fixed=(self.fixed[1], self.fixed[0]))
+
+    def test_numpy_matches_classic_with_tied_gains(self):
+        """单位权重（增益大量相同）且固定节点较多时，向量化KL仍与经典KL按相同顺序打破平局，结果完全相同"""
+        # 集合的遍历顺序随字符串哈希种子变化，因此覆盖多组图与固定节点数
+        for seed in range(6):
+            G = _make_graph(60, 180, seed=seed)
+            nodes = sorted(G.nodes(), key=lambda u: int(u[1:]))
+            random.Random(seed).shuffle(nodes)
+            initial = (set(nodes[:30]), set(nodes[30:]))
+            for num_fixed in (3, 12, 18, 24, 27):
+                fixed = (set(nodes[:num_fixed]), set(nodes[30:30 + num_fixed]))
+                ref = kernighan_lin_partition(G, initial, verbose=False, fixed=fixed)
+                self.assertEqual(kernighan_lin_numpy(G, initial, verbose=False, fixed=fixed)[:3], ref[:3])
+
+    def test_batched_and_initial_partitions(self):
+        """批量KL的随机起点与结果、BFS初始划分KL以及 create_initial_partition 都满足固定节点约束"""
+        parts_A, parts_B, cuts, _, _ = kernighan_lin_batched(self.G, num_runs=4, seed=0, verbose=False, fixed=self.fixed)
+        for A, B, cut in zip(parts_A, parts_B, cuts):
+            self._check(A, B, cut)
+        self._check(*kernighan_lin_bfs_init(self.G, verbose=False, fixed=self.fixed)[:3])
+        random.seed(0)
+        A, B = create_initial_partition(self.G, 'random', fixed=self.fixed)
+        self._check(A, B, _calculate_cut_size(self.G, A, B))
+
+        with self.assertRaises(ValueError):
+            kernighan_lin_batched(self.G, initial_sides=np.zeros((1, 60), dtype=bool), verbose=False, fixed=self.fixed)
+        with self.assertRaises(ValueError):
+            place_fixed_vertices(self.initial, (set(self.G.nodes()), set()))
+
+
+class TestInitialPartitionStrategies(unittest.TestCase):
+    """测试 kl_improvements.py 中可选的初始划分策略"""
+
+    def test_spectral_finds_cluster_split(self):
+        """谱方法应沿唯一的簇间边切分（小图走稠密分解，大图走LOBPCG）；孤立节点不影响切分"""
+        for cluster_size, num_isolated in ((30, 0), (300, 0), (300, 7)):
+            G = _make_two_clusters(cluster_size, seed=5)
+            G.add_nodes_from(f"ISO{i}" for i in range(num_isolated))
+            A, B = create_initial_partition(G, 'spectral')
+            self.assertEqual(len(A), G.number_of_nodes() // 2)
+            self.assertEqual(A | B, set(G.nodes()))
+            self.assertEqual(_calculate_cut_size(G, A, B), 1)
+
+    def test_gggp_grows_along_clusters(self):
+        """GGGP从伪外围种子生长，应恰好填满一个簇；不连通图也应得到平衡划分"""
+        random.seed(0)
+        G = _make_two_clusters(40, seed=2)
+        A, B = create_initial_partition(G, 'gggp')
+        self.assertEqual(len(A), 40)
+        self.assertEqual(_calculate_cut_size(G, A, B), 1)
+
+        D = nx.relabel_nodes(nx.disjoint_union(nx.path_graph(5), nx.path_graph(8)), lambda i: f"N{i}")
+        nx.set_edge_attributes(D, 1, 'weight')
+        A, B = create_initial_partition(D, 'gggp')
+        self.assertEqual(len(A), 6)
+        self.assertEqual(A | B, set(D.nodes()))
+
+    def test_unknown_strategy(self):
+        """未知策略名应抛出 ValueError"""
+        with self.assertRaises(ValueError):
+            create_initial_partition(_make_graph(10, 20, seed=0), 'dfs')
+
+
+class TestArrayGraphInput(unittest.TestCase):
+    """测试各引擎直接接受 ArrayGraph 输入（无需 NetworkX）"""
+
+    def test_engines_match_networkx_input(self):
+        """以 ArrayGraph 为输入时结果与 nx.Graph 输入完全一致，且不构建可视化用的图对象"""
+        G = _make_graph(30, 80, seed=6, max_weight=10**6)
+        ag = graph_to_arrays(G)
+        nodes = list(G.nodes())
+        random.Random(6).shuffle(nodes)
+        initial = (set(nodes[:15]), set(nodes[15:]))
+
+        runs = [
+            lambda graph: simple_greedy_partition(graph, initial, verbose=False),
+            lambda graph: kernighan_lin_partition(graph, initial, verbose=False),
+            lambda graph: kernighan_lin_bfs_init(graph, start_node='N3', verbose=False),
+        ]
+        for run in runs:
+            ref, arr = run(G), run(ag)
+            self.assertEqual(arr[:3], ref[:3])
+            self.assertEqual([h['cut_size'] for h in arr[3]], [h['cut_size'] for h in ref[3]])
+            self.assertIsNotNone(ref[5])
+            self.assertIsNone(arr[5])
+            self.assertIsNone(arr[6])
+
+        for strategy in ('spectral', 'gggp'):
+            random.seed(1)
+            ref = create_initial_partition(G, strategy)
+            random.seed(1)
+            self.assertEqual(create_initial_partition(ag, strategy), ref)
+
+    def test_reordered_arrays(self):
+        """重排只改变编号：邻接关系与引擎结果不变，order 可还原最初的编号，且 RCM 显著减小邻接矩阵带宽"""
+        side = 12
+        grid = nx.grid_2d_graph(side, side)
+        names = [f"N{i}" for i in range(side * side)]
+        random.Random(8).shuffle(names)
+        G = nx.relabel_nodes(grid, dict(zip(grid.nodes(), names)))
+        G = nx.Graph(sorted(G.edges(), key=lambda e: int(e[0][1:])))  # 按节点名排列，出现顺序与网格位置无关
+        rng = random.Random(8)
+        for u, v in G.edges():
+            G[u][v]['weight'] = rng.randint(1, 10**6)
+        ag = graph_to_arrays(G)
+        nodes = list(G.nodes())
+        rng.shuffle(nodes)
+        initial = (set(nodes[:72]), set(nodes[72:]))
+
+        def bandwidth(graph):
+            rows = np.repeat(np.arange(graph.number_of_nodes()), np.diff(graph.indptr))
+            return int(np.abs(rows - graph.indices).max())
+
+        for method in REORDER_METHODS:
+            reordered = graph_to_arrays(G, reorder=method)
+            self.assertEqual(adjacency_dict(reordered), adjacency_dict(ag))
+            self.assertEqual([ag.nodes[i] for i in reordered.order], reordered.nodes)
+            positions = np.array([ag.index[u] for u in reordered.nodes])
+            self.assertEqual(to_original_order(reordered, positions).tolist(), list(range(len(nodes))))
+            self.assertLessEqual(bandwidth(reordered), 2 * side)
+            self.assertEqual(kernighan_lin_partition(reordered, initial, verbose=False)[:3],
+                             kernighan_lin_partition(ag, initial, verbose=False)[:3])
+        self.assertGreater(bandwidth(ag), 4 * side)
+
+        with self.assertRaises(ValueError):
+            graph_to_arrays(G, reorder='metis')
+
+    def test_core_path_does_not_import_heavy_modules(self):
+        """解析网表并在 ArrayGraph 上运行划分的全过程不应导入 NetworkX、pandas 或 matplotlib"""
+        code = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {project_root!r})
+            from src.utils.netlist_parser import parse_netlist_to_arrays
+            from src.core.base_partitioning import simple_greedy_partition
+            from src.core.kl_classic import kernighan_lin_partition
+            from src.core.kl_improvements import kernighan_lin_bfs_init, create_initial_partition
+            from src.core.kl_batched import kernighan_lin_batched
+            import tempfile, os
+            path = os.path.join(tempfile.mkdtemp(), 'netlist.txt')
+            with open(path, 'w') as f:
+                f.write('N0 N1 1\\nN1 N2 2\\nN2 N3 1\\nN3 N0 1\\nN0 N2 3\\n')
+            ag = parse_netlist_to_arrays(path)
+            initial = create_initial_partition(ag, 'gggp')
+            simple_greedy_partition(ag, initial, verbose=False)
+            kernighan_lin_partition(ag, initial, verbose=False)
+            kernighan_lin_bfs_init(ag, start_node='N0', verbose=False)
+            kernighan_lin_batched(ag, num_runs=2, seed=0, verbose=False)
+            print(sorted(m for m in ('networkx', 'pandas', 'matplotlib') if m in sys.modules))
+        """)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+"""
+tests/test_profiling.py - 对 profiling.py 剖析结果文件与热点函数摘要的单元测试
+"""
+
+import unittest
+import os
+import sys
+import time
+import pstats
+import tempfile
+import shutil
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.profiling import RunProfiler, profile_section
+
+
+def _busy_leaf(seconds):
+    """纯 Python 的忙循环，用作剖析结果中应当占主导的热点函数。"""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def _workload(seconds):
+    return _busy_leaf(seconds)
+
+
+class TestProfiling(unittest.TestCase):
+    """测试两种剖析模式写出的文件、折叠栈格式、标签累积以及摘要中的热点函数"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _check_collapsed(self, path):
+        """折叠栈每行为 '帧1;帧2;... 数值'，且热点函数出现在 _workload 之下。"""
+        with open(path, encoding='utf-8') as f:
+            lines = [line.rstrip('\n') for line in f if line.strip()]
+        self.assertTrue(lines)
+        for line in lines:
+            stack, value = line.rsplit(' ', 1)
+            self.assertGreater(int(value), 0)
+        hottest = lines[0].rsplit(' ', 1)[0].split(';')
+        self.assertIn('_busy_leaf', hottest[-1])
+        self.assertTrue(any('_workload' in frame for frame in hottest))
+
+    def test_cprofile_mode(self):
+        """cProfile 模式写出可读取的 pstats、折叠栈与摘要；同一标签的多次记录累积"""
+        profiler = RunProfiler('cprofile', self.test_dir)
+        for _ in range(2):
+            with profiler.record('kl_random_Small (10n, 20e)'):
+                _workload(0.02)
+        summary = profiler.write()
+
+        base = os.path.join(self.test_dir, 'kl_random_Small_10n_20e')
+        stats = pstats.Stats(f"{base}.pstats")
+        calls = [nc for (_, _, name), (cc, nc, tt, ct, callers) in stats.stats.items() if name == '_workload']
+        self.assertEqual(calls, [2])
+        self._check_collapsed(f"{base}.collapsed")
+        self.assertIn('_busy_leaf', summary.splitlines()[2])
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'summary.txt')))
+
+    def test_sampling_mode(self):
+        """采样模式只记录被剖析代码块内的调用栈，热点函数的自身耗时占主导"""
+        profiler = RunProfiler('sampling', self.test_dir)
+        switch_interval = sys.getswitchinterval()
+        with profile_section(profiler, 'greedy'):
+            _workload(0.2)
+        self.assertEqual(sys.getswitchinterval(), switch_interval)
+
+        times = profiler.function_times('greedy')
+        leaf = next(name for name in times if '_busy_leaf' in name)
+        self.assertGreater(times[leaf][0], 0.5 * sum(self_time for self_time, _ in times.values()))
+
+        profiler.write()
+        self._check_collapsed(os.path.join(self.test_dir, 'greedy.collapsed'))
+        # 调用栈以 with 语句所在的函数为根，不包含测试框架等外层调用帧
+        with open(os.path.join(self.test_dir, 'greedy.collapsed'), encoding='utf-8') as f:
+            roots = {line.split(';')[0] for line in f if line.strip()}
+        self.assertEqual(len(roots), 1)
+        self.assertIn('test_sampling_mode', roots.pop())
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'greedy.pstats')))
+
+        with self.assertRaises(ValueError):
+            RunProfiler('unknown')
+        with profile_section(None, 'unused'):
+            pass
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
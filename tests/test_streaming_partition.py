@@ -0,0 +1,131 @@
+"""
+tests/test_streaming_partition.py - 对 streaming_partition.py 单遍流式划分及其网表接口的单元测试
+"""
+
+import unittest
+import os
+import sys
+import random
+import tempfile
+import shutil
+import tracemalloc
+import networkx as nx
+
+# --- 路径设置 ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.streaming_partition import streaming_partition
+from src.core.kl_classic import kernighan_lin_partition, _calculate_cut_size
+from src.core.kl_improvements import create_initial_partition
+from src.utils.netlist_parser import (
+    parse_netlist_to_graph, partition_netlist_streaming, netlist_cut_size, read_netlist_header
+)
+
+
+def _two_cliques(size):
+    """两个 size 个节点的完全图，由一条边相连；最优割边数为1。"""
+    G = nx.disjoint_union(nx.complete_graph(size), nx.complete_graph(size))
+    G.add_edge(0, size)
+    G = nx.relabel_nodes(G, lambda i: f"N{i:03d}")
+    nx.set_edge_attributes(G, 1, 'weight')
+    return G
+
+
+def _sorted_edges(G):
+    return [(u, v, d['weight']) for u, v, d in sorted((min(u, v), max(u, v), d) for u, v, d in G.edges(data=True))]
+
+
+def _random_edge_stream(num_nodes, num_edges, seed):
+    """按起点顺序惰性生成边，不在内存中保存边表。"""
+    rng = random.Random(seed)
+    for k in range(num_edges):
+        yield f"N{k * num_nodes // num_edges}", f"N{rng.randrange(num_nodes)}", 1
+
+
+class TestStreamingPartition(unittest.TestCase):
+    """测试流式划分的平衡性、划分质量、O(n) 内存与网表文件接口"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_netlist(self, G, header=True):
+        path = os.path.join(self.test_dir, 'netlist.txt')
+        with open(path, 'w') as f:
+            f.write("# test netlist\n")
+            if header:
+                f.write(f"# Nodes: {G.number_of_nodes()}, Edges: {G.number_of_edges()}\n")
+            f.write("\n")
+            for u, v, w in _sorted_edges(G):
+                f.write(f"{u} {v} {w}\n")
+        return path
+
+    def test_balanced_and_follows_clusters(self):
+        """两种方法都覆盖全部节点、两区大小至多相差1且优于随机划分的期望；LDG 沿簇边界切分"""
+        G = _two_cliques(8)
+        expected_random_cut = G.number_of_edges() * 2 * 8 * 8 / (16 * 15)
+        for method in ('ldg', 'fennel'):
+            A, B = streaming_partition(iter(_sorted_edges(G)), 16, G.number_of_edges(), method)
+            self.assertEqual(A | B, set(G.nodes()))
+            self.assertLessEqual(abs(len(A) - len(B)), 1)
+            self.assertLess(_calculate_cut_size(G, A, B), expected_random_cut)
+        self.assertEqual(_calculate_cut_size(G, *streaming_partition(iter(_sorted_edges(G)), 16)), 1)
+
+        with self.assertRaises(ValueError):
+            streaming_partition(iter(_sorted_edges(G)), 10)
+        with self.assertRaises(ValueError):
+            streaming_partition(iter(_sorted_edges(G)), 16, method='unknown')
+
+    def test_isolated_nodes_and_declared_count_mismatch(self):
+        """孤立节点也被分配；声明的节点数多于实际节点数时，两区仍按实际节点数保持平衡"""
+        G = nx.relabel_nodes(nx.path_graph(6), lambda i: f"N{i}")
+        nx.set_edge_attributes(G, 1, 'weight')
+        G.add_nodes_from(['N6', 'N7', 'N8'])
+        A, B = create_initial_partition(G, 'streaming')
+        self.assertEqual(A | B, set(G.nodes()))
+        self.assertLessEqual(abs(len(A) - len(B)), 1)
+        self.assertLessEqual(kernighan_lin_partition(G, (A, B), verbose=False)[2], _calculate_cut_size(G, A, B))
+
+        # 网表头部声明7个节点，但边流中只出现6个
+        A, B = streaming_partition(iter(_sorted_edges(G)), 7)
+        self.assertEqual(A | B, {f"N{i}" for i in range(6)})
+        self.assertEqual((len(A), len(B)), (3, 3))
+
+    def test_memory_independent_of_edge_count(self):
+        """内存峰值只取决于节点数：边数增加10倍时峰值基本不变"""
+        peaks = []
+        for num_edges in (5000, 50000):
+            tracemalloc.start()
+            streaming_partition(_random_edge_stream(1000, num_edges, 0), 1000, num_edges)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertLess(peaks[1], peaks[0] * 1.2)
+
+    def test_netlist_file_interface(self):
+        """从文件头读取节点数，结果可作为KL的初始划分；缺少头部时需要显式给出节点数"""
+        G = nx.relabel_nodes(nx.gnm_random_graph(40, 100, seed=2), lambda i: f"N{i:02d}")
+        nx.set_edge_attributes(G, 1, 'weight')
+        path = self._write_netlist(G)
+        self.assertEqual(read_netlist_header(path), (40, 100))
+
+        A, B = partition_netlist_streaming(path)
+        graph = parse_netlist_to_graph(path)
+        self.assertEqual(netlist_cut_size(path, A), _calculate_cut_size(graph, A, B))
+        final_cut = kernighan_lin_partition(graph, (A, B), verbose=False)[2]
+        self.assertLessEqual(final_cut, netlist_cut_size(path, A))
+
+        # 作为初始划分策略时按网表顺序对内存中的图流式处理，结果与直接读取网表一致
+        self.assertEqual(create_initial_partition(graph, 'streaming'), (A, B))
+
+        path = self._write_netlist(G, header=False)
+        with self.assertRaises(ValueError):
+            partition_netlist_streaming(path)
+        self.assertEqual(len(partition_netlist_streaming(path, num_nodes=40)[0]), 20)
+
+
+# 这使得脚本可以直接从命令行运行
+if __name__ == '__main__':
+    unittest.main(verbosity=2)